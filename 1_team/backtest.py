@@ -0,0 +1,171 @@
+"""
+물가지수 회귀 모델 롤링 원점(rolling-origin) 백테스트.
+
+원점(origin) o 마다 그 이전 달까지로 회귀를 다시 학습하고, o 부터 h 개월 뒤(h = 1, 2, ...)의
+물가 변화율을 그 달의 실제 지표 변화율로 예측해 표본 외 오차를 잰다.
+- expanding: 처음부터 o-1 까지 전부 학습
+- sliding:   o-size 부터 o-1 까지 최근 size 개월만 학습
+
+원점을 한 달 옮길 때마다 새로 들어온 행은 추가(rank-one update), 창 밖으로 나간 행은 제거(downdate)해
+(AᵀA)⁻¹ 과 Aᵀy 를 갱신하므로 원점마다 처음부터 다시 풀지 않는다.
+원점 구간을 여러 조각으로 나눠 조각마다 한 번만 직접 풀고, 조각들은 병렬로 실행한다.
+
+    python 1_team/backtest.py --horizons 1 2 3 --window 24 --min-train 24
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+WINDOWS = ("expanding", "sliding")
+
+
+class RecursiveLeastSquares:
+    """
+    절편이 있는 최소제곱 해를 행 추가/제거로 갱신.
+    P = (AᵀA)⁻¹ 을 Sherman-Morrison 공식으로 고치고 beta = P Aᵀy.
+    """
+
+    def __init__(self, X, y):
+        A = _design(X)
+        self.P = np.linalg.pinv(A.T @ A)
+        self.b = A.T @ np.asarray(y, dtype=np.float64)
+
+    @property
+    def beta(self) -> np.ndarray:
+        return self.P @ self.b
+
+    def add(self, x, y) -> None:
+        a = np.concatenate(([1.0], np.asarray(x, dtype=np.float64)))
+        Pa = self.P @ a
+        self.P -= np.outer(Pa, Pa) / (1.0 + a @ Pa)
+        self.b += a * y
+
+    def remove(self, x, y) -> None:
+        a = np.concatenate(([1.0], np.asarray(x, dtype=np.float64)))
+        Pa = self.P @ a
+        self.P += np.outer(Pa, Pa) / (1.0 - a @ Pa)
+        self.b -= a * y
+
+    def predict(self, X) -> np.ndarray:
+        return _design(X) @ self.beta
+
+
+def _design(X) -> np.ndarray:
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    return np.column_stack([np.ones(len(X)), X])
+
+
+def _window_start(origin: int, window: str, size: int) -> int:
+    return 0 if window == "expanding" else origin - size
+
+
+def _run_origins(X, y, origins, horizons, window, size) -> list:
+    """(작업자) 연속된 원점들: 첫 원점에서 한 번 풀고 이후는 행 추가/제거로 갱신"""
+    rows = []
+    origin = origins[0]
+    lo = _window_start(origin, window, size)
+    rls = RecursiveLeastSquares(X[lo:origin], y[lo:origin])
+    for origin in origins:
+        if origin > origins[0]:
+            rls.add(X[origin - 1], y[origin - 1])
+            if window == "sliding":
+                out = origin - 1 - size
+                rls.remove(X[out], y[out])
+        # horizon 과 예측할 달을 한 쌍으로 걸러야 horizon 순서와 무관하게 짝이 맞는다
+        pairs = [(h, origin + h - 1) for h in horizons if origin + h - 1 < len(y)]
+        if not pairs:
+            continue
+        pred = rls.predict(X[[t for _, t in pairs]])
+        for (h, t), p in zip(pairs, pred):
+            rows.append((origin, h, t, float(y[t]), float(p)))
+    return rows
+
+
+def backtest(X, y, horizons=(1, 2, 3), window: str = "expanding", size: int = 24,
+             min_train: int = 24, n_chunks: int = None, n_jobs: int = -1) -> pd.DataFrame:
+    """
+    원점마다의 표본 외 예측.
+    반환 컬럼: origin(학습에 안 쓴 첫 달 번호), horizon, target(예측한 달 번호), actual, predicted, error
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"window는 {WINDOWS} 중 하나여야 합니다: {window!r}")
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    first = size if window == "sliding" else min_train
+    if first <= X.shape[1] + 1:
+        raise ValueError(f"학습 구간({first}개월)이 계수 수({X.shape[1] + 1})보다 길어야 합니다.")
+    origins = np.arange(first, len(y))
+    if origins.size == 0:
+        raise ValueError(f"데이터({len(y)}개월)가 학습 구간({first}개월)보다 짧습니다.")
+
+    n_chunks = n_chunks or min(len(origins), 8)
+    chunks = [c.tolist() for c in np.array_split(origins, n_chunks) if c.size]
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_run_origins)(X, y, chunk, list(horizons), window, size) for chunk in chunks
+    )
+    df = pd.DataFrame([row for rows in results for row in rows],
+                      columns=["origin", "horizon", "target", "actual", "predicted"])
+    df["error"] = df["predicted"] - df["actual"]
+    return df
+
+
+def summarize(forecasts: pd.DataFrame) -> pd.DataFrame:
+    """horizon 별 표본 외 MAE / RMSE / 예측 수"""
+    err = forecasts["error"]
+    return (
+        forecasts.assign(abs_error=err.abs(), sq_error=err ** 2)
+          .groupby("horizon")
+          .agg(n=("error", "size"), MAE=("abs_error", "mean"), RMSE=("sq_error", "mean"))
+          .assign(RMSE=lambda d: np.sqrt(d["RMSE"]))
+          .reset_index()
+    )
+
+
+def evaluate(X, y, horizons=(1, 2, 3), windows=(("expanding", None), ("sliding", 24)),
+             min_train: int = 24, n_jobs: int = -1) -> pd.DataFrame:
+    """여러 창 설정의 horizon 별 요약을 한 표로"""
+    parts = []
+    for window, size in windows:
+        forecasts = backtest(X, y, horizons, window=window, size=size or min_train,
+                             min_train=min_train, n_jobs=n_jobs)
+        label = window if window == "expanding" else f"{window}({size})"
+        parts.append(summarize(forecasts).assign(window=label))
+    return pd.concat(parts, ignore_index=True)[["window", "horizon", "n", "MAE", "RMSE"]]
+
+
+def main():
+    import time
+
+    import cpi_model
+
+    parser = argparse.ArgumentParser(description="물가지수 회귀 모델 롤링 원점 백테스트")
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--min-train", type=int, default=24, help="expanding 창의 첫 학습 개월 수")
+    parser.add_argument("--window", type=int, default=24, help="sliding 창 크기 (개월)")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--check", action="store_true", help="원점마다 새로 푼 결과와 비교")
+    args = parser.parse_args()
+
+    names, X, y = cpi_model.build_dataset()
+    t0 = time.perf_counter()
+    table = evaluate(X, y, args.horizons, (("expanding", None), ("sliding", args.window)),
+                     min_train=args.min_train, n_jobs=args.n_jobs)
+    print(f"입력: {', '.join(names)} ({len(y)}개월, {time.perf_counter() - t0:.2f}초)")
+    print(table.round(4).to_string(index=False))
+
+    if args.check:
+        for window, size in (("expanding", args.min_train), ("sliding", args.window)):
+            fast = backtest(X, y, args.horizons, window, size, args.min_train, n_jobs=1)
+            naive = []
+            for origin, t in zip(fast["origin"], fast["target"]):
+                lo = _window_start(origin, window, size)
+                beta, *_ = np.linalg.lstsq(_design(X[lo:origin]), y[lo:origin], rcond=None)
+                naive.append(_design(X[t]) @ beta)
+            diff = np.abs(fast["predicted"].to_numpy() - np.concatenate(naive)).max()
+            print(f"{window}: 직접 푼 결과와 최대 차이 {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+소비자물가지수 변화율 회귀 모델.
+
+resources/*.txt 지표 원본에서 전월 대비 변화율(%)을 계산해 입력(환율, 본원통화, 휘발유, 경유)과
+목표(소비자물가지수)를 만들고, 절편이 있는 선형 회귀를 최소제곱으로 학습한다.
+계수는 입력 파일 해시(fingerprint)와 함께 cpi_model.json 에 저장하고,
+입력 파일이나 설정이 바뀌었을 때만 다시 학습한다.
+
+    python 1_team/cpi_model.py           # 필요하면 학습 후 계수 출력
+    python 1_team/cpi_model.py --force   # 항상 다시 학습
+"""
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from indicators import RESOURCE_DIR, change_rate, load_dated, to_frame
+
+MODEL_PATH = Path(__file__).resolve().parent / "cpi_model.json"
+FORMAT_VERSION = 1
+
+# 입력 이름 -> 지표 파일 이름(확장자 제외)
+FEATURES = {
+    "환율": "환율 데이터",
+    "본원통화": "본원 통화",
+    "휘발유": "유가(일반 휘발유)",
+    "경유": "유가(경유)",
+}
+# 목표 지표 파일 이름의 앞부분 (다운로드 시각이 붙은 파일명도 찾도록)
+TARGET_PREFIX = "소비자물가지수"
+# 변화율 반올림 자릿수 (전처리.py 와 같은 소수점 3자리)
+DECIMALS = 3
+
+
+def source_files(resource_dir=RESOURCE_DIR, features=FEATURES) -> dict:
+    """{입력 이름: 파일 경로} + {'target': 목표 파일 경로}"""
+    resource_dir = Path(resource_dir)
+    files = {name: resource_dir / f"{stem}.txt" for name, stem in features.items()}
+    targets = sorted(resource_dir.glob(f"{TARGET_PREFIX}*.txt"))
+    if not targets:
+        raise FileNotFoundError(f"{resource_dir} 에 {TARGET_PREFIX}*.txt 파일이 없습니다.")
+    files["target"] = targets[-1]
+    for path in files.values():
+        if not path.exists():
+            raise FileNotFoundError(f"지표 파일이 없습니다: {path}")
+    return files
+
+
+def fingerprint(files: dict, decimals: int = DECIMALS, lag: int = 1) -> str:
+    """입력 파일 내용 + 설정으로 만든 sha1 (같으면 다시 학습할 필요 없음)"""
+    h = hashlib.sha1(json.dumps({"decimals": decimals, "lag": lag, "version": FORMAT_VERSION}).encode())
+    for name, path in files.items():
+        h.update(name.encode())
+        h.update(Path(path).read_bytes())
+    return h.hexdigest()
+
+
+def build_dataset(resource_dir=RESOURCE_DIR, features=FEATURES, decimals: int = DECIMALS, lag: int = 1):
+    """
+    (입력 이름 목록, X (개월 수, 입력 수), y (개월 수,)).
+    모든 지표를 달력(월) 기준으로 맞춘 뒤 변화율을 계산하고, 모든 지표가 있는 달만 사용한다.
+    """
+    files = source_files(resource_dir, features)
+    levels = to_frame({name: load_dated(path) for name, path in files.items()})
+    rates = dict(zip(levels.columns, np.round(change_rate(levels.to_numpy().T, lag=lag, pad=True), decimals)))
+    names = list(features)
+    X = np.column_stack([rates[name] for name in names])
+    y = rates["target"]
+    ok = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+    return names, X[ok], y[ok]
+
+
+class CpiModel:
+    """절편 + 가중치 선형 모델 (입력: 지표 변화율 %, 출력: 물가지수 변화율 %)"""
+
+    def __init__(self, intercept, coefficients, feature_names, meta=None):
+        self.intercept_ = float(intercept)
+        self.coef_ = np.asarray(coefficients, dtype=np.float64)
+        self.feature_names = list(feature_names)
+        self.meta = meta or {}
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        X = X.reshape(1, -1) if X.ndim == 1 else X
+        return self.intercept_ + X @ self.coef_
+
+    def to_dict(self) -> dict:
+        return {
+            **self.meta,
+            "version": FORMAT_VERSION,
+            "feature_names": self.feature_names,
+            "intercept": self.intercept_,
+            "coefficients": self.coef_.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CpiModel":
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 모델 버전입니다: {data.get('version')}")
+        meta = {k: v for k, v in data.items() if k not in ("version", "feature_names", "intercept", "coefficients")}
+        return cls(data["intercept"], data["coefficients"], data["feature_names"], meta)
+
+
+def fit(X, y, feature_names) -> CpiModel:
+    """절편이 있는 최소제곱 (sklearn LinearRegression 과 같은 해)"""
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    A = np.column_stack([np.ones(len(X)), X])
+    beta, *_ = np.linalg.lstsq(A, y, rcond=None)
+    resid = y - A @ beta
+    r2 = 1.0 - float(resid @ resid) / float(((y - y.mean()) ** 2).sum())
+    return CpiModel(beta[0], beta[1:], feature_names, {"n_samples": int(len(X)), "r2": r2})
+
+
+def save_model(model: CpiModel, path=MODEL_PATH) -> None:
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(model.to_dict(), f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def load_or_fit(resource_dir=RESOURCE_DIR, model_path=MODEL_PATH, features=FEATURES,
+                decimals: int = DECIMALS, force: bool = False) -> CpiModel:
+    """
+    저장된 모델의 fingerprint 가 지금 입력 파일과 같으면 그대로 불러오고,
+    다르거나 없으면(또는 force) 다시 학습해 저장한다.
+    """
+    files = source_files(resource_dir, features)
+    key = fingerprint(files, decimals)
+    model_path = Path(model_path)
+    if not force and model_path.exists():
+        with open(model_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("fingerprint") == key and data.get("version") == FORMAT_VERSION:
+            return CpiModel.from_dict(data)
+
+    names, X, y = build_dataset(resource_dir, features, decimals)
+    model = fit(X, y, names)
+    model.meta.update({
+        "fingerprint": key,
+        "target": files["target"].name,
+        "sources": {name: files[name].name for name in names},
+        "decimals": decimals,
+    })
+    save_model(model, model_path)
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="소비자물가지수 변화율 회귀 모델 학습")
+    parser.add_argument("--resources", default=str(RESOURCE_DIR), help="지표 txt 폴더")
+    parser.add_argument("--model", default=str(MODEL_PATH), help="계수 저장 파일 (.json)")
+    parser.add_argument("--force", action="store_true", help="입력이 같아도 다시 학습")
+    args = parser.parse_args()
+
+    model = load_or_fit(args.resources, args.model, force=args.force)
+    print(f"절편(b) : {model.intercept_}")
+    print(f"회귀 계수 : {dict(zip(model.feature_names, model.coef_.tolist()))}")
+    print(f"학습 개월 수 : {model.meta.get('n_samples')}, R^2 : {model.meta.get('r2'):.4f}")
+    print(f"저장 : {args.model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+물가지수 변화율 다개월 예측 (시나리오 + 재귀 예측).
+
+    y[t] = b0 + Σ w_j · x_j[t] + Σ φ_l · y[t-l] + e[t]
+
+지표 변화율 x 는 시나리오마다 앞으로 horizon 개월의 경로를 주고,
+물가 시차 항(ar_lags > 0)이 있으면 앞 달 예측값을 다음 달 입력으로 넣어 재귀적으로 계산한다.
+지표 항은 모든 시나리오·개월을 한 번의 행렬 곱으로, 시차 항은 개월 순서로 시나리오 전체를 한꺼번에 계산한다.
+
+시나리오 경로 = 기준 경로(앱 입력값) + 과거 지표 변화율의 평균 대비 편차를 무작위로 뽑은 것(× scale).
+과거 잔차를 뽑아 더하면 모델 오차까지 포함한 예측 분포(fan chart)가 된다.
+
+    python 1_team/forecast.py --horizon 12 --ar-lags 1 --scenarios 1000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import cpi_model
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def ar_label(lag: int) -> str:
+    return f"물가(t-{lag})"
+
+
+class Forecaster:
+    def __init__(self, model: cpi_model.CpiModel, n_exog: int, ar_lags: int, history, residuals):
+        self.model = model
+        self.feature_names = model.feature_names[:n_exog]
+        self.intercept_ = model.intercept_
+        self.coef_ = model.coef_[:n_exog]
+        self.ar_ = model.coef_[n_exog:]          # φ_1 ... φ_p
+        self.ar_lags = ar_lags
+        self.history = np.asarray(history, dtype=np.float64)    # 마지막 p 개월 실제 y (오래된 것부터)
+        self.residuals = np.asarray(residuals, dtype=np.float64)
+
+    @classmethod
+    def fit(cls, X, y, names, ar_lags: int = 0) -> "Forecaster":
+        """지표 변화율 X (개월 수, 지표 수) 와 물가 변화율 y 로 학습. ar_lags 개월의 물가 시차 항 추가"""
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        p = ar_lags
+        lags = [y[p - l:len(y) - l] for l in range(1, p + 1)]
+        design = np.column_stack([X[p:]] + lags) if p else X
+        model = cpi_model.fit(design, y[p:], list(names) + [ar_label(l) for l in range(1, p + 1)])
+        residuals = y[p:] - model.predict(design)
+        return cls(model, X.shape[1], p, y[len(y) - p:], residuals)
+
+    def simulate(self, paths, shocks=None) -> np.ndarray:
+        """
+        paths: (시나리오 수, horizon, 지표 수) 지표 변화율 경로
+        shocks: (시나리오 수, horizon) 더할 오차 (없으면 0)
+        반환: (시나리오 수, horizon) 물가 변화율 예측
+        """
+        paths = np.asarray(paths, dtype=np.float64)
+        Y = self.intercept_ + paths @ self.coef_                # 지표 항: 한 번의 행렬 곱
+        if shocks is not None:
+            Y = Y + shocks
+        if not self.ar_lags:
+            return Y
+
+        n, horizon = Y.shape
+        # 최근 p 개월 (오래된 것부터) 을 시나리오 수만큼 복제해 두고 앞 달 예측을 이어 붙임
+        lagged = np.concatenate([np.broadcast_to(self.history, (n, self.ar_lags)), np.zeros((n, horizon))], axis=1)
+        for h in range(horizon):
+            recent = lagged[:, h:h + self.ar_lags][:, ::-1]     # y[t-1], y[t-2], ...
+            lagged[:, self.ar_lags + h] = Y[:, h] + recent @ self.ar_
+        return lagged[:, self.ar_lags:]
+
+
+def scenario_paths(X_hist, base, horizon: int, n_scenarios: int, scale: float = 1.0, seed: int = 0) -> np.ndarray:
+    """
+    (시나리오 수, horizon, 지표 수) 경로.
+    기준 경로(base: (지표 수,) 또는 (horizon, 지표 수)) 에 과거 어느 한 달의 지표 편차(지표끼리 함께)를 달마다 뽑아 더한다.
+    """
+    X_hist = np.asarray(X_hist, dtype=np.float64)
+    base = np.broadcast_to(np.asarray(base, dtype=np.float64), (horizon, X_hist.shape[1]))
+    rng = np.random.default_rng(seed)
+    months = rng.integers(0, len(X_hist), size=(n_scenarios, horizon))
+    return base[None, :, :] + scale * (X_hist - X_hist.mean(axis=0))[months]
+
+
+def residual_shocks(forecaster: Forecaster, n_scenarios: int, horizon: int, seed: int = 0) -> np.ndarray:
+    """과거 잔차를 복원 추출한 (시나리오 수, horizon) 오차"""
+    rng = np.random.default_rng(seed + 1)
+    return rng.choice(forecaster.residuals, size=(n_scenarios, horizon))
+
+
+def fan(Y, quantiles=QUANTILES) -> pd.DataFrame:
+    """시나리오 (시나리오 수, horizon) -> horizon 별 분위수 표 (index: 1..horizon 개월 후)"""
+    table = pd.DataFrame(np.quantile(Y, quantiles, axis=0).T, columns=[f"q{int(q * 100):02d}" for q in quantiles])
+    table.index = pd.RangeIndex(1, Y.shape[1] + 1, name="개월 후")
+    return table
+
+
+def cumulative(Y) -> np.ndarray:
+    """월별 변화율(%) 경로 -> 누적 변화율(%)"""
+    return (np.cumprod(1.0 + np.asarray(Y) / 100.0, axis=1) - 1.0) * 100.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="물가지수 변화율 다개월 시나리오 예측")
+    parser.add_argument("--horizon", type=int, default=12, help="예측 기간 (개월)")
+    parser.add_argument("--ar-lags", type=int, default=1, help="물가 시차 항 수")
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--scale", type=float, default=1.0, help="과거 지표 편차 배수")
+    parser.add_argument("--base", type=float, nargs="+", help="지표별 기준 변화율 (없으면 최근 달 값)")
+    args = parser.parse_args()
+
+    names, X, y = cpi_model.build_dataset()
+    forecaster = Forecaster.fit(X, y, names, ar_lags=args.ar_lags)
+    base = X[-1] if args.base is None else args.base
+    paths = scenario_paths(X, base, args.horizon, args.scenarios, scale=args.scale)
+    Y = forecaster.simulate(paths, residual_shocks(forecaster, args.scenarios, args.horizon))
+    print(f"입력: {', '.join(names)} / 물가 시차 {args.ar_lags}개월, R^2 {forecaster.model.meta['r2']:.4f}")
+    print(fan(Y).round(3).to_string())
+    total = fan(cumulative(Y)).iloc[-1]
+    print(f"{args.horizon}개월 누적: 중앙값 {total['q50']:.2f}% (90% 구간 {total['q05']:.2f} ~ {total['q95']:.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
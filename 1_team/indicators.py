@@ -0,0 +1,218 @@
+import csv
+import re
+from pathlib import Path
+
+import numpy as np
+
+# 지표 원본 파일 폴더 (1_team/resources)
+RESOURCE_DIR = Path(__file__).resolve().parent / "resources"
+# 월별 지표 표 폴더 (1_team/res, 지표 하나가 한 행이고 월마다 한 열)
+RES_DIR = Path(__file__).resolve().parent / "res"
+
+CHANGE_MODES = ("pct", "log")
+# 날짜 없이 값만 있는 지표 txt 의 첫 달 (res/*.csv 표와 같은 2021.01 부터)
+SERIES_START = "2021-01"
+
+
+def _clean(value: str) -> str:
+    # "2,320" / "137,416.1" 처럼 천 단위 쉼표, 따옴표가 섞인 값 정리
+    return value.replace('"', "").replace(",", "").strip()
+
+
+def parse_series(text: str) -> np.ndarray:
+    """지표 txt 내용을 1차원 float 배열로 변환"""
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    if not lines:
+        return np.array([], dtype=np.float64)
+
+    if len(lines) > 1:
+        # 여러 줄: "2020,01,"2,320"" 처럼 한 줄에 (연도, 월, 값) -> 마지막 칸이 값
+        fields = [row[-1] for row in csv.reader(lines) if row]
+    else:
+        # 한 줄: 쉼표 또는 탭 구분 (탭 구분 파일은 값 안에 천 단위 쉼표가 있음)
+        delimiter = "\t" if "\t" in lines[0] else ","
+        fields = next(csv.reader(lines, delimiter=delimiter))
+
+    values = [v for v in (_clean(f) for f in fields) if v]
+    return np.array(values, dtype=np.float64)
+
+
+def parse_dated_series(text: str, start: str = SERIES_START):
+    """
+    지표 txt 내용 -> 월 단위 PeriodIndex(date) 의 float Series.
+    줄마다 (연도, 월, 값) 이 있으면 그 달을 쓰고, 값만 있으면 start 달부터 한 달씩 붙인다.
+    """
+    import pandas as pd
+
+    values = parse_series(text)
+    lines = [ln for ln in text.splitlines() if ln.strip()]
+    rows = [row for row in csv.reader(lines) if row] if len(lines) > 1 else []
+    if rows and all(len(row) >= 3 for row in rows):
+        periods = parse_periods([f"{row[0]}.{row[1]}" for row in rows])
+    else:
+        periods = pd.period_range(start, periods=len(values), freq="M")
+    return pd.Series(values, index=periods.rename("date"))
+
+
+def load_series(path) -> np.ndarray:
+    """지표 파일 하나 읽기"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return parse_series(f.read())
+
+
+def load_dated(path, start: str = SERIES_START):
+    """지표 파일 하나를 달력(PeriodIndex)이 붙은 Series 로 읽기"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return parse_dated_series(f.read(), start)
+
+
+def load_indicators(resource_dir=RESOURCE_DIR, pattern: str = "*.txt", start: str = SERIES_START) -> dict:
+    """폴더 안의 모든 지표 파일을 {파일명: 달력이 붙은 Series} 로 한 번에 읽기"""
+    return {p.stem: load_dated(p, start) for p in sorted(Path(resource_dir).glob(pattern))}
+
+
+def to_frame(series: dict, names=None, start: str = SERIES_START):
+    """
+    여러 지표 -> (월, 지표) DataFrame.
+    달력(PeriodIndex) 기준으로 맞추고, 첫 달부터 마지막 달까지 어느 지표든 없는 달은 NaN.
+    날짜가 없는 배열은 start 달부터 시작하는 것으로 본다.
+    """
+    import pandas as pd
+
+    names = list(series) if names is None else list(names)
+    columns = {}
+    for n in names:
+        s = series[n]
+        if not isinstance(s, pd.Series):
+            s = pd.Series(np.asarray(s, dtype=np.float64), index=pd.period_range(start, periods=len(s), freq="M"))
+        columns[n] = s.astype(np.float64)
+    wide = pd.concat(columns, axis=1) if columns else pd.DataFrame(dtype=np.float64)
+    if len(wide):
+        wide = wide.reindex(pd.period_range(wide.index.min(), wide.index.max(), freq="M"))
+    wide.index.name = "date"
+    return wide.reindex(columns=names)
+
+
+def to_matrix(series: dict, names=None):
+    """
+    여러 지표를 (지표 수, 개월 수) 행렬로 쌓기.
+    위치가 아니라 달력 기준으로 맞추므로 시작 달이 다른 지표도 같은 열이 같은 달. 없는 달은 NaN.
+    """
+    names = list(series) if names is None else list(names)
+    return names, to_frame(series, names).to_numpy().T
+
+
+def change_rate(values, lag: int = 1, mode: str = "pct", pad: bool = False, scale: float = 100.0) -> np.ndarray:
+    """
+    마지막 축 기준 lag 기간 변화율 계산 (1차원/2차원 모두 가능).
+    - mode="pct": (x[t] - x[t-lag]) / x[t-lag] * scale
+    - mode="log": log(x[t] / x[t-lag]) * scale
+    - pad=True 이면 앞쪽 lag 개를 NaN 으로 채워 입력과 길이를 맞춤
+    """
+    if mode not in CHANGE_MODES:
+        raise ValueError(f"mode는 {CHANGE_MODES} 중 하나여야 합니다: {mode!r}")
+    if lag < 1:
+        raise ValueError(f"lag는 1 이상이어야 합니다: {lag}")
+
+    x = np.asarray(values, dtype=np.float64)
+    prev, curr = x[..., :-lag], x[..., lag:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if mode == "pct":
+            rate = (curr - prev) / prev * scale
+        else:
+            rate = np.log(curr / prev) * scale
+
+    if pad:
+        head = np.full(x.shape[:-1] + (min(lag, x.shape[-1]),), np.nan)
+        rate = np.concatenate([head, rate], axis=-1)
+    return rate
+
+
+def change_rates(values, lags=(1,), mode: str = "pct", scale: float = 100.0) -> np.ndarray:
+    """여러 lag 변화율을 (lag 수, ...입력 shape) 배열로 한 번에 계산 (앞쪽은 NaN)"""
+    return np.stack([change_rate(values, lag, mode=mode, pad=True, scale=scale) for lag in lags])
+
+
+# ---------------------------------------------------------
+# res/*.csv (가로로 긴 월별 표) -> 긴 형식
+# ---------------------------------------------------------
+# "2021.01", "2021,01", "2021-1" 처럼 연도와 월 사이 구분자가 파일마다 다름
+_PERIOD = re.compile(r"^\s*(\d{4})\D+(\d{1,2})\s*$")
+_res_cache = {}  # (경로, 크기, 수정 시각) 목록 -> 긴 형식 DataFrame
+
+
+def parse_periods(labels):
+    """열 이름들 -> 월 단위 PeriodIndex"""
+    import pandas as pd
+
+    parts = []
+    for label in labels:
+        m = _PERIOD.match(str(label))
+        if m is None:
+            raise ValueError(f"연월로 읽을 수 없는 열 이름입니다: {label!r}")
+        parts.append((int(m.group(1)), int(m.group(2))))
+    years, months = np.array(parts, dtype=np.int64).reshape(-1, 2).T
+    return pd.PeriodIndex.from_fields(year=years, month=months, freq="M")
+
+
+def read_wide_csv(path):
+    """
+    가로 표 하나 -> 긴 형식 DataFrame.
+    index: date (PeriodIndex), 컬럼: source(파일 이름), series(행 이름), value(float32). 빈 칸은 제외.
+    """
+    import pandas as pd
+
+    path = Path(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = [row for row in csv.reader(f) if row and row[0].strip()]
+    periods = parse_periods(rows[0][1:])
+
+    names = [row[0].strip() for row in rows[1:]]
+    values = np.full((len(names), len(periods)), np.nan, dtype=np.float32)
+    for i, row in enumerate(rows[1:]):
+        cells = [_clean(v) for v in row[1:len(periods) + 1]]
+        values[i, :len(cells)] = [float(v) if v else np.nan for v in cells]
+
+    ok = ~np.isnan(values.ravel())
+    long = pd.DataFrame({
+        "source": pd.Categorical([path.stem] * int(ok.sum())),
+        "series": np.repeat(np.array(names, dtype=object), len(periods))[ok],
+        "value": values.ravel()[ok],
+    }, index=periods[np.tile(np.arange(len(periods)), len(names))[ok]])
+    long.index.name = "date"
+    return long
+
+
+def load_res(paths=None):
+    """
+    res/*.csv 전체(또는 paths)를 하나의 긴 형식 DataFrame 으로.
+    파일 크기/수정 시각이 그대로면 이전에 읽은 결과를 쓴다.
+    """
+    import pandas as pd
+
+    paths = sorted(Path(RES_DIR).glob("*.csv")) if paths is None else [Path(p) for p in paths]
+    key = tuple((str(p.resolve()), p.stat().st_size, p.stat().st_mtime_ns) for p in paths)
+    if key not in _res_cache:
+        long = pd.concat([read_wide_csv(p) for p in paths])
+        long["source"] = long["source"].astype("category")
+        _res_cache.clear()
+        _res_cache[key] = long
+    return _res_cache[key].copy()
+
+
+def align_series(long, sources=None):
+    """
+    긴 형식 -> (월, 지표) 표. 모든 지표를 첫 달부터 마지막 달까지 같은 달력(PeriodIndex)에 맞추고 없는 달은 NaN.
+    같은 이름의 지표가 여러 파일에 있으면 먼저 나온 파일 값을 쓴다.
+    """
+    import pandas as pd
+
+    if sources is not None:
+        long = long[long["source"].isin(list(sources))]
+    long = long.reset_index()
+    long = long.drop_duplicates(["date", "series"], keep="first")
+    order = list(dict.fromkeys(long["series"]))
+    wide = long.pivot(index="date", columns="series", values="value")
+    calendar = pd.period_range(wide.index.min(), wide.index.max(), freq="M", name="date")
+    return wide.reindex(index=calendar, columns=order).astype(np.float32)
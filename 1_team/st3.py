@@ -1,44 +1,61 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
+
+# 저장소 루트의 artifacts.py (데이터/모델 레지스트리)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import artifacts
+import cpi_model
+from forecast import Forecaster, cumulative, fan, residual_shocks, scenario_paths
+from indicators import align_series, load_res
 
 #폰트설정(한글)
 KOREAN_FONT = dict(family="Malgun Gothic")
 
+# res/*.csv 를 (월, 지표) 표로 읽기: 파일마다 다른 날짜 표기("2021.01", "2021,01")를 PeriodIndex 로 통일
 @st.cache_data
 def load_data():
-        df1 = pd.read_csv("./1_team/res/소비자물가지수.csv", encoding='utf-8-sig')
-        df2 = pd.read_csv("./1_team/res/유가.csv", encoding='utf-8-sig')
-        df3 = pd.read_csv("./1_team/res/환율.csv", encoding='utf-8-sig')
-        df4 = pd.read_csv("./1_team/res/통합_2.csv", encoding='utf-8-sig')
-        return df1, df2, df3, df4
+        sources = ["cpi_index", "oil_price", "exchange_rate", "macro_combined"]
+        paths = [artifacts.path(name) for name in sources]
+        long = load_res(paths)
+        return tuple(align_series(long, [p.stem]) for p in paths)
 
-X_data = np.array([
-    
-    # 환율 데이터
-    [1.297, 0.691, 0.17, 0.177, 0.689, 1.146, 1.43, 0.793, 1.135, 0.008, 0.067, 0.871, 0.363, 1.893, 0.926, 1.21, 1.814, 0.068, 0.52, 0.701, 0.771, 0.038, 0.561, 0.134, 0.128, 0.229, 0.614, 0.002, 0.117, 0.27, 0.351, 0.095, 0.093, 0.078, 0.231, 1.189, 0.256, 0.506, 0.228, 0.095, 0.114, 0.064, 0.54, 0.357, 0.235, 0.454],
+# 회귀 모델: resources/*.txt 지표 변화율로 학습한 계수 (cpi_model.json, 입력 파일이 바뀌었을 때만 다시 학습)
+@st.cache_resource
+def load_cpi_model():
+    return cpi_model.load_or_fit(artifacts.path("macro_indicators"), artifacts.locate("cpi_model"))
+
+# 학습 데이터 (입력 지표 변화율, 물가지수 변화율)
+@st.cache_data
+def load_training_data():
+    return cpi_model.build_dataset(artifacts.path("macro_indicators"))
 
-    # 본원 통화
-    [3.177, 0.477, -0.388, 1.69, 2.429, -0.291, 0.876, 1.282, 2.695, -0.517, 1.079, 2.175, -0.155, 0.155, 1.78, 0.342, 0.038, 3.258, -2.605, 0.565, 1.536, -3.615, 0.306, -0.534, -0.115, -1.459, 0.273, 2.021, -0.838, 1.729, -0.944, 0.076, 0.305, -1.937, 1.472, 0.802, 1.515, 0.261, -0.707, 1.199, -0.222, 1.633, -0.475, 0.807, 0.182, -0.509],
+# 롤링 원점 백테스트 요약 (창 종류 x 예측 기간별 MAE/RMSE)
+@st.cache_data
+def run_backtest(X, y):
+    from backtest import evaluate
 
-    # 유가(휘발유)
-    [1.483, 3.421, 1.404, 0.456, 2.324, 3.292, 1.012, -0.187, 4.239, 1.464, -5.239, -0.677, 4.855, 13.055, 1.964, -0.479, 5.944, -2.592, -11.714, -3.47, -3.662, -0.98, -5.25, -0.048, 0.996, 0.872, 3.059, -0.74, -2.957, 0.306, 8.28, 3.052, 0.381, -5.171, -4.957, -1.957, 2.884, 1.523, 2.971, 0.574, -2.362, 3.002, -0.928, -4.084, -1.902, 2.322],
+    return evaluate(X, y, horizons=(1, 2, 3), n_jobs=1)
 
-    # 유가(경유)
-    [1.691, 3.9, 1.532, 0.455, 2.655, 3.724, 1.052, -0.234, 5.018, 2.679, -5.215, -1.046, 5.718, 18.891, 4.351, 3.035, 6.351, -0.197, -9.382, -2.07, -0.641, 2.22, -5.105, -6.048, -4.116, -4.151, -0.261, -4.15, -5.264, 0.143, 12.652, 5.935, 1.427, -3.673, -6.259, -3.03, 2.546, 1.398, 1.222, -1.167, -3.381, 3.692, -0.882, -4.62, -2.522, 2.786],
-    ]
-)
+# 입력 지표 조합 순위 (후보 지표 x 시차의 모든 조합 점수표)
+@st.cache_data
+def run_subset_search():
+    from subset_search import load_candidates, search
 
-Y_target = np.array([0.534, 0.256, 0.137, 0.069, 0.0, 0.206, 0.479, 0.409, 0.174, 0.503, 0.164, 0.779, 0.544, 0.645, 0.688, 0.627, 0.66, 0.481, -0.092, 0.175, 0.312, -0.082, 0.174, 0.741, 0.236, 0.172, 0.226, 0.325, 0.027, 0.117, 0.89, 0.508, 0.372, -0.521, 0.044, 0.39, 0.539, 0.149, 0.053, 0.079, -0.228, 0.255, 0.359, 0.096, 0.035, -0.253])
+    names, X, y = load_candidates(artifacts.path("macro_indicators"))
+    return search(X, y, names, max_size=4)
 
-# model = LinearRegression()
-# model.fit(X_data.T, Y_target)
+# 다개월 예측 모델 (물가 시차 항 개수별)
+@st.cache_resource
+def load_forecaster(ar_lags):
+    names, X, y = load_training_data()
+    return Forecaster.fit(X, y, names, ar_lags=ar_lags)
 
-b0 = 0.17835904841144312
-weights = np.array([0.11770982, 0.04759305, 0.0220467, 0.00542832])
-y_pred = b0 + np.dot(X_data.T, weights)
+model = load_cpi_model()
+feature_names, X_train, Y_target = load_training_data()
+y_pred = model.predict(X_train)
 
 #3. Streamlit 
 st.set_page_config(page_title='물가지수 예측 프로그램', layout="wide")
@@ -62,7 +79,8 @@ with st.sidebar:
 
         """)
 
-tab1, tab2, tab3 = st.tabs(['🔮 미래 예측', '📂 데이터 보기', '📊 시각화 분석'])
+# 탭을 바꿀 때 다시 실행하고 선택된 탭만 그림 (.open). 시각화 탭의 plotly·백테스트·조합 탐색은 그 탭을 열 때만 실행
+tab1, tab2, tab3 = st.tabs(['🔮 미래 예측', '📂 데이터 보기', '📊 시각화 분석'], key="tab", on_change="rerun")
 
 #tab 1: 예측 화면
 with tab1:
@@ -70,20 +88,15 @@ with tab1:
     st.write("### 🔮 미래 가격 상승률 예측하기")
     st.info("경제 지표 변화율을 직접 입력하고 내년 물가 상승률을 예측해보기.")
 
-    c1, c2, c3, c4 = st.columns(4)
-    with c1:
-        val1 = st.number_input("환율 변화율 (%)", value=1.5)
-    with c2:
-        val2 = st.number_input("본원통화 변화율 (%)", value=0.5)
-    with c3:
-        val3 = st.number_input("휘발유 변화율 (%)", value=-1.0)
-    with c4:
-        val4 = st.number_input("경유 변화율 (%)", value=-1.0)
-
-    user_input = np.array([val1, val2, val3, val4])
+    # 모델 입력 지표마다 입력칸 하나 (지표가 늘어나면 칸도 늘어남)
+    defaults = {"환율": 1.5, "본원통화": 0.5, "휘발유": -1.0, "경유": -1.0}
+    user_input = []
+    for col, name in zip(st.columns(len(model.feature_names)), model.feature_names):
+        with col:
+            user_input.append(st.number_input(f"{name} 변화율 (%)", value=defaults.get(name, 0.0)))
 
     # 예측 계산
-    result = b0 + np.dot(user_input, weights)
+    result = float(model.predict(user_input)[0])
 
     st.divider()
     st.metric(label="내년 예상 물가 상승률", value=f"{result:.3f} %", delta=f"{result - 2.2:.3f} % (전년비)")
@@ -92,6 +105,43 @@ with tab1:
     else:
         st.success(f"✅ 예측 결과, 물가 상승률이 {result:.2f}%로 비교적 안정적일 것으로 보입니다.")
 
+    # 여러 달 예측: 입력값을 기준 경로로 두고 과거 지표 변동을 더한 시나리오들로 재귀 예측
+    st.divider()
+    if st.toggle("📈 여러 달 예측 (시나리오)", value=False):
+        import plotly.graph_objects as go
+
+        f1, f2, f3, f4 = st.columns(4)
+        with f1:
+            horizon = st.slider("예측 기간 (개월)", 1, 24, 12)
+        with f2:
+            ar_lags = st.selectbox("물가 시차 항 (개월)", [0, 1, 2], index=1, help="앞 달 물가 변화율을 다음 달 입력으로 사용")
+        with f3:
+            n_scenarios = st.select_slider("시나리오 수", [100, 200, 500, 1000, 2000], value=500)
+        with f4:
+            spread = st.slider("지표 변동 폭 (과거 대비 배수)", 0.0, 2.0, 1.0, 0.1)
+
+        forecaster = load_forecaster(ar_lags)
+        paths = scenario_paths(X_train, user_input, horizon, n_scenarios, scale=spread)
+        scenarios = forecaster.simulate(paths, residual_shocks(forecaster, n_scenarios, horizon))
+        bands = fan(scenarios)
+        total = fan(cumulative(scenarios))
+
+        fig = go.Figure()
+        for lo, hi, alpha in (("q05", "q95", 0.15), ("q25", "q75", 0.3)):
+            fig.add_trace(go.Scatter(x=bands.index, y=bands[hi], line=dict(width=0), showlegend=False, hoverinfo="skip"))
+            fig.add_trace(go.Scatter(x=bands.index, y=bands[lo], line=dict(width=0), fill="tonexty",
+                                     fillcolor=f"rgba(220, 60, 60, {alpha})", name=f"{lo[1:]}~{hi[1:]}% 구간"))
+        fig.add_trace(go.Scatter(x=bands.index, y=bands["q50"], name="중앙값", line=dict(color="red")))
+        fig.add_hline(y=0, line_dash="dash", line_color="gray")
+        fig.update_layout(title="월별 물가 상승률 예측 분포", font=KOREAN_FONT,
+                          xaxis_title="개월 후", yaxis_title="전월 대비 변화율(%)")
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.metric(label=f"{horizon}개월 누적 물가 상승률 (중앙값)", value=f"{total['q50'].iloc[-1]:.2f} %",
+                  delta=f"90% 구간 {total['q05'].iloc[-1]:.2f} ~ {total['q95'].iloc[-1]:.2f} %", delta_color="off")
+        st.dataframe(bands.round(3), use_container_width=True)
+        st.info("입력한 변화율을 매달의 기준값으로 두고, 과거에 실제로 있었던 지표 변동과 모델 오차를 무작위로 더한 시나리오들의 분포")
+
 #tab 2: 데이터 보기 
 with tab2:
     st.subheader("사용한 데이터 자료 보기")
@@ -112,47 +162,68 @@ with tab2:
 
 # tab 3: 시각화 화면
 with tab3:
-    st.header("📊 분석 결과 시각화")
+    if tab3.open:
+        st.header("📊 분석 결과 시각화")
+
+        # plotly 는 이 탭을 열었을 때만 import
+        import plotly.express as px
+        import plotly.graph_objects as go
     
-    # 날짜 및 예측값 데이터 생성
-    dt_range = pd.date_range(start="2021-01-01", periods=len(Y_target), freq='M')
-    # y_pred = model.predict(X_data.T)
+        # 날짜 및 예측값 데이터 생성
+        dt_range = pd.date_range(start="2021-01-01", periods=len(Y_target), freq='ME')
     
-    # 1. 산점도 그래프
-    with st.expander("1. 과거 변화율 분포"):
-        f1 = px.scatter(x = range(len(Y_target)), y = Y_target, title = "과거 변화율 분포", labels = {"x": "인덱스(시간)", "y": "변화율(%)"})
-        f1.add_hline(y=0, line_dash="dash", line_color="red")
+        # 1. 산점도 그래프
+        with st.expander("1. 과거 변화율 분포"):
+            f1 = px.scatter(x = range(len(Y_target)), y = Y_target, title = "과거 변화율 분포", labels = {"x": "인덱스(시간)", "y": "변화율(%)"})
+            f1.add_hline(y=0, line_dash="dash", line_color="red")
 
-        f1.update_layout(font=KOREAN_FONT)
-        st.plotly_chart(f1, use_container_width=True)
+            f1.update_layout(font=KOREAN_FONT)
+            st.plotly_chart(f1, use_container_width=True)
         
-        st.info("5년간 물가 변동 데이터를 점으로 찍은 그래프, 과거 전반의 변동 폭 가늠할 수 있음")
+            st.info("5년간 물가 변동 데이터를 점으로 찍은 그래프, 과거 전반의 변동 폭 가늠할 수 있음")
 
-    # 2. 실제값과 예측값 비교 선그래프
-    with st.expander("2. 실제값과 예측값 비교 선그래프"):
-        f2 = go.Figure()
-        f2.add_trace(go.Scatter(x=dt_range, y=Y_target, name="실제값", line=dict(color="blue")))
-        f2.add_trace(go.Scatter(x=dt_range, y= y_pred, name="예측값", line=dict(color="red", dash="dash")))
+        # 2. 실제값과 예측값 비교 선그래프
+        with st.expander("2. 실제값과 예측값 비교 선그래프"):
+            f2 = go.Figure()
+            f2.add_trace(go.Scatter(x=dt_range, y=Y_target, name="실제값", line=dict(color="blue")))
+            f2.add_trace(go.Scatter(x=dt_range, y= y_pred, name="예측값", line=dict(color="red", dash="dash")))
         
-        f2.update_layout(title="실제값과 예측값 추이 비교", font=KOREAN_FONT)
-        st.plotly_chart(f2, use_container_width=True)
-
-        st.info("과거 2021~2023의 경제 상황은 잘 설명하고 있으나 이후 차이폭이 커짐 이는 외부 변수의 영향력이 더 커졌거나 예외적 경제 충격의 영향으로 볼 수 있음" )
-
-    # 3. 주요 지표 간 상관관계 분석(히트맵)
-    with st.expander("4. 경제 지표 간 상관관계 분석(Heatmap)"):
-        corr_data = pd.DataFrame(X_data.T, columns = ['환율','본원통화','휘발유','경유'])
-        corr_data['물가지수'] = Y_target
-
-        # 상관계수 계산하기
-        df_corr = corr_data.corr()
-
-        # 히트맵 
-        f4 = px.imshow(
-            df_corr,
-            text_auto='.3f',
-            title = "경제 지표 및 물가 상관관계 히트맵"
-        )
-        f4.update_layout(font = KOREAN_FONT, xaxis_title = "경제 지표", yaxis_title = "경제 지표")
-        st.plotly_chart(f4, use_container_width=True)
-
+            f2.update_layout(title="실제값과 예측값 추이 비교", font=KOREAN_FONT)
+            st.plotly_chart(f2, use_container_width=True)
+
+            st.info("과거 2021~2023의 경제 상황은 잘 설명하고 있으나 이후 차이폭이 커짐 이는 외부 변수의 영향력이 더 커졌거나 예외적 경제 충격의 영향으로 볼 수 있음" )
+
+        # 3. 롤링 원점 백테스트 (원점마다 그 이전 데이터로만 다시 학습한 표본 외 오차)
+        with st.expander("3. 백테스트 (표본 외 예측 오차)"):
+            backtest_table = run_backtest(X_train, Y_target)
+            st.dataframe(backtest_table.round(4), use_container_width=True, hide_index=True)
+
+            st.info("매달을 기준 시점으로 그 이전 데이터만으로 다시 학습해 1~3개월 뒤를 예측한 오차. expanding 은 처음부터 전부, sliding 은 최근 24개월만 학습")
+
+        # 3. 주요 지표 간 상관관계 분석(히트맵)
+        with st.expander("4. 경제 지표 간 상관관계 분석(Heatmap)"):
+            corr_data = pd.DataFrame(X_train, columns = feature_names)
+            corr_data['물가지수'] = Y_target
+
+            # 상관계수 계산하기
+            df_corr = corr_data.corr()
+
+            # 히트맵 
+            f4 = px.imshow(
+                df_corr,
+                text_auto='.3f',
+                title = "경제 지표 및 물가 상관관계 히트맵"
+            )
+            f4.update_layout(font = KOREAN_FONT, xaxis_title = "경제 지표", yaxis_title = "경제 지표")
+            st.plotly_chart(f4, use_container_width=True)
+
+        # 5. 입력 지표 조합 탐색 (후보 10개 지표 x 시차 0~2개월, 최대 4개 조합)
+        with st.expander("5. 입력 지표 조합 순위"):
+            board = run_subset_search()
+            current = ", ".join(model.feature_names)
+            rank = board.index[board["features"] == current]
+            st.dataframe(board.head(20).round(4), use_container_width=True)
+            if len(rank):
+                st.caption(f"현재 모델({current})은 {len(board):,}개 조합 중 {rank[0] + 1:,}위 (LOOCV RMSE {board.loc[rank[0], 'loocv_rmse']:.4f})")
+
+            st.info("후보 지표의 모든 조합을 같은 기간으로 학습해 leave-one-out 오차(LOOCV RMSE)가 작은 순서로 정렬. (t-1) 은 1개월 전 변화율")
@@ -0,0 +1,145 @@
+"""
+물가지수 회귀 입력 지표 조합 탐색.
+
+후보 지표(금리, 현금통화, 실업률, 환율, 본원통화, 유가 4종, LF)의 변화율과 그 시차(t, t-1, t-2) 열을
+한 표로 만들고, 지표마다 시차는 하나만 고르는 모든 조합(최대 max_size 개)을 평가한다.
+
+전체 열의 AᵀA, Aᵀy 를 한 번만 계산해 두고 조합마다 그 부분 행렬만 잘라 푼다.
+같은 크기의 조합들은 (조합 수, k+1, k+1) 배열로 쌓아 한 번에 np.linalg.solve 하므로
+조합마다 sklearn 으로 다시 학습하지 않는다.
+점수: R², 수정 R², BIC, LOOCV RMSE (hat 행렬 대각으로 계산한 정확한 leave-one-out 오차).
+
+    python 1_team/subset_search.py --max-size 4 --top 20
+"""
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# 입력 이름 -> 지표 파일 이름 (resources/*.txt, 목표와 같은 기간의 지표)
+CANDIDATES = {
+    "기준금리": "2020 ~ 2025 기준 금리",
+    "현금통화": "현금통화",
+    "실업률": "실업률 데이터",
+    "환율": "환율 데이터",
+    "본원통화": "본원 통화",
+    "휘발유": "유가(일반 휘발유)",
+    "고급휘발유": "유가(고급 휘발유)",
+    "경유": "유가(경유)",
+    "등유": "유가(실내 등유)",
+    "LF": "lf",
+}
+LAGS = (0, 1, 2)
+
+
+def lag_label(name: str, lag: int) -> str:
+    return name if lag == 0 else f"{name}(t-{lag})"
+
+
+def lagged_pool(X, y, names, lags=LAGS):
+    """
+    (열 이름 목록, 시차 열 표 (개월 수 - 최대 시차, 지표 수 × 시차 수), 맞춘 y).
+    지표 j 의 시차 lags[l] 열 번호는 j * len(lags) + l.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    max_lag = max(lags)
+    n = len(y) - max_lag
+    columns, labels = [], []
+    for j, name in enumerate(names):
+        for lag in lags:
+            columns.append(X[max_lag - lag:max_lag - lag + n, j])
+            labels.append(lag_label(name, lag))
+    return labels, np.column_stack(columns), y[max_lag:]
+
+
+def subset_columns(n_candidates: int, n_lags: int, size: int) -> np.ndarray:
+    """크기 size 조합들의 열 번호 (조합 수, size). 지표마다 시차는 하나"""
+    combos = np.array(list(itertools.combinations(range(n_candidates), size)), dtype=np.int64)
+    lag_choices = np.array(list(itertools.product(range(n_lags), repeat=size)), dtype=np.int64)
+    cols = combos[:, None, :] * n_lags + lag_choices[None, :, :]
+    return cols.reshape(-1, size)
+
+
+def _score_size(A, y, G, c, yy, cols) -> dict:
+    """같은 크기 조합들을 한 번에 풀기. cols: (조합 수, k) -> 점수 배열들"""
+    idx = np.concatenate([np.zeros((len(cols), 1), dtype=np.int64), cols + 1], axis=1)  # 0번은 절편
+    G_s = G[idx[:, :, None], idx[:, None, :]]
+    c_s = c[idx]
+    try:
+        G_inv = np.linalg.inv(G_s)
+    except np.linalg.LinAlgError:
+        G_inv = np.linalg.pinv(G_s)
+    beta = np.einsum("mij,mj->mi", G_inv, c_s)
+    rss = yy - np.einsum("mi,mi->m", c_s, beta)
+
+    # LOOCV: e_i / (1 - h_ii), h_ii = a_iᵀ (A_sᵀA_s)⁻¹ a_i
+    A_s = A[:, idx]                                     # (n, m, k+1)
+    resid = y[:, None] - np.einsum("nmi,mi->nm", A_s, beta)
+    hat = np.einsum("nmi,mij,nmj->nm", A_s, G_inv, A_s)
+    loo = resid / (1.0 - hat)
+    return {"rss": np.maximum(rss, 0.0), "loocv_rmse": np.sqrt((loo ** 2).mean(axis=0))}
+
+
+def search(X, y, names, lags=LAGS, max_size: int = 4, top: int = None) -> pd.DataFrame:
+    """
+    모든 조합의 점수표 (LOOCV RMSE 오름차순).
+    컬럼: features, k, r2, adj_r2, bic, loocv_rmse
+    """
+    labels, P, y = lagged_pool(X, y, names, lags)
+    n = len(y)
+    A = np.column_stack([np.ones(n), P])
+    G = A.T @ A
+    c = A.T @ y
+    yy = float(y @ y)
+    tss = float(((y - y.mean()) ** 2).sum())
+
+    parts = []
+    for size in range(1, min(max_size, len(names), n - 2) + 1):
+        cols = subset_columns(len(names), len(lags), size)
+        scores = _score_size(A, y, G, c, yy, cols)
+        rss = scores["rss"]
+        r2 = 1.0 - rss / tss
+        parts.append(pd.DataFrame({
+            "features": [", ".join(labels[j] for j in row) for row in cols],
+            "k": size,
+            "r2": r2,
+            "adj_r2": 1.0 - (1.0 - r2) * (n - 1) / (n - size - 1),
+            "bic": n * np.log(rss / n) + (size + 1) * np.log(n),
+            "loocv_rmse": scores["loocv_rmse"],
+        }))
+    board = pd.concat(parts, ignore_index=True).sort_values(["loocv_rmse", "bic"]).reset_index(drop=True)
+    return board if top is None else board.head(top)
+
+
+def load_candidates(resource_dir=None, candidates=CANDIDATES):
+    """후보 지표 변화율 (이름 목록, X, y). cpi_model 과 같은 변화율 정의"""
+    import cpi_model
+
+    kwargs = {} if resource_dir is None else {"resource_dir": resource_dir}
+    return cpi_model.build_dataset(features=candidates, **kwargs)
+
+
+def main():
+    import time
+
+    parser = argparse.ArgumentParser(description="물가지수 회귀 입력 지표 조합 탐색")
+    parser.add_argument("--max-size", type=int, default=4, help="조합에 넣을 최대 지표 수")
+    parser.add_argument("--lags", type=int, nargs="+", default=list(LAGS), help="시차 후보 (개월)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--report", help="전체 점수표 저장 (.csv)")
+    args = parser.parse_args()
+
+    names, X, y = load_candidates()
+    t0 = time.perf_counter()
+    board = search(X, y, names, lags=tuple(args.lags), max_size=args.max_size)
+    print(f"조합 {len(board):,}개 평가 ({time.perf_counter() - t0:.2f}초, {len(y)}개월)")
+    with pd.option_context("display.width", 200, "display.max_colwidth", 80):
+        print(board.head(args.top).round(4).to_string(index=False))
+    if args.report:
+        board.to_csv(args.report, index=False, encoding="utf-8-sig")
+
+
+if __name__ == "__main__":
+    main()
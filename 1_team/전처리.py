@@ -1,24 +1,23 @@
-def cal(a, b):
-    a, b = float(a), float(b)
+import os
+import sys
 
-    return (b - a) / a * 100
+import numpy as np
 
-with open(r'D:\dbdpr\resources\lf.txt', 'r', encoding = 'utf-8') as f:
-    line = f.readline().split(',')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import artifacts
+from indicators import change_rate, load_indicators, to_matrix
 
-print(line, len(line))
+# resources 폴더(레지스트리 macro_indicators)의 모든 지표를 한 번에 읽어 전월 대비 변화율(%) 계산
+series = load_indicators(artifacts.path("macro_indicators"))
+names, matrix = to_matrix(series)
+rates = np.round(change_rate(matrix, lag=1, mode="pct"), 3)
 
-new_data = []
-before = line[0].replace('\"', '').replace(',', '')
-
-for i in line[1:]:
-    i = i.replace('\"', '').replace(',', '')
-    new_data.append(round(cal(before, i), 3))
-    before = i
-
-print(len(new_data))
-print(new_data)
+for name, row in zip(names, rates):
+    row = row[~np.isnan(row)]
+    print(f"# {name} ({len(series[name])}개 -> 변화율 {len(row)}개)")
+    print(row.tolist())
+    print()
 
 # 2021.01 ~ 2024.11
 # 실업률, 유가, 통화량, 환율, 소비자 물가 지수(O)
@@ -0,0 +1,165 @@
+import os
+import re
+
+import pandas as pd
+
+from parallel_ingest import ingest_files
+from weather_agg import STORE_DIR, WeatherAggStore, weighted_index
+
+# ASOS 관측소 번호 -> 시도 (사고 통계의 시도 이름과 같게)
+STATION_REGION = {
+    108: "서울",
+    159: "부산",
+    143: "대구",
+    112: "인천", 201: "인천",
+    156: "광주",
+    133: "대전",
+    152: "울산",
+    239: "세종",
+    119: "경기", 98: "경기", 99: "경기", 202: "경기", 203: "경기",
+    90: "강원", 100: "강원", 101: "강원", 105: "강원", 114: "강원", 211: "강원",
+    131: "충북", 127: "충북", 221: "충북",
+    129: "충남", 232: "충남", 235: "충남", 236: "충남",
+    146: "전북", 140: "전북", 243: "전북",
+    165: "전남", 168: "전남", 170: "전남", 260: "전남",
+    138: "경북", 136: "경북", 130: "경북", 137: "경북", 279: "경북",
+    155: "경남", 162: "경남", 192: "경남", 288: "경남", 295: "경남",
+    184: "제주", 189: "제주",
+}
+
+ACCIDENT_METRIC = "사고[건]"
+
+
+# 시간대 라벨("0시~2시")에서 시작 시각(0)을 추출해 정렬에 활용
+def start_hour(label: str) -> int:
+    m = re.match(r"(\d+)시~", str(label))
+    return int(m.group(1)) if m else 999
+
+
+def parse_accidents(path, encoding: str = "cp949") -> pd.DataFrame:
+    """
+    시도별·시간대별 사고 통계(연도/시간대 2줄 헤더) -> 긴 형식
+    [시도, 연도, 항목, 시간대, 값]. 여러 연도 컬럼 묶음과 모든 시도를 한 번에 처리.
+    """
+    raw = pd.read_csv(path, encoding=encoding, header=[0, 1], thousands=",")
+    region = raw.iloc[:, 0].astype(str).str.strip()
+    metric = raw.iloc[:, 1].astype(str).str.strip()
+
+    band_cols = [c for c in raw.columns[2:] if re.search(r"시~", str(c[1]))]
+    values = raw[band_cols].apply(pd.to_numeric, errors="coerce")
+    values.columns = pd.MultiIndex.from_tuples(
+        [(int(str(y).strip()), str(b).strip()) for y, b in band_cols], names=["연도", "시간대"]
+    )
+    values.index = pd.MultiIndex.from_arrays([region, metric], names=["시도", "항목"])
+
+    df = values.stack(["연도", "시간대"], future_stack=True).rename("값").reset_index()
+    # 각주 줄 등 값이 없는 행 제거
+    df = df[df["항목"].ne("nan") & df["값"].notna()]
+    return df[["시도", "연도", "항목", "시간대", "값"]].reset_index(drop=True)
+
+
+def build_frames(df_acc_band, df_w_band_annual, df_w_month, df_w_month_band):
+    """시간대별 사고건수 + 날씨 요약 -> (df_band, df_month)"""
+    # 시간 별 날씨,사고 데이터 병합
+    df_band = df_acc_band.merge(df_w_band_annual, on="시간대", how="left")
+
+    # 월별(기상) 가중 사고지수(추정)
+    df_w_month_band = df_w_month_band.merge(df_acc_band, on="시간대", how="left")
+    df_w_month_band["precip_hours"] = df_w_month_band["rain_hours"] + df_w_month_band["snow_hours"]
+
+    # 월별 강수·적설 발생시간 가중 평균 사고건수
+    df_month_index = weighted_index(df_w_month_band, by="month", value="사고건수", weight="precip_hours")
+
+    month_template = pd.DataFrame({"month": list(range(1, 13))})
+    df_month = (
+        month_template
+        .merge(df_w_month, on="month", how="left")
+        .merge(df_month_index, on="month", how="left")
+        .sort_values("month")
+        .reset_index(drop=True)
+    )
+
+    for c in ["total_rain", "total_snow", "rain_hours", "snow_hours", "precip_hours"]:
+        df_month[c] = df_month[c].fillna(0)
+
+    df_month["avg_temp"] = df_month["avg_temp"].interpolate(limit_direction="both")
+    df_month["no_precip_flag"] = df_month["weighted_index"].isna().astype(int)
+    df_month["weighted_index"] = df_month["weighted_index"].fillna(0)
+    df_month["month_label"] = df_month["month"].astype(int).astype(str).str.zfill(2)
+
+    return df_band, df_month
+
+
+class AnalysisEngine:
+    """
+    전국 시도 × 연도 × 월 × 시간대 분석 엔진.
+    사고 통계와 관측소별 날씨 누적 합계를 한 번만 만들어 두고,
+    (시도, 연도) 조각은 저장된 합계에서 바로 잘라 만든다.
+    """
+
+    def __init__(self, accidents: pd.DataFrame, store: WeatherAggStore, station_region: dict = None):
+        self.accidents = accidents
+        self.store = store
+        self.station_region = dict(STATION_REGION if station_region is None else station_region)
+
+    @classmethod
+    def build(cls, time_acc_path, weather_paths, station_region: dict = None, store_dir=STORE_DIR,
+              accident_encoding: str = "cp949", workers: int = None) -> "AnalysisEngine":
+        """
+        사고 통계 파일과 날씨 파일들로 엔진 생성.
+        날씨는 바뀐 파일만 workers 개 프로세스에서 나눠 파싱하고 파일별 저장소에 새 행만 누적.
+        """
+        if isinstance(weather_paths, (str, os.PathLike)):
+            weather_paths = [weather_paths]
+
+        store = ingest_files(weather_paths, workers=workers, store_dir=store_dir)
+        accidents = parse_accidents(time_acc_path, encoding=accident_encoding)
+        return cls(accidents, store, station_region)
+
+    # ----- 조회 가능한 조각 -----
+    def stations_of(self, region: str) -> list:
+        return [s for s in self.store.stations() if self.station_region.get(s) == region]
+
+    def available(self, metric: str = ACCIDENT_METRIC) -> pd.DataFrame:
+        """사고 통계와 날씨가 모두 있는 (시도, 연도) 목록"""
+        acc = self.accidents.loc[self.accidents["항목"] == metric, ["시도", "연도"]].drop_duplicates()
+
+        keys = self.store.state.index.to_frame(index=False)[["station", "year"]].drop_duplicates()
+        keys["시도"] = keys["station"].map(self.station_region)
+        weather = keys.dropna(subset=["시도"]).rename(columns={"year": "연도"})[["시도", "연도"]].drop_duplicates()
+
+        both = acc.merge(weather, on=["시도", "연도"], how="inner")
+        return both.sort_values(["시도", "연도"]).reset_index(drop=True)
+
+    def accident_band(self, region: str, year: int, metric: str = ACCIDENT_METRIC) -> pd.DataFrame:
+        """시간대별 사고건수 [시간대, 사고건수] (시간 순서)"""
+        acc = self.accidents
+        acc = acc[(acc["시도"] == region) & (acc["연도"] == int(year)) & (acc["항목"] == metric)]
+        df_acc_band = pd.DataFrame({
+            "시간대": acc["시간대"].to_numpy(),
+            "사고건수": acc["값"].astype(float).round().astype("Int64").to_numpy(),
+        })
+        df_acc_band["sort_key"] = df_acc_band["시간대"].map(start_hour)
+        return df_acc_band.sort_values("sort_key").drop(columns=["sort_key"]).reset_index(drop=True)
+
+    def slice(self, region: str, year: int, metric: str = ACCIDENT_METRIC):
+        """
+        (시도, 연도) 조각의 (df_band, df_month).
+        관측소가 여러 곳인 시도는 강수·적설 합계와 발생 시간을 관측소 평균으로 쓴다 (관측소-시간 합이 아니라).
+        """
+        stations = self.stations_of(region)
+        years = [int(year)]
+        return build_frames(
+            self.accident_band(region, year, metric),
+            self.store.band_frame(stations, years, per_station=True),
+            self.store.month_frame(stations, years, per_station=True),
+            self.store.month_band_frame(stations, years, per_station=True),
+        )
+
+    def slices(self, metric: str = ACCIDENT_METRIC) -> dict:
+        """가능한 모든 (시도, 연도) 조각을 한 번에 계산"""
+        return {
+            (r.시도, int(r.연도)): self.slice(r.시도, r.연도, metric)
+            for r in self.available(metric).itertuples(index=False)
+        }
+
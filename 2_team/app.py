@@ -1,10 +1,13 @@
 import streamlit as st
-import joblib
 import pandas as pd
-import numpy as np
-import json
-import plotly.express as px
-import plotly.graph_objects as go
+import os
+import sys
+
+# 저장소 루트의 artifacts.py (데이터/모델 레지스트리)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import artifacts
+from linear_scorer import LinearScorer, load_predictor
+# 나머지 모듈(일괄 예측, 분석 엔진, 그림 캐시, 마이크로 배치)은 쓰는 곳에서 import
 
 # 페이지 설정
 st.set_page_config(
@@ -23,22 +26,40 @@ st.markdown("---")
 # 모델 로드 (캐싱)
 @st.cache_resource
 def load_model():
-    """모델 로드"""
+    """모델 로드 (저장된 계수로 만든 예측기, 검증에 실패하면 sklearn 모델)"""
     try:
-        return joblib.load('./2_team/accident_model.joblib')
+        return load_predictor(artifacts.path('accident_model_info'), artifacts.path('accident_model'))
     except FileNotFoundError:
         st.error("❌ 모델 파일을 찾을 수 없습니다. 먼저 model_training.ipynb를 실행하여 모델을 학습하세요.")
         return None
 
+@st.cache_resource
+def get_batcher(_model):
+    """
+    (sklearn 모델로 되돌아간 경우만) 여러 세션의 한 건 예측을 모아 한 번의 predict 로 처리.
+    LinearScorer 는 내적 한 번이라 모으지 않고 바로 계산한다.
+    """
+    from batch_predict import FEATURE_NAMES
+    from microbatch import MicroBatcher
+
+    return MicroBatcher(lambda X: _model.predict(pd.DataFrame(X, columns=FEATURE_NAMES)),
+                        max_batch=64, max_wait_ms=2)
+
 @st.cache_data
 def load_model_info():
     """모델 정보 로드"""
     try:
-        with open('./2_team/model_info.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return artifacts.load('accident_model_info')
     except FileNotFoundError:
         return None
 
+@st.cache_resource
+def get_figure_cache():
+    """분석 탭 그림 캐시 (프로세스 전체에서 공유)"""
+    from figure_cache import FigureCache
+
+    return FigureCache(max_bytes=16 * 1024 * 1024)
+
 # 모델 및 정보 로드
 model = load_model()
 model_info = load_model_info()
@@ -67,7 +88,9 @@ if 'predictions' not in st.session_state:
     st.session_state.predictions = []
 
 # 메인 영역
-tab1, tab2, tab3, tab4 = st.tabs(["🔮 예측", "📈 모델 성능", "📊 데이터 분석", "📋 예측 히스토리"])
+# 탭을 바꿀 때 다시 실행하고 선택된 탭만 그림 (.open). 일괄 예측·데이터 분석 탭은 열었을 때만 모듈을 불러오고 계산
+tab1, tab_batch, tab2, tab3, tab4 = st.tabs(["🔮 예측", "📦 일괄 예측", "📈 모델 성능", "📊 데이터 분석", "📋 예측 히스토리"],
+                                            key="tab", on_change="rerun")
 
 # 탭 1: 예측
 with tab1:
@@ -147,18 +170,16 @@ with tab1:
         
         # 예측 버튼
         if st.button("🔮 사고건수 예측하기", type="primary", use_container_width=True):
-            # 입력 데이터 준비
-            input_data = pd.DataFrame({
-                'avg_temp': [avg_temp],
-                'total_rain': [total_rain],
-                'total_snow': [total_snow],
-                'rain_hours': [rain_hours],
-                'snow_hours': [snow_hours],
-                'avg_humidity': [avg_humidity]
-            })
+            # 입력 데이터 준비 (FEATURE_NAMES 순서)
+            from batch_predict import FEATURE_NAMES
+
+            input_row = [avg_temp, total_rain, total_snow, rain_hours, snow_hours, avg_humidity]
             
-            # 예측 (스케일링 없이)
-            predicted_accident = model.predict(input_data)[0]
+            # 예측 (스케일링 없이). 저장된 계수 예측기는 바로, sklearn 모델은 다른 세션 요청과 묶어서 한 번에
+            if isinstance(model, LinearScorer):
+                predicted_accident = model.predict_one(dict(zip(FEATURE_NAMES, input_row)))
+            else:
+                predicted_accident = float(get_batcher(model).predict([input_row])[0])
             
             # 예측값이 음수가 되지 않도록 조정
             predicted_accident = max(0, predicted_accident)
@@ -214,6 +235,62 @@ with tab1:
         else:
             st.info("👈 왼쪽에서 날씨 정보를 입력하고 예측 버튼을 클릭하세요.")
 
+# 탭: 일괄 예측
+with tab_batch:
+    if tab_batch.open:
+        from batch_predict import FEATURE_NAMES, daily_features, predict_frame, read_rows, to_download
+
+        st.header("일괄 사고건수 예측")
+        st.markdown(f"**입력 컬럼**: {', '.join(FEATURE_NAMES)} (일별 1행)")
+
+        source = st.radio("입력 데이터", ["파일 업로드 (CSV/Parquet)", "기간 선택 (timedata.csv)"], horizontal=True)
+
+        batch_input = None
+        if source.startswith("파일"):
+            uploaded = st.file_uploader("일별 기상 데이터 파일", type=["csv", "parquet"])
+            if uploaded is not None:
+                try:
+                    batch_input = read_rows(uploaded)
+                except Exception as e:
+                    st.error(f"파일을 읽을 수 없습니다: {e}")
+        else:
+            col_start, col_end = st.columns(2)
+            with col_start:
+                start_date = st.date_input("시작일", value=pd.Timestamp("2024-01-01"))
+            with col_end:
+                end_date = st.date_input("종료일", value=pd.Timestamp("2024-12-31"))
+
+            if start_date > end_date:
+                st.warning("시작일이 종료일보다 늦습니다.")
+            else:
+                from weather_cache import load_weather
+
+                df_hourly = load_weather(artifacts.path("weather_hourly"), years=range(start_date.year, end_date.year + 1))
+                in_range = (df_hourly["datetime"].dt.date >= start_date) & (df_hourly["datetime"].dt.date <= end_date)
+                batch_input = daily_features(df_hourly[in_range])
+
+        if batch_input is not None:
+            st.caption(f"입력 {len(batch_input):,}행")
+
+            if st.button("📦 일괄 예측하기", type="primary", use_container_width=True):
+                try:
+                    st.session_state.batch_result = predict_frame(model, batch_input)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+
+        batch_result = st.session_state.get("batch_result")
+        if batch_result is not None:
+            st.subheader("예측 결과")
+            st.dataframe(batch_result, use_container_width=True)
+
+            fmt = st.radio("다운로드 형식", ["csv", "parquet"], horizontal=True)
+            st.download_button(
+                "⬇️ 예측 결과 다운로드",
+                data=to_download(batch_result, fmt),
+                file_name=f"accident_predictions.{fmt}",
+                mime="text/csv" if fmt == "csv" else "application/octet-stream",
+            )
+
 # 탭 2: 모델 성능
 with tab2:
     st.header("모델 성능 정보")
@@ -276,295 +353,196 @@ with tab2:
 
 # 탭 3: 데이터 분석
 with tab3:
-    st.header("데이터 분석")
+    if tab3.open:
+        st.header("데이터 분석")
+
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        from analysis_engine import AnalysisEngine
+        from figure_cache import frame_fingerprint
+
+        @st.cache_resource(show_spinner=False)
+        def load_analysis_engine(time_acc_path: str, weather_paths: tuple, weather_version: tuple = ()):
+            # weather_version: 날씨 파일들의 수정 시각. 새 행이 들어오면 엔진을 다시 만들어 누적 저장소를 갱신
+            # 사고 통계는 모든 시도·연도를 한 번에 파싱하고, 날씨는 관측소·연도·월·시간대 합계만 보관
+            return AnalysisEngine.build(time_acc_path, list(weather_paths))
+
+        # ===== 데이터 생성 =====
+        try:
+            TIME_ACC_PATH = str(artifacts.path("accident_by_hour"))
+            WEATHER_PATHS = [str(artifacts.path("weather_hourly"))]
+            engine = load_analysis_engine(
+                TIME_ACC_PATH, tuple(WEATHER_PATHS), tuple(os.path.getmtime(p) for p in WEATHER_PATHS)
+            )
+            available = engine.available()
+        except FileNotFoundError as e:
+            st.error(f"파일을 찾을 수 없습니다: {e}")
+            st.stop()
+        except Exception as e:
+            st.error(f"데이터 분석 전처리 중 오류가 발생했습니다: {e}")
+            st.stop()
+
+        if available.empty:
+            st.warning("사고 통계와 날씨 데이터가 함께 있는 시도·연도가 없습니다.")
+            st.stop()
+
+        # 시도·연도 선택 (기본: 서울, 가장 최근 연도)
+        regions = available["시도"].drop_duplicates().tolist()
+        col_region, col_year = st.columns(2)
+        with col_region:
+            region = st.selectbox("시도", regions, index=regions.index("서울") if "서울" in regions else 0)
+        years = sorted(available.loc[available["시도"] == region, "연도"].astype(int).tolist())
+        with col_year:
+            year = st.selectbox("연도", years, index=len(years) - 1)
+
+        df_band, df_month = engine.slice(region, year)
+
+        # 그림은 df_band/df_month 내용이 같으면 다시 만들지 않고 세션 간 공유 캐시의 JSON 을 사용
+        fig_cache = get_figure_cache()
+        frames_key = (region, year, frame_fingerprint(df_band, df_month))
+
+        # ===== 시각화 1) 시간대별 사고건수 vs 강수&적설 발생 빈도 =====
+        st.subheader(f"시간대별 사고건수 vs 강수·적설 발생 빈도(시간 수, {region} {year})")
+
+        def build_band_hours_figure(df_band, region, year):
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+            # 막대 그래프 (사고건수)
+            fig.add_trace(
+                go.Bar(x=df_band["시간대"], y=df_band["사고건수"], name="사고건수", opacity=0.5, marker_color='lightblue'),
+                secondary_y=False,
+            )
 
-    import pandas as pd
-    import numpy as np
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    import re
+            # 선 그래프 (강수 발생시간)
+            fig.add_trace(
+                go.Scatter(x=df_band["시간대"], y=df_band["rain_hours"], name="강수 발생시간", mode='lines+markers', marker=dict(symbol='circle')),
+                secondary_y=True,
+            )
 
-    TIME_ACC_PATH = "./2_team/time_accident.csv"
-    WEATHER_PATH  = "./2_team/timedata.csv"
+            # 선 그래프 (적설 발생시간)
+            fig.add_trace(
+                go.Scatter(x=df_band["시간대"], y=df_band["snow_hours"], name="적설 발생시간", mode='lines+markers', marker=dict(symbol='circle')),
+                secondary_y=True,
+            )
 
+            fig.update_xaxes(title_text="시간대", tickangle=-45)
+            fig.update_yaxes(title_text="사고건수(건)", secondary_y=False)
+            fig.update_yaxes(title_text="발생 시간 수(시간)", secondary_y=True)
+            fig.update_layout(
+                title=f"{region} 시간대별 사고건수 vs 강수·적설 발생 빈도(시간 수, {year})",
+                height=500,
+                hovermode='x unified'
+            )
+            return fig
 
-    # 시간대 라벨("0시~2시")에서 시작 시각(0)을 추출해 정렬에 활용
-    def start_hour(label: str) -> int:
-        m = re.match(r"(\d+)시~", str(label))
-        return int(m.group(1)) if m else 999
+        st.plotly_chart(
+            fig_cache.get_or_build(("fig1", frames_key), lambda: build_band_hours_figure(df_band, region, year)),
+            use_container_width=True,
+        )
 
-    @st.cache_data(show_spinner=False)
-    def build_analysis_frames(time_acc_path: str, weather_path: str):
-        # 2) 사고(시간대별, 연간 집계) 전처리
-        df_time_raw = pd.read_csv(time_acc_path, encoding="utf-8")
+        # ===== 시각화 2) 시간대별 사고건수 vs 강수/적설 '량'(합계) =====
+        st.subheader(f"시간대별 사고건수 vs 강수·적설량({region} {year})")
 
-        header_row = df_time_raw.iloc[0].to_dict()
-        rename_map = {}
-        for c in df_time_raw.columns:
-            if c in ["시도", "연도"]:
-                rename_map[c] = c
-            else:
-                rename_map[c] = str(header_row.get(c, c)).strip()
+        def build_band_amount_figure(df_band, region, year):
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
 
-        df_time = df_time_raw.rename(columns=rename_map).iloc[1:].copy()
+            # 막대 그래프 (사고건수)
+            fig.add_trace(
+                go.Bar(x=df_band["시간대"], y=df_band["사고건수"], name="사고건수", opacity=0.5, marker_color='lightblue'),
+                secondary_y=False,
+            )
 
-        df_time["시도"] = df_time["시도"].astype(str).str.strip()
-        df_time["연도"] = df_time["연도"].astype(str).str.strip()
+            # 선 그래프 (강수량 합계)
+            fig.add_trace(
+                go.Scatter(x=df_band["시간대"], y=df_band["total_rain"], name="강수량 합계(mm)", mode='lines+markers', marker=dict(symbol='circle')),
+                secondary_y=True,
+            )
 
-        df_time_seoul = df_time[(df_time["시도"] == "서울") & (df_time["연도"] == "사고[건]")].copy()
+            # 선 그래프 (적설량 합계)
+            fig.add_trace(
+                go.Scatter(x=df_band["시간대"], y=df_band["total_snow"], name="적설량 합계(cm)", mode='lines+markers', marker=dict(symbol='circle')),
+                secondary_y=True,
+            )
 
-        time_band_cols = [c for c in df_time_seoul.columns if re.search(r"시~", str(c))]
-        time_band_cols = sorted(time_band_cols, key=start_hour)
+            fig.update_xaxes(title_text="시간대", tickangle=-45)
+            fig.update_yaxes(title_text="사고건수(건)", secondary_y=False)
+            fig.update_yaxes(title_text="합계 강수/적설 (mm / cm)", secondary_y=True)
+            fig.update_layout(
+                title=f"{year}년도 {region} 시간대별 사고건수 vs 강수·적설량",
+                height=500,
+                hovermode='x unified'
+            )
+            return fig
 
-        df_acc_band = df_time_seoul.melt(
-            id_vars=["시도"],
-            value_vars=time_band_cols,
-            var_name="시간대",
-            value_name="사고건수"
-        )
-        df_acc_band["사고건수"] = (
-            df_acc_band["사고건수"]
-            .astype(str).str.replace(",", "", regex=False).str.strip()
-            .replace({"": np.nan})
-            .astype(float).astype("Int64")
-        )
-        df_acc_band = df_acc_band[["시간대", "사고건수"]].copy()
-        df_acc_band["sort_key"] = df_acc_band["시간대"].apply(start_hour)
-        df_acc_band = df_acc_band.sort_values("sort_key").drop(columns=["sort_key"]).reset_index(drop=True)
-
-        # 3) 날씨 전처리(시간별) -> 2시간 주기, 월 파생
-        df_w_raw = pd.read_csv(weather_path, encoding="cp949")
-        need_cols = ['일시', '기온(°C)', '강수량(mm)', '습도(%)', '적설(cm)']
-        df_w = df_w_raw[need_cols].rename(columns={
-            '일시': 'datetime',
-            '기온(°C)': 'temp_avg',
-            '강수량(mm)': 'rain_mm',
-            '습도(%)': 'humidity_pct',
-            '적설(cm)': 'snow_cm'
-        }).copy()
-
-        df_w["rain_mm"] = df_w["rain_mm"].fillna(0)
-        df_w["snow_cm"] = df_w["snow_cm"].fillna(0)
-
-        for c in ["temp_avg", "rain_mm", "humidity_pct", "snow_cm"]:
-            df_w[c] = pd.to_numeric(df_w[c], errors="coerce")
-
-        df_w["datetime"] = pd.to_datetime(df_w["datetime"], errors="coerce")
-        df_w = df_w.dropna(subset=["datetime"])
-
-        df_w = df_w[(df_w["datetime"] >= "2024-01-01") & (df_w["datetime"] < "2025-01-01")].copy()
-        df_w["month"] = df_w["datetime"].dt.month
-        df_w["hour"] = df_w["datetime"].dt.hour
-
-        df_w["band_start"] = (df_w["hour"] // 2) * 2
-        df_w["시간대"] = df_w["band_start"].apply(lambda h: f"{h}시~{h+2}시" if h < 22 else "22시~24시")
-
-        # 4) 연간(시간대별) 날씨 요약
-        df_w_band_annual = (
-            df_w.groupby("시간대", as_index=False)
-              .agg(
-                  avg_temp=("temp_avg", "mean"),
-                  total_rain=("rain_mm", "sum"),
-                  total_snow=("snow_cm", "sum"),
-                  rain_hours=("rain_mm", lambda s: int((s > 0).sum())),
-                  snow_hours=("snow_cm", lambda s: int((s > 0).sum())),
-              )
-        )
-        df_w_band_annual["sort_key"] = df_w_band_annual["시간대"].apply(start_hour)
-        df_w_band_annual = df_w_band_annual.sort_values("sort_key").drop(columns=["sort_key"]).reset_index(drop=True)
-
-        # 시간 별 날씨,사고 데이터 병합
-        df_band = df_acc_band.merge(df_w_band_annual, on="시간대", how="left")
-
-        # 5) 월별(기상) 가중 사고지수(추정)
-        df_w_month = (
-            df_w.groupby("month", as_index=False)
-              .agg(
-                  avg_temp=("temp_avg", "mean"),
-                  total_rain=("rain_mm", "sum"),
-                  total_snow=("snow_cm", "sum"),
-                  rain_hours=("rain_mm", lambda s: int((s > 0).sum())),
-                  snow_hours=("snow_cm", lambda s: int((s > 0).sum()))
-              )
+        st.plotly_chart(
+            fig_cache.get_or_build(("fig2", frames_key), lambda: build_band_amount_figure(df_band, region, year)),
+            use_container_width=True,
         )
 
-        df_w_month_band = (
-            df_w.groupby(["month", "시간대"], as_index=False)
-              .agg(
-                  rain_hours=("rain_mm", lambda s: int((s > 0).sum())),
-                  snow_hours=("snow_cm", lambda s: int((s > 0).sum()))
-              )
-        ).merge(df_acc_band, on="시간대", how="left")
-
-        df_w_month_band["precip_hours"] = df_w_month_band["rain_hours"] + df_w_month_band["snow_hours"]
-
-        month_vals = []
-        for m, g in df_w_month_band.groupby("month"):
-            ph = float(g["precip_hours"].sum())
-            if ph > 0:
-                wi = float((g["사고건수"].astype(float) * g["precip_hours"]).sum() / ph)
-            else:
-                wi = np.nan
-            month_vals.append((m, ph, wi))
-
-        df_month_index = pd.DataFrame(month_vals, columns=["month", "precip_hours", "weighted_index"])
-
-        month_template = pd.DataFrame({"month": list(range(1, 13))})
-        df_month = (
-            month_template
-            .merge(df_w_month, on="month", how="left")
-            .merge(df_month_index, on="month", how="left")
-            .sort_values("month")
-            .reset_index(drop=True)
-        )
+        # ===== 시각화 3) 월별 조건 그래프(3축) =====
+        st.subheader(f"월별 기상 가중 추정 사고지수(3축, {region} {year})")
 
-        for c in ["total_rain", "total_snow", "rain_hours", "snow_hours", "precip_hours"]:
-            df_month[c] = df_month[c].fillna(0)
+        def build_month_index_figure(df_month, region, year):
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
 
-        df_month["avg_temp"] = df_month["avg_temp"].interpolate(limit_direction="both")
-        df_month["no_precip_flag"] = df_month["weighted_index"].isna().astype(int)
-        df_month["weighted_index"] = df_month["weighted_index"].fillna(0)
-        df_month["month_label"] = df_month["month"].apply(lambda m: f"{int(m):02d}")
+            # 막대 그래프 (추정 사고지수)
+            fig.add_trace(
+                go.Bar(x=df_month["month_label"], y=df_month["weighted_index"], name="추정 사고지수", opacity=0.5, marker_color='lightblue'),
+                secondary_y=False,
+            )
 
-        return df_band, df_month
+            # 선 그래프 (강수량 합계)
+            fig.add_trace(
+                go.Scatter(x=df_month["month_label"], y=df_month["total_rain"], name="월 강수량 합계(mm)", mode='lines+markers', marker=dict(symbol='circle')),
+                secondary_y=True,
+            )
 
-    # ===== 데이터 생성 =====
-    try:
-        df_band, df_month = build_analysis_frames(TIME_ACC_PATH, WEATHER_PATH)
-    except FileNotFoundError as e:
-        st.error(f"파일을 찾을 수 없습니다: {e}")
-        st.stop()
-    except Exception as e:
-        st.error(f"데이터 분석 전처리 중 오류가 발생했습니다: {e}")
-        st.stop()
-
-    # ===== 시각화 1) 시간대별 사고건수 vs 강수&적설 발생 빈도 =====
-    st.subheader("시간대별 사고건수 vs 강수·적설 발생 빈도(시간 수, 2024)")
-    
-    fig1 = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    # 막대 그래프 (사고건수)
-    fig1.add_trace(
-        go.Bar(x=df_band["시간대"], y=df_band["사고건수"], name="사고건수", opacity=0.5, marker_color='lightblue'),
-        secondary_y=False,
-    )
-    
-    # 선 그래프 (강수 발생시간)
-    fig1.add_trace(
-        go.Scatter(x=df_band["시간대"], y=df_band["rain_hours"], name="강수 발생시간", mode='lines+markers', marker=dict(symbol='circle')),
-        secondary_y=True,
-    )
-    
-    # 선 그래프 (적설 발생시간)
-    fig1.add_trace(
-        go.Scatter(x=df_band["시간대"], y=df_band["snow_hours"], name="적설 발생시간", mode='lines+markers', marker=dict(symbol='circle')),
-        secondary_y=True,
-    )
-    
-    fig1.update_xaxes(title_text="시간대", tickangle=-45)
-    fig1.update_yaxes(title_text="사고건수(건)", secondary_y=False)
-    fig1.update_yaxes(title_text="발생 시간 수(시간)", secondary_y=True)
-    fig1.update_layout(
-        title="시간대별 사고건수 vs 강수·적설 발생 빈도(시간 수, 2024)",
-        height=500,
-        hovermode='x unified'
-    )
-    
-    st.plotly_chart(fig1, use_container_width=True)
+            # 선 그래프 (적설량 합계)
+            fig.add_trace(
+                go.Scatter(x=df_month["month_label"], y=df_month["total_snow"], name="월 적설량 합계(cm)", mode='lines+markers', marker=dict(symbol='circle')),
+                secondary_y=True,
+            )
 
-    # ===== 시각화 2) 시간대별 사고건수 vs 강수/적설 '량'(합계) =====
-    st.subheader("시간대별 사고건수 vs 강수·적설량(2024)")
-    
-    fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    # 막대 그래프 (사고건수)
-    fig2.add_trace(
-        go.Bar(x=df_band["시간대"], y=df_band["사고건수"], name="사고건수", opacity=0.5, marker_color='lightblue'),
-        secondary_y=False,
-    )
-    
-    # 선 그래프 (강수량 합계)
-    fig2.add_trace(
-        go.Scatter(x=df_band["시간대"], y=df_band["total_rain"], name="강수량 합계(mm)", mode='lines+markers', marker=dict(symbol='circle')),
-        secondary_y=True,
-    )
-    
-    # 선 그래프 (적설량 합계)
-    fig2.add_trace(
-        go.Scatter(x=df_band["시간대"], y=df_band["total_snow"], name="적설량 합계(cm)", mode='lines+markers', marker=dict(symbol='circle')),
-        secondary_y=True,
-    )
-    
-    fig2.update_xaxes(title_text="시간대", tickangle=-45)
-    fig2.update_yaxes(title_text="사고건수(건)", secondary_y=False)
-    fig2.update_yaxes(title_text="합계 강수/적설 (mm / cm)", secondary_y=True)
-    fig2.update_layout(
-        title="2024년도 시간대별 사고건수 vs 강수·적설량",
-        height=500,
-        hovermode='x unified'
-    )
-    
-    st.plotly_chart(fig2, use_container_width=True)
+            # 선 그래프 (평균기온) - 다른 스타일로 추가
+            fig.add_trace(
+                go.Scatter(x=df_month["month_label"], y=df_month["avg_temp"], name="월 평균기온(°C)", mode='lines+markers', 
+                          marker=dict(symbol='circle', color='red'), line=dict(dash='dash', color='red')),
+                secondary_y=True,
+            )
 
-    # ===== 시각화 3) 월별 조건 그래프(3축) =====
-    st.subheader("월별 기상 가중 추정 사고지수(3축, 2024)")
-    
-    fig3 = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    # 막대 그래프 (추정 사고지수)
-    fig3.add_trace(
-        go.Bar(x=df_month["month_label"], y=df_month["weighted_index"], name="추정 사고지수", opacity=0.5, marker_color='lightblue'),
-        secondary_y=False,
-    )
-    
-    # 선 그래프 (강수량 합계)
-    fig3.add_trace(
-        go.Scatter(x=df_month["month_label"], y=df_month["total_rain"], name="월 강수량 합계(mm)", mode='lines+markers', marker=dict(symbol='circle')),
-        secondary_y=True,
-    )
-    
-    # 선 그래프 (적설량 합계)
-    fig3.add_trace(
-        go.Scatter(x=df_month["month_label"], y=df_month["total_snow"], name="월 적설량 합계(cm)", mode='lines+markers', marker=dict(symbol='circle')),
-        secondary_y=True,
-    )
-    
-    # 선 그래프 (평균기온) - 다른 스타일로 추가
-    fig3.add_trace(
-        go.Scatter(x=df_month["month_label"], y=df_month["avg_temp"], name="월 평균기온(°C)", mode='lines+markers', 
-                  marker=dict(symbol='circle', color='red'), line=dict(dash='dash', color='red')),
-        secondary_y=True,
-    )
-    
-    # no_precip 텍스트 추가
-    for i, r in df_month.iterrows():
-        if int(r["no_precip_flag"]) == 1:
-            fig3.add_annotation(
-                x=r["month_label"],
-                y=r["weighted_index"],
-                text="no<br>precip",
-                showarrow=False,
-                font=dict(size=8),
-                yshift=10
+            # no_precip 텍스트 추가
+            for i, r in df_month.iterrows():
+                if int(r["no_precip_flag"]) == 1:
+                    fig.add_annotation(
+                        x=r["month_label"],
+                        y=r["weighted_index"],
+                        text="no<br>precip",
+                        showarrow=False,
+                        font=dict(size=8),
+                        yshift=10
+                    )
+
+            fig.update_xaxes(title_text=f"월({year})")
+            fig.update_yaxes(title_text="추정 사고지수(강수·적설 발생시간 가중)", secondary_y=False)
+            fig.update_yaxes(title_text="월 강수/적설 합계 (mm / cm) / 월 평균기온(°C)", secondary_y=True)
+            fig.update_layout(
+                title=f"{year}년도 {region} 월별 기상 가중 추정 사고지수",
+                height=500,
+                hovermode='x unified'
             )
-    
-    fig3.update_xaxes(title_text="월(2024)")
-    fig3.update_yaxes(title_text="추정 사고지수(강수·적설 발생시간 가중)", secondary_y=False)
-    fig3.update_yaxes(title_text="월 강수/적설 합계 (mm / cm) / 월 평균기온(°C)", secondary_y=True)
-    fig3.update_layout(
-        title="2024년도 월별 기상 가중 추정 사고지수",
-        height=500,
-        hovermode='x unified'
-    )
-    
-    st.plotly_chart(fig3, use_container_width=True)
+            return fig
+
+        st.plotly_chart(
+            fig_cache.get_or_build(("fig3", frames_key), lambda: build_month_index_figure(df_month, region, year)),
+            use_container_width=True,
+        )
 
-    # ===== 테이블 =====
-    with st.expander("월별 요약 테이블(df_month) 보기"):
-        st.dataframe(df_month)
+        # ===== 테이블 =====
+        with st.expander("월별 요약 테이블(df_month) 보기"):
+            st.dataframe(df_month)
 
-    with st.expander("시간대별 요약 테이블(df_band) 보기"):
-        st.dataframe(df_band)
+        with st.expander("시간대별 요약 테이블(df_band) 보기"):
+            st.dataframe(df_band)
 
 
 # 탭 4: 예측 히스토리
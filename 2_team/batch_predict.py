@@ -0,0 +1,82 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+# 모델 입력 컬럼 (model_training.ipynb 의 feature_cols 와 같은 순서)
+FEATURE_NAMES = ['avg_temp', 'total_rain', 'total_snow', 'rain_hours', 'snow_hours', 'avg_humidity']
+PREDICTION_COLUMN = "predicted_accident"
+
+
+def daily_features(df_w: pd.DataFrame) -> pd.DataFrame:
+    """시간별 날씨 -> 일별 모델 입력 (model_training.ipynb 의 일별 집계와 같은 정의)"""
+    parts = pd.DataFrame({
+        "date": df_w["datetime"].dt.normalize(),
+        "temp_avg": df_w["temp_avg"],
+        "rain_mm": df_w["rain_mm"],
+        "snow_cm": df_w["snow_cm"],
+        "rain_flag": (df_w["rain_mm"] > 0).astype("int64"),
+        "snow_flag": (df_w["snow_cm"] > 0).astype("int64"),
+        "humidity_pct": df_w["humidity_pct"],
+    })
+    daily = (
+        parts.groupby("date", as_index=False)
+          .agg(
+              avg_temp=("temp_avg", "mean"),
+              total_rain=("rain_mm", "sum"),
+              total_snow=("snow_cm", "sum"),
+              rain_hours=("rain_flag", "sum"),
+              snow_hours=("snow_flag", "sum"),
+              avg_humidity=("humidity_pct", "mean"),
+          )
+    )
+    daily["date"] = daily["date"].dt.date
+    return daily
+
+
+def read_rows(uploaded) -> pd.DataFrame:
+    """업로드된 CSV/Parquet 파일 읽기 (Streamlit UploadedFile 또는 경로)"""
+    name = getattr(uploaded, "name", str(uploaded))
+    ext = os.path.splitext(name)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(uploaded)
+    if ext == ".csv":
+        try:
+            return pd.read_csv(uploaded, encoding="utf-8-sig")
+        except UnicodeDecodeError:
+            if hasattr(uploaded, "seek"):
+                uploaded.seek(0)
+            return pd.read_csv(uploaded, encoding="cp949")
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {name} (csv, parquet 만 가능)")
+
+
+def predict_frame(model, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    여러 날의 기상 데이터를 한 번의 predict 로 예측.
+    입력 컬럼은 그대로 두고 predicted_accident 컬럼(음수는 0)을 붙여 반환.
+    """
+    missing = [c for c in FEATURE_NAMES if c not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    X = df[FEATURE_NAMES].apply(pd.to_numeric, errors="coerce")
+    valid = X.notna().all(axis=1).to_numpy()
+
+    pred = np.full(len(df), np.nan)
+    if valid.any():
+        pred[valid] = np.maximum(model.predict(X[valid]), 0)
+
+    out = df.copy()
+    out[PREDICTION_COLUMN] = pred
+    return out
+
+
+def to_download(df: pd.DataFrame, fmt: str = "csv") -> bytes:
+    """예측 결과를 다운로드용 바이트로 변환"""
+    if fmt == "parquet":
+        buf = io.BytesIO()
+        df.to_parquet(buf, index=False)
+        return buf.getvalue()
+    # 엑셀에서 한글이 깨지지 않도록 utf-8-sig
+    return df.to_csv(index=False).encode("utf-8-sig")
@@ -0,0 +1,126 @@
+"""
+시간별 날씨 집계 벤치마크: 기존 groupby(lambda) 경로 vs 벡터화 경로.
+timedata.csv 를 N배로 복제해 두 경로의 결과가 같은지 확인하고 실행 시간을 비교한다.
+
+    python 2_team/bench_aggregation.py --scales 1 10 100
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from weather_agg import BAND_LABELS, WeatherAggStore, weighted_index
+from weather_cache import parse_weather_csv
+
+WEATHER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "timedata.csv")
+
+# 벤치마크용 시간대별 사고건수 (두 경로에 같은 값을 사용)
+ACC_BAND = pd.DataFrame({
+    "시간대": BAND_LABELS,
+    "사고건수": pd.array([1329, 792, 938, 1789, 3403, 3559, 3620, 3861, 4389, 4430, 3090, 2265], dtype="Int64"),
+})
+
+
+def legacy_aggregate(df_w: pd.DataFrame):
+    """기존 app.py 방식: 행별 apply 라벨 + lambda 집계 + 월별 for 루프"""
+    df_w = df_w.copy()
+    df_w["month"] = df_w["datetime"].dt.month
+    df_w["hour"] = df_w["datetime"].dt.hour
+    df_w["band_start"] = (df_w["hour"] // 2) * 2
+    df_w["시간대"] = df_w["band_start"].apply(lambda h: f"{h}시~{h+2}시" if h < 22 else "22시~24시")
+
+    df_w_band_annual = (
+        df_w.groupby("시간대", as_index=False)
+          .agg(
+              avg_temp=("temp_avg", "mean"),
+              total_rain=("rain_mm", "sum"),
+              total_snow=("snow_cm", "sum"),
+              rain_hours=("rain_mm", lambda s: int((s > 0).sum())),
+              snow_hours=("snow_cm", lambda s: int((s > 0).sum())),
+          )
+    )
+    df_w_month = (
+        df_w.groupby("month", as_index=False)
+          .agg(
+              avg_temp=("temp_avg", "mean"),
+              total_rain=("rain_mm", "sum"),
+              total_snow=("snow_cm", "sum"),
+              rain_hours=("rain_mm", lambda s: int((s > 0).sum())),
+              snow_hours=("snow_cm", lambda s: int((s > 0).sum()))
+          )
+    )
+    df_w_month_band = (
+        df_w.groupby(["month", "시간대"], as_index=False)
+          .agg(
+              rain_hours=("rain_mm", lambda s: int((s > 0).sum())),
+              snow_hours=("snow_cm", lambda s: int((s > 0).sum()))
+          )
+    ).merge(ACC_BAND, on="시간대", how="left")
+    df_w_month_band["precip_hours"] = df_w_month_band["rain_hours"] + df_w_month_band["snow_hours"]
+
+    month_vals = []
+    for m, g in df_w_month_band.groupby("month"):
+        ph = float(g["precip_hours"].sum())
+        if ph > 0:
+            wi = float((g["사고건수"].astype(float) * g["precip_hours"]).sum() / ph)
+        else:
+            wi = np.nan
+        month_vals.append((m, ph, wi))
+    df_month_index = pd.DataFrame(month_vals, columns=["month", "precip_hours", "weighted_index"])
+    return df_w_band_annual, df_w_month, df_month_index
+
+
+def vectorized_aggregate(df_w: pd.DataFrame):
+    """weather_agg 경로: 지시 컬럼 합계 + 범주형 시간대 + 한 번의 가중 평균"""
+    store = WeatherAggStore()
+    store.update(df_w)
+
+    df_w_month_band = store.month_band_frame().merge(ACC_BAND, on="시간대", how="left")
+    df_w_month_band["precip_hours"] = df_w_month_band["rain_hours"] + df_w_month_band["snow_hours"]
+    df_month_index = weighted_index(df_w_month_band, by="month", value="사고건수", weight="precip_hours")
+    return store.band_frame(), store.month_frame(), df_month_index
+
+
+def check_same(legacy, vectorized) -> None:
+    band_l, month_l, index_l = legacy
+    band_v, month_v, index_v = vectorized
+
+    band_l = band_l.set_index("시간대").loc[BAND_LABELS].reset_index()
+    band_v = band_v.assign(시간대=band_v["시간대"].astype(str))
+    pd.testing.assert_frame_equal(band_l, band_v, check_dtype=False)
+    pd.testing.assert_frame_equal(month_l, month_v, check_dtype=False)
+    pd.testing.assert_frame_equal(index_l, index_v, check_dtype=False)
+
+
+def best_of(fn, df_w, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(df_w)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시간별 날씨 집계 벤치마크")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="원본 행 수 배율")
+    parser.add_argument("--repeat", type=int, default=3, help="배율별 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    base = parse_weather_csv(WEATHER_PATH)
+    base = base[(base["datetime"] >= "2024-01-01") & (base["datetime"] < "2025-01-01")]
+
+    print(f"{'배율':>6} {'행 수':>10} {'기존(s)':>10} {'벡터화(s)':>10} {'속도 향상':>10}")
+    for scale in args.scales:
+        df_w = pd.concat([base] * scale, ignore_index=True)
+        check_same(legacy_aggregate(df_w), vectorized_aggregate(df_w))
+
+        t_legacy = best_of(legacy_aggregate, df_w, args.repeat)
+        t_vector = best_of(vectorized_aggregate, df_w, args.repeat)
+        print(f"{scale:>6}x {len(df_w):>10,} {t_legacy:>10.4f} {t_vector:>10.4f} {t_legacy / t_vector:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
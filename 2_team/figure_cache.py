@@ -0,0 +1,76 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def frame_fingerprint(*frames: pd.DataFrame) -> str:
+    """데이터프레임 내용(값, 인덱스, 컬럼 이름) 기준 해시"""
+    h = hashlib.sha1()
+    for df in frames:
+        h.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class FigureCache:
+    """
+    plotly 그림을 JSON 문자열로 저장하는 크기 제한 LRU 캐시.
+    세션 간에 공유되므로(스레드) 잠금으로 보호하고,
+    저장된 JSON 의 총 바이트가 max_bytes 를 넘으면 오래 안 쓴 그림부터 지운다.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, build) -> dict:
+        """
+        key 에 해당하는 그림(dict) 반환. 없으면 build() 로 만든 Figure 를 JSON 으로 저장.
+        반환값은 st.plotly_chart 에 바로 넘길 수 있는 dict.
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return json.loads(item[0])
+            self.misses += 1
+
+        # 그림 생성은 잠금 밖에서 (다른 세션이 기다리지 않도록)
+        spec = build().to_json()
+        self._put(key, spec)
+        return json.loads(spec)
+
+    def _put(self, key, spec: str) -> None:
+        size = len(spec.encode("utf-8"))
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return  # 캐시 전체보다 큰 그림은 저장하지 않음
+
+            self._items[key] = (spec, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
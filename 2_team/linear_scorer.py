@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+CHECK_PATH = Path(__file__).resolve().parent / ".cache" / "linear_scorer_check.json"
+
+
+class LinearScorer:
+    """
+    model_info.json 의 회귀 계수/절편으로 만든 예측기.
+    sklearn 없이 intercept + X @ coef 만 계산하며, LinearRegression.predict 와 같은 인터페이스.
+    """
+
+    def __init__(self, coefficients, intercept, feature_names):
+        self.coef_ = np.asarray(coefficients, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.feature_names = list(feature_names)
+        if len(self.feature_names) != len(self.coef_):
+            raise ValueError("feature_names 와 coefficients 의 길이가 다릅니다.")
+        # predict_one 용 (numpy 배열 생성 없이 계산)
+        self._pairs = list(zip(self.feature_names, self.coef_.tolist()))
+
+    @classmethod
+    def from_model_info(cls, info: dict) -> "LinearScorer":
+        return cls(info["coefficients"], info["intercept"], info["feature_names"])
+
+    def _to_array(self, X) -> np.ndarray:
+        if hasattr(X, "columns"):
+            # DataFrame 은 컬럼 이름 기준으로 순서를 맞춤
+            X = X[self.feature_names].to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def predict(self, X) -> np.ndarray:
+        return self._to_array(X) @ self.coef_ + self.intercept_
+
+    def predict_one(self, row: dict) -> float:
+        """dict 한 건 예측 (순수 파이썬)"""
+        return self.intercept_ + sum(row[name] * w for name, w in self._pairs)
+
+
+def _probe_inputs(n: int, n_features: int, seed: int) -> np.ndarray:
+    # 실제 입력 범위(기온 -20~40, 강수 0~500 등)를 덮는 검증용 입력
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(-50, 500, size=(n, n_features))
+    X[:n_features] = np.eye(n_features)  # 계수 하나씩 분리해서 확인
+    X[n_features] = 0.0                  # 절편 확인
+    return X
+
+
+def validate(scorer: LinearScorer, model, n_samples: int = 256,
+             rtol: float = 1e-9, atol: float = 1e-6, seed: int = 0) -> bool:
+    """scorer 와 원래 모델의 예측값이 수치적으로 같은지 확인"""
+    import pandas as pd
+
+    X = _probe_inputs(max(n_samples, len(scorer.coef_) + 1), len(scorer.coef_), seed)
+    expected = np.asarray(model.predict(pd.DataFrame(X, columns=scorer.feature_names)), dtype=np.float64)
+    return bool(np.allclose(scorer.predict(X), expected, rtol=rtol, atol=atol))
+
+
+def _fingerprint(*paths) -> str:
+    h = hashlib.sha1()
+    for p in paths:
+        with open(p, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _read_check(check_path) -> dict:
+    try:
+        with open(check_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_check(check_path, result: dict) -> None:
+    check_path = Path(check_path)
+    check_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = check_path.with_name(check_path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp, check_path)
+
+
+def _load_estimator(model_path):
+    # joblib/sklearn 은 검증이 필요할 때만 import
+    import joblib
+
+    return joblib.load(model_path)
+
+
+def load_predictor(info_path, model_path, check_path=CHECK_PATH):
+    """
+    예측기 로드.
+    - 같은 모델/정보 파일로 이미 검증을 통과했으면 LinearScorer 를 바로 반환 (sklearn/joblib 로드 없음)
+    - 처음이면 joblib 모델을 불러와 예측값을 비교하고 결과를 기록
+    - 값이 다르면 원래 sklearn 모델을 그대로 반환
+    """
+    try:
+        with open(info_path, "r", encoding="utf-8") as f:
+            scorer = LinearScorer.from_model_info(json.load(f))
+    except FileNotFoundError:
+        return _load_estimator(model_path)
+
+    key = _fingerprint(info_path, model_path)
+    check = _read_check(check_path)
+    if check.get("key") == key and check.get("equivalent"):
+        return scorer
+
+    model = _load_estimator(model_path)
+    equivalent = validate(scorer, model)
+    _write_check(check_path, {"key": key, "equivalent": equivalent})
+    return scorer if equivalent else model
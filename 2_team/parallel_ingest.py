@@ -0,0 +1,149 @@
+"""
+관측소·연도별 시간 자료(ASOS CSV) 병렬 수집.
+파일마다 읽기(weather_cache 의 parquet 캐시) + (관측소, 연도, 월, 2시간 구간) 합계를 프로세스 풀에서 따로 계산하고,
+부분 합계는 파일 경로 순서대로 합쳐서 작업자 수와 관계없이 같은 결과를 만든다.
+원본 해시도 작업자가 계산하고, 작업자들은 manifest 를 쓰지 않는다 (해시 캐시·수집 manifest 는 끝에 한 번만 기록).
+
+    python 2_team/parallel_ingest.py "data/asos/*.csv" --workers 8
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from weather_agg import STORE_DIR, STORE_VERSION, WeatherAggStore
+from weather_cache import CACHE_DIR, load_weather, record_sources, source_entry
+
+MANIFEST_NAME = "ingest_manifest.json"
+
+
+def _store_name(path) -> str:
+    return Path(path).stem
+
+
+def _stat_key(path) -> list:
+    # 저장소 형식이 바뀌면(STORE_VERSION) 예전 저장소는 빈 상태로 읽히므로 원본이 그대로여도 다시 수집
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, STORE_VERSION]
+
+
+def _read_manifest(store_dir: Path) -> dict:
+    try:
+        with open(store_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(store_dir: Path, manifest: dict) -> None:
+    store_dir.mkdir(parents=True, exist_ok=True)
+    tmp = store_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, store_dir / MANIFEST_NAME)
+
+
+def _ingest_one(path: str, store_path: str, encoding: str, cache_dir: str):
+    """
+    (작업자 프로세스) 파일 하나를 해시하고 읽어 파일별 저장소에 새 행만 누적.
+    원본이 이어 쓰기가 아니게 바뀌었으면 저장소를 비우고 처음부터 다시 누적한다.
+    저장소 파일은 파일마다 따로라 프로세스끼리 겹치지 않고,
+    해시 캐시(manifest)에 넣을 항목은 돌려주기만 한다.
+    """
+    entry = source_entry(path, cache_dir)
+    store = WeatherAggStore.load(store_path)
+    changed = store.check_source(path, {"size": entry["size"], "sha1": entry["sha1"]})
+    df_w = load_weather(path, cache_dir=cache_dir, encoding=encoding, since=dict(store.watermarks) or None,
+                        entry=entry)
+    added = store.update(df_w)
+    if added or changed:
+        store.save(store_path)
+    return added, store, entry
+
+
+def default_workers(n_tasks: int) -> int:
+    return max(1, min(os.cpu_count() or 1, n_tasks))
+
+
+def ingest_files(paths, workers: int = None, store_dir=STORE_DIR, encoding: str = "cp949",
+                 stats: dict = None, cache_dir=CACHE_DIR) -> WeatherAggStore:
+    """
+    여러 날씨 파일 -> 합쳐진 WeatherAggStore.
+    - 지난번 수집 이후 크기/수정시각이 바뀐 파일만 다시 읽음 (나머지는 저장된 합계 사용)
+    - 바뀐 파일이 이어 쓰기면 새 행만, 아니면(중간 수정, 교체) 그 파일의 합계를 처음부터 다시 계산
+    - workers: 프로세스 수 (None 이면 CPU 수, 1 이면 현재 프로세스에서 순서대로)
+    - 합치는 순서는 항상 파일 경로 정렬 순서
+    stats 에 dict 를 넘기면 파일 수/다시 읽은 파일 수/추가된 행 수를 기록.
+    """
+    paths = sorted({str(p) for p in paths})
+    names = [_store_name(p) for p in paths]
+    if len(set(names)) != len(names):
+        dup = sorted({n for n in names if names.count(n) > 1})
+        raise ValueError(f"파일 이름(확장자 제외)이 겹칩니다: {', '.join(dup)}")
+
+    store_dir = Path(store_dir)
+    manifest = _read_manifest(store_dir)
+    keys = {p: _stat_key(p) for p in paths}
+    store_paths = {p: str(store_dir / f"{n}.json") for p, n in zip(paths, names)}
+
+    stale = [p for p in paths if manifest.get(p) != keys[p] or not os.path.exists(store_paths[p])]
+    workers = default_workers(len(stale)) if workers is None else max(1, int(workers))
+
+    results = {}
+    if workers == 1 or len(stale) <= 1:
+        for p in stale:
+            results[p] = _ingest_one(p, store_paths[p], encoding, str(cache_dir))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map 은 제출 순서대로 결과를 돌려주므로 완료 순서와 무관
+            n = len(stale)
+            done = pool.map(_ingest_one, stale, [store_paths[p] for p in stale], [encoding] * n,
+                            [str(cache_dir)] * n)
+            results = dict(zip(stale, done))
+
+    stores = []
+    for p in paths:
+        if p in results:
+            stores.append(results[p][1])
+            manifest[p] = keys[p]
+        else:
+            stores.append(WeatherAggStore.load(store_paths[p]))
+    if stale:
+        record_sources(cache_dir, {p: entry for p, (_, _, entry) in results.items()})
+        _write_manifest(store_dir, manifest)
+
+    if stats is not None:
+        stats.update({
+            "files": len(paths),
+            "parsed": len(stale),
+            "rows_added": sum(added for added, _, _ in results.values()),
+            "workers": workers,
+        })
+    return WeatherAggStore.merged(stores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날씨 파일 병렬 수집 (관측소·연도별 CSV)")
+    parser.add_argument("patterns", nargs="+", help="CSV 경로 또는 glob 패턴")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--store-dir", default=str(STORE_DIR), help="파일별 합계 저장 위치")
+    parser.add_argument("--encoding", default="cp949")
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.patterns for p in (glob.glob(pattern) or [pattern])})
+    stats = {}
+    t0 = time.perf_counter()
+    store = ingest_files(paths, workers=args.workers, store_dir=args.store_dir,
+                         encoding=args.encoding, stats=stats)
+    elapsed = time.perf_counter() - t0
+
+    print(f"파일 {stats['files']}개 (다시 읽음 {stats['parsed']}개, 작업자 {stats['workers']}) "
+          f"-> 새 행 {stats['rows_added']:,}개, {elapsed:.2f}초")
+    print(f"관측소 {len(store.stations())}곳, 연도 {store.years()}")
+
+
+if __name__ == "__main__":
+    main()
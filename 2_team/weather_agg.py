@@ -0,0 +1,252 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from weather_cache import CACHE_DIR, is_prefix, source_key
+
+STORE_DIR = Path(__file__).resolve().parent / ".cache" / "weather_agg"
+
+STORE_VERSION = 3
+
+KEY_COLUMNS = ["station", "year", "month", "band_start"]
+SUM_COLUMNS = ["temp_sum", "temp_count", "rain_sum", "snow_sum", "rain_hours", "snow_hours", "rows"]
+COUNT_COLUMNS = ["temp_count", "rain_hours", "snow_hours", "rows"]
+
+# 2시간 구간 라벨 ("0시~2시" ... "22시~24시"), 시간 순서가 있는 범주형
+BAND_LABELS = [f"{h}시~{h + 2}시" for h in range(0, 24, 2)]
+BAND_DTYPE = pd.CategoricalDtype(BAND_LABELS, ordered=True)
+
+
+def band_label(band_start) -> pd.Series:
+    """2시간 구간 시작 시각 -> 범주형 시간대 라벨 (행마다 문자열을 만들지 않음)"""
+    codes = np.asarray(band_start, dtype="int64") // 2
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=BAND_DTYPE))
+
+
+def weighted_index(df: pd.DataFrame, by: str = "month", value: str = "사고건수",
+                   weight: str = "precip_hours") -> pd.DataFrame:
+    """
+    그룹별 가중 평균 sum(value * weight) / sum(weight) 을 한 번의 groupby 로 계산.
+    가중치 합이 0 인 그룹은 NaN.
+    """
+    parts = pd.DataFrame({
+        by: df[by].to_numpy(),
+        weight: df[weight].astype(float).to_numpy(),
+        "weighted_sum": (df[value].astype(float) * df[weight]).to_numpy(),
+    })
+    g = parts.groupby(by, sort=True).sum()
+
+    out = pd.DataFrame({by: g.index, weight: g[weight].to_numpy()})
+    out["weighted_index"] = (g["weighted_sum"] / g[weight].where(g[weight] > 0)).to_numpy()
+    return out
+
+
+def aggregate_hours(df_w: pd.DataFrame) -> pd.DataFrame:
+    """
+    시간별 날씨 -> (관측소, 연도, 월, 2시간 구간) 별 합계/개수.
+    강수·적설 발생 시간은 (값 > 0) 지시 컬럼의 합으로 계산.
+    """
+    dt = df_w["datetime"].dt
+    temp = df_w["temp_avg"]
+    rain = df_w["rain_mm"]
+    snow = df_w["snow_cm"]
+
+    parts = pd.DataFrame({
+        "station": df_w["station"].astype("int64").to_numpy(),
+        "year": dt.year.astype("int64").to_numpy(),
+        "month": dt.month.astype("int64").to_numpy(),
+        "band_start": ((dt.hour // 2) * 2).astype("int64").to_numpy(),
+        "temp_sum": temp.fillna(0).to_numpy(),
+        "temp_count": temp.notna().to_numpy(dtype="int64"),
+        "rain_sum": rain.fillna(0).to_numpy(),
+        "snow_sum": snow.fillna(0).to_numpy(),
+        "rain_hours": (rain > 0).to_numpy(dtype="int64"),
+        "snow_hours": (snow > 0).to_numpy(dtype="int64"),
+        "rows": np.ones(len(df_w), dtype="int64"),
+    })
+    return parts.groupby(KEY_COLUMNS, sort=True)[SUM_COLUMNS].sum()
+
+
+def source_info(path, cache_dir=CACHE_DIR) -> dict:
+    """원본 파일의 크기와 내용 해시 (해시는 weather_cache manifest 에 캐시된 값 사용)"""
+    return {"size": os.path.getsize(path), "sha1": source_key(path, cache_dir)}
+
+
+def is_append(path, previous: dict, current: dict) -> bool:
+    """
+    지금 파일(current)이 이전에 반영한 파일(previous) 뒤에 내용만 이어 붙인 것인지.
+    이전 크기만큼의 앞부분 해시가 이전 해시와 같아야 한다 (중간 수정·교체·줄어든 파일은 False).
+    """
+    if previous["sha1"] == current["sha1"]:
+        return True
+    return current["size"] >= previous["size"] and is_prefix(path, previous["size"], previous["sha1"])
+
+
+def _empty_state() -> pd.DataFrame:
+    return pd.DataFrame(columns=KEY_COLUMNS + SUM_COLUMNS, dtype="int64").set_index(KEY_COLUMNS)
+
+
+class WeatherAggStore:
+    """
+    (관측소, 연도, 월, 2시간 구간) 별 누적 합계 저장소.
+    관측소마다 마지막으로 반영한 시각(watermark) 이후의 행만 합계에 더하고,
+    시간대별/월별 요약은 저장된 합계에서 원하는 관측소·연도만 골라 바로 만든다.
+    source 에는 마지막으로 반영한 원본 파일의 크기/해시를 기록해 두고,
+    원본이 이어 쓰기가 아니게 바뀌면(중간 수정, 교체) 누적 상태를 비우고 처음부터 다시 만든다.
+    """
+
+    def __init__(self, state: pd.DataFrame = None, watermarks: dict = None, source: dict = None):
+        self.state = _empty_state() if state is None else state
+        self.watermarks = {int(k): pd.Timestamp(v) for k, v in (watermarks or {}).items()}
+        self.source = source
+
+    def reset(self) -> None:
+        self.state = _empty_state()
+        self.watermarks = {}
+
+    def check_source(self, path, source: dict = None) -> bool:
+        """
+        원본 파일을 반영하기 전에 호출. 이어 쓰기가 아니면 누적 상태를 비운다.
+        기록된 원본 정보가 바뀌었으면(다시 저장해야 하면) True.
+        """
+        source = source or source_info(path)
+        if source == self.source:
+            return False
+        if self.source is not None and not is_append(path, self.source, source):
+            self.reset()
+        self.source = source
+        return True
+
+    @classmethod
+    def merged(cls, stores) -> "WeatherAggStore":
+        """여러 저장소(예: 파일별)를 하나로 합치기"""
+        merged = cls()
+        for store in stores:
+            merged.state = merged.state.add(store.state, fill_value=0)
+            for station, wm in store.watermarks.items():
+                merged.watermarks[station] = max(wm, merged.watermarks.get(station, wm))
+        merged.state = merged.state.sort_index().astype({c: "int64" for c in COUNT_COLUMNS})
+        return merged
+
+    # ----- 누적 -----
+    def update(self, df_w: pd.DataFrame) -> int:
+        """관측소별 watermark 이후의 행만 누적. 반영한 행 수를 반환"""
+        df_w = df_w.dropna(subset=["station"])
+        if self.watermarks:
+            wm = df_w["station"].astype("int64").map(self.watermarks)
+            df_w = df_w[wm.isna().to_numpy() | (df_w["datetime"] > wm).to_numpy()]
+        if df_w.empty:
+            return 0
+
+        partial = aggregate_hours(df_w)
+        state = self.state.add(partial, fill_value=0).sort_index()
+        self.state = state.astype({c: "int64" for c in COUNT_COLUMNS})
+
+        latest = df_w.groupby(df_w["station"].astype("int64"))["datetime"].max()
+        for station, wm in latest.items():
+            self.watermarks[int(station)] = max(wm, self.watermarks.get(int(station), wm))
+        return len(df_w)
+
+    # ----- 조회 -----
+    def stations(self) -> list:
+        return sorted(self.state.index.get_level_values("station").unique().tolist())
+
+    def years(self) -> list:
+        return sorted(self.state.index.get_level_values("year").unique().tolist())
+
+    def _select(self, stations=None, years=None) -> pd.DataFrame:
+        state = self.state
+        if stations is not None:
+            state = state[state.index.get_level_values("station").isin(list(stations))]
+        if years is not None:
+            state = state[state.index.get_level_values("year").isin(list(years))]
+        return state
+
+    def _summary(self, keys, stations=None, years=None, per_station: bool = False) -> pd.DataFrame:
+        """
+        keys 별 요약. per_station=True 이면 강수·적설 합계와 발생 시간을 관측소별로 먼저 합친 뒤
+        관측소 평균으로 낸다 (관측소가 여러 곳인 지역에서 관측소 수만큼 커지지 않도록). 기온은 항상 전체 평균.
+        """
+        state = self._select(stations, years)
+        g = state.groupby(level=keys, sort=True).sum()
+        out = pd.DataFrame(index=g.index)
+        out["avg_temp"] = g["temp_sum"] / g["temp_count"].where(g["temp_count"] > 0)
+        if per_station:
+            totals = ["rain_sum", "snow_sum", "rain_hours", "snow_hours"]
+            g = state.groupby(level=keys + ["station"], sort=True)[totals].sum().groupby(level=keys).mean()
+            out["total_rain"] = g["rain_sum"]
+            out["total_snow"] = g["snow_sum"]
+            out["rain_hours"] = g["rain_hours"].astype(float)
+            out["snow_hours"] = g["snow_hours"].astype(float)
+        else:
+            out["total_rain"] = g["rain_sum"]
+            out["total_snow"] = g["snow_sum"]
+            out["rain_hours"] = g["rain_hours"].astype(int)
+            out["snow_hours"] = g["snow_hours"].astype(int)
+        return out.reset_index()
+
+    # ----- 요약 테이블 (per_station: 여러 관측소를 관측소 평균으로 요약) -----
+    def band_frame(self, stations=None, years=None, per_station: bool = False) -> pd.DataFrame:
+        """시간대별 날씨 요약 (시간 순서 정렬)"""
+        df = self._summary(["band_start"], stations, years, per_station)
+        df.insert(0, "시간대", band_label(df["band_start"]))
+        return df.drop(columns=["band_start"])
+
+    def month_frame(self, stations=None, years=None, per_station: bool = False) -> pd.DataFrame:
+        """월별 날씨 요약"""
+        return self._summary(["month"], stations, years, per_station)
+
+    def month_band_frame(self, stations=None, years=None, per_station: bool = False) -> pd.DataFrame:
+        """(월, 시간대) 별 강수·적설 발생 시간"""
+        keys = ["month", "band_start"]
+        df = self._summary(keys, stations, years, per_station)[keys + ["rain_hours", "snow_hours"]]
+        df.insert(1, "시간대", band_label(df["band_start"]))
+        return df.drop(columns=["band_start"])
+
+    # ----- 저장/불러오기 -----
+    def save(self, path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": STORE_VERSION,
+            "watermarks": {str(k): v.isoformat() for k, v in self.watermarks.items()},
+            "source": self.source,
+            "state": self.state.reset_index().to_dict(orient="list"),
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> "WeatherAggStore":
+        """저장된 누적 상태 불러오기 (없거나 형식이 다르면 빈 저장소)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        if payload.get("version") != STORE_VERSION:
+            return cls()
+
+        state = pd.DataFrame(payload["state"], columns=KEY_COLUMNS + SUM_COLUMNS)
+        state = state.astype({c: "int64" for c in KEY_COLUMNS}).set_index(KEY_COLUMNS)
+        return cls(state, payload["watermarks"], payload.get("source"))
+
+
+def refresh_store(name: str, load_rows, store_dir=STORE_DIR, source_path=None) -> WeatherAggStore:
+    """
+    저장소를 불러와 새 행만 반영하고 다시 저장.
+    load_rows(since) 는 since({관측소: watermark}, 처음이면 None) 이후의 시간별 행을 돌려주는 함수.
+    since 에 없는 관측소의 행은 모두 돌려줘야 한다 (이어 쓴 부분에 새 관측소가 들어올 수 있음).
+    source_path 를 주면 원본이 이어 쓰기가 아니게 바뀐 경우 처음부터 다시 누적한다.
+    """
+    path = Path(store_dir) / f"{name}.json"
+    store = WeatherAggStore.load(path)
+    changed = store.check_source(source_path) if source_path is not None else False
+    if store.update(load_rows(dict(store.watermarks) or None)) or changed:
+        store.save(path)
+    return store
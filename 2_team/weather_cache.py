@@ -0,0 +1,279 @@
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+# pyarrow 는 parquet 를 실제로 읽고 쓸 때 pandas 가 불러오므로 여기서는 설치 여부만 확인
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# ASOS 시간별 원본(27개 컬럼) 중 분석에 필요한 컬럼만 사용
+WEATHER_COLUMNS = {
+    '지점': 'station',
+    '일시': 'datetime',
+    '기온(°C)': 'temp_avg',
+    '강수량(mm)': 'rain_mm',
+    '습도(%)': 'humidity_pct',
+    '적설(cm)': 'snow_cm',
+}
+VALUE_COLUMNS = ["temp_avg", "rain_mm", "humidity_pct", "snow_cm"]
+PARTITION_COLUMNS = ["year", "month"]
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "weather"
+MANIFEST_NAME = "manifest.json"
+# 캐시 폴더마다 마지막으로 반영한 원본 정보 (pyarrow 는 _ 로 시작하는 파일을 데이터로 읽지 않음)
+STATE_NAME = "_source.json"
+
+
+def file_sha1(path, chunk_size: int = 1 << 20, limit: int = None) -> str:
+    """파일 내용 해시 (limit 를 주면 앞의 limit 바이트만)"""
+    h = hashlib.sha1()
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            h.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return h.hexdigest()
+
+
+def _read_manifest(cache_dir: Path) -> dict:
+    try:
+        with open(cache_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(cache_dir: Path, manifest: dict) -> None:
+    tmp = cache_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, cache_dir / MANIFEST_NAME)
+
+
+def source_entry(path, cache_dir=CACHE_DIR) -> dict:
+    """
+    원본 파일의 {size, mtime_ns, sha1}.
+    크기/수정시각이 manifest 기록과 같으면 파일을 다시 읽지 않고 기록된 해시를 사용.
+    manifest 는 쓰지 않으므로 여러 프로세스에서 동시에 불러도 된다 (기록은 record_sources).
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    entry = _read_manifest(Path(cache_dir)).get(str(path))
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": file_sha1(path)}
+
+
+def record_sources(cache_dir, entries: dict) -> None:
+    """{원본 경로: source_entry 결과} 를 manifest 에 한 번에 기록 (바뀐 것이 없으면 쓰지 않음)"""
+    cache_dir = Path(cache_dir)
+    manifest = _read_manifest(cache_dir)
+    updates = {str(Path(p).resolve()): e for p, e in entries.items()}
+    if all(manifest.get(p) == e for p, e in updates.items()):
+        return
+    manifest.update(updates)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _write_manifest(cache_dir, manifest)
+
+
+def source_key(path, cache_dir=CACHE_DIR) -> str:
+    """원본 파일의 캐시 키(sha1). 새로 계산했으면 manifest 에 기록"""
+    entry = source_entry(path, cache_dir)
+    record_sources(cache_dir, {path: entry})
+    return entry["sha1"]
+
+
+def is_prefix(path, size: int, sha1: str) -> bool:
+    """path 의 앞 size 바이트가 해시 sha1 인 내용 그대로인지 (뒤에 이어 붙이기만 했는지)"""
+    return os.path.getsize(path) >= size and file_sha1(path, limit=size) == sha1
+
+
+def parse_weather_csv(path, encoding: str = "cp949") -> pd.DataFrame:
+    """ASOS 원본 CSV -> 필요한 컬럼만 정리된 시간별 날씨 데이터"""
+    df_w = pd.read_csv(path, encoding=encoding, usecols=list(WEATHER_COLUMNS))
+    df_w = df_w.rename(columns=WEATHER_COLUMNS)[list(WEATHER_COLUMNS.values())]
+
+    # 결측치 처리 (강수/적설 기록이 없으면 0)
+    df_w["rain_mm"] = df_w["rain_mm"].fillna(0)
+    df_w["snow_cm"] = df_w["snow_cm"].fillna(0)
+
+    # 수치형 변환
+    for c in VALUE_COLUMNS:
+        df_w[c] = pd.to_numeric(df_w[c], errors="coerce").astype("float64")
+    df_w["station"] = pd.to_numeric(df_w["station"], errors="coerce").astype("Int32")
+
+    # 날짜형 변환 ("2024-01-01 0:00" 형식)
+    df_w["datetime"] = pd.to_datetime(df_w["datetime"], format="%Y-%m-%d %H:%M", errors="coerce")
+    df_w = df_w.dropna(subset=["datetime"]).reset_index(drop=True)
+    return df_w
+
+
+def _read_state(target: Path):
+    try:
+        with open(target / STATE_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_state(target: Path, path, entry: dict) -> None:
+    # 마지막 바이트가 줄바꿈이어야 다음 이어 쓰기를 새 줄부터 읽을 수 있다
+    with open(path, "rb") as f:
+        f.seek(max(entry["size"] - 1, 0))
+        ends_newline = f.read(1) == b"\n"
+    state = {"size": entry["size"], "sha1": entry["sha1"], "ends_newline": ends_newline}
+    tmp = target / (STATE_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, target / STATE_NAME)
+
+
+def _with_partitions(df_w: pd.DataFrame) -> pd.DataFrame:
+    df_w["year"] = df_w["datetime"].dt.year
+    df_w["month"] = df_w["datetime"].dt.month
+    return df_w
+
+
+def _build_cache(path, target: Path, encoding: str, entry: dict) -> None:
+    df_w = _with_partitions(parse_weather_csv(path, encoding=encoding))
+
+    # 임시 폴더에 쓴 뒤 교체 (쓰는 도중 다른 프로세스가 읽지 않도록)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    df_w.to_parquet(tmp, engine="pyarrow", partition_cols=PARTITION_COLUMNS, index=False)
+    _write_state(tmp, path, entry)
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+
+def _append_cache(path, target: Path, encoding: str, offset: int, entry: dict) -> int:
+    """
+    이전에 캐시한 offset 바이트 뒤에 붙은 부분만 파싱해 파티션 파일로 추가.
+    헤더 줄을 앞에 붙여 같은 파서로 읽는다. 추가한 행 수를 돌려준다.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(offset)
+        tail = f.read(entry["size"] - offset)
+    df_w = _with_partitions(parse_weather_csv(io.BytesIO(header + tail), encoding=encoding))
+
+    if len(df_w):
+        # 새 파티션 파일은 이름이 겹치지 않으므로(uuid) 기존 파티션 폴더로 옮기기만 하면 된다
+        tmp = target.with_name(target.name + ".append")
+        shutil.rmtree(tmp, ignore_errors=True)
+        df_w.to_parquet(tmp, engine="pyarrow", partition_cols=PARTITION_COLUMNS, index=False)
+        for part in sorted(tmp.rglob("*.parquet")):
+            dest = target / part.relative_to(tmp)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(part, dest)
+        shutil.rmtree(tmp, ignore_errors=True)
+    _write_state(target, path, entry)
+    return len(df_w)
+
+
+def sync_cache(path, target: Path, encoding: str = "cp949", entry: dict = None) -> dict:
+    """
+    target 캐시를 원본 path 에 맞춘다.
+    - 원본이 그대로면 아무것도 하지 않음 ("hit")
+    - 이전에 캐시한 내용 뒤에 이어 붙이기만 했으면 붙은 바이트만 파싱해 추가 ("append")
+    - 그 밖(중간 수정, 교체, 줄어든 파일)에는 처음부터 다시 만듦 ("build")
+    {"mode", "parsed_bytes"} 를 돌려준다.
+    """
+    entry = entry or source_entry(path)
+    state = _read_state(target)
+    if state and state["sha1"] == entry["sha1"] and state["size"] == entry["size"]:
+        return {"mode": "hit", "parsed_bytes": 0}
+    if (state and state["ends_newline"] and entry["size"] > state["size"]
+            and is_prefix(path, state["size"], state["sha1"])):
+        _append_cache(path, target, encoding, state["size"], entry)
+        return {"mode": "append", "parsed_bytes": entry["size"] - state["size"]}
+    _build_cache(path, target, encoding, entry)
+    return {"mode": "build", "parsed_bytes": entry["size"]}
+
+
+def cache_target(path, cache_dir=CACHE_DIR) -> Path:
+    """원본 경로마다 고정된 캐시 폴더 (내용이 바뀌어도 같은 폴더를 갱신)"""
+    path = Path(path).resolve()
+    return Path(cache_dir) / f"{path.stem}-{hashlib.sha1(str(path).encode()).hexdigest()[:8]}"
+
+
+def _since_map(since):
+    """since -> {관측소: 시각} (관측소별 watermark) 또는 None. 하나의 시각이면 모든 관측소에 적용({None: 시각})"""
+    if since is None:
+        return None
+    if isinstance(since, dict):
+        return {int(k): pd.Timestamp(v) for k, v in since.items()} or None
+    return {None: pd.Timestamp(since)}
+
+
+def _partition_filters(years=None, since=None):
+    # pyarrow DNF 필터: [[조건 AND ...] OR [...]]
+    base = [("year", "in", [int(y) for y in years])] if years is not None else []
+    since = _since_map(since)
+    if since is None:
+        return [base] if base else None
+    earliest = min(since.values())
+    filters = [
+        base + [("year", ">", earliest.year)],
+        base + [("year", "=", earliest.year), ("month", ">=", earliest.month)],
+    ]
+    if None not in since:
+        # watermark 가 없는(처음 보는) 관측소는 모든 달을 읽는다
+        filters.append(base + [("station", "not in", list(since))])
+    return filters
+
+
+def _after_since(df_w: pd.DataFrame, since) -> pd.DataFrame:
+    since = _since_map(since)
+    if since is None:
+        return df_w
+    if None in since:
+        return df_w[df_w["datetime"] > since[None]]
+    wm = df_w["station"].astype("Int64").map(since)
+    keep = wm.isna().to_numpy() | (df_w["datetime"] > wm).fillna(False).to_numpy(dtype=bool)
+    return df_w[keep]
+
+
+def _filter_rows(df_w: pd.DataFrame, years=None, since=None) -> pd.DataFrame:
+    if years is not None:
+        df_w = df_w[df_w["datetime"].dt.year.isin(list(years))]
+    return _after_since(df_w, since).reset_index(drop=True)
+
+
+def load_weather(path, cache_dir=CACHE_DIR, encoding: str = "cp949", years=None, since=None,
+                 entry: dict = None, stats: dict = None) -> pd.DataFrame:
+    """
+    시간별 날씨 데이터 로드.
+    원본마다 연/월 파티션 parquet 캐시를 두고, 원본이 바뀌었으면 먼저 캐시를 맞춘다 (sync_cache).
+    이어 쓰기면 붙은 바이트만 파싱하므로 파일이 커져도 전체를 다시 읽지 않는다. (pyarrow 가 없으면 매번 원본 파싱)
+    years 를 주면 해당 연도 파티션만, since 를 주면 그 시각 이후의 행만 읽는다.
+    since 에 {관측소: 시각} (WeatherAggStore.watermarks) 을 주면 관측소마다 그 시각 이후, 없는 관측소는 전부 읽는다.
+    entry 에 source_entry 결과를 넘기면 manifest 를 쓰지 않는다 (작업자 프로세스용, 기록은 호출한 쪽에서).
+    stats 에 dict 를 넘기면 캐시 갱신 방식(hit/append/build)과 파싱한 바이트 수를 기록.
+    """
+    if not HAS_PYARROW:
+        return _filter_rows(parse_weather_csv(path, encoding=encoding), years, since)
+
+    cache_dir = Path(cache_dir)
+    if entry is None:
+        entry = source_entry(path, cache_dir)
+        record_sources(cache_dir, {path: entry})
+    target = cache_target(path, cache_dir)
+    result = sync_cache(path, target, encoding, entry)
+    if stats is not None:
+        stats.update(result)
+
+    df_w = pd.read_parquet(target, engine="pyarrow", filters=_partition_filters(years, since))
+    df_w = _after_since(df_w.drop(columns=PARTITION_COLUMNS), since)
+
+    df_w = df_w.sort_values(["station", "datetime"], kind="stable").reset_index(drop=True)
+    return df_w[list(WEATHER_COLUMNS.values())]
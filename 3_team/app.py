@@ -1,6 +1,12 @@
+import os
+import sys
+
 import streamlit as st
-import pandas as pd
-import joblib
+
+# 저장소 루트의 artifacts.py (데이터/모델 레지스트리)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import artifacts
+from microbatch import MicroBatcher
 
 # ---------------------------------------------------------
 # 1. 페이지 설정 및 세션 상태 초기화
@@ -13,21 +19,57 @@ st.set_page_config(
 
 if 'prediction_result' not in st.session_state:
     st.session_state['prediction_result'] = None
-if 'input_df' not in st.session_state:
-    st.session_state['input_df'] = None
+if 'input_features' not in st.session_state:
+    st.session_state['input_features'] = None
 
 # ---------------------------------------------------------
 # 2. 모델 불러오기
 # ---------------------------------------------------------
+# 모델은 진단 버튼을 처음 누를 때 불러옴 (첫 화면을 먼저 그리기 위함)
+# pkl 대신 내보낸 노드 배열(obesity_forest/)을 mmap 으로 열어 sklearn 없이 예측
 @st.cache_resource
 def load_model():
+    from forest_export import load_forest
+
     try:
-        return joblib.load('./3_team/obesity_model.pkl')
+        return load_forest(artifacts.locate('obesity_forest'), artifacts.locate('obesity_model'),
+                           schema_path=artifacts.path('obesity_schema'))
     except:
         st.error("❌ 모델 파일(obesity_model.pkl)을 찾을 수 없습니다.")
         return None
 
-model = load_model()
+# 여러 세션의 진단 요청을 모아 한 번의 predict 로 처리 (프로세스 전체에서 공유)
+@st.cache_resource
+def load_batcher():
+    model = load_model()
+    return None if model is None else MicroBatcher(model.predict, max_batch=64, max_wait_ms=2)
+
+# 예측 결과 캐시 (인코딩된 응답 -> 등급, 세션 간 공유). 미리 계산해 둔 자주 나오는 응답은 고정 항목으로 불러옴
+@st.cache_resource
+def load_prediction_cache():
+    from prediction_cache import PRECOMPUTED_NAME, PredictionCache
+
+    cache = PredictionCache(maxsize=50_000, ttl=24 * 3600)
+    model = load_model()
+    if model is not None:
+        cache.load_precomputed(artifacts.locate('obesity_forest') / PRECOMPUTED_NAME, model)
+    return cache
+
+# 예측별 변수 기여도 계산기 (트리 구조를 한 번만 분석해 두고 재사용)
+@st.cache_resource
+def load_explainer():
+    from forest_explain import PathExplainer
+
+    model = load_model()
+    return None if model is None else PathExplainer(model)
+
+# 설문 선택지는 feature_schema.json 의 labels (모델 입력 변환 규칙과 같은 파일)
+@st.cache_data
+def load_choices():
+    schema = artifacts.load('obesity_schema')
+    return {field['name']: list(field.get('labels', {})) for field in schema['fields']}
+
+choices = load_choices()
 
 # ---------------------------------------------------------
 # 3. 화면 구성
@@ -35,7 +77,7 @@ model = load_model()
 st.title("🩺 비만 등급 예측 솔루션")
 st.markdown("---")
 
-tab1, tab2 = st.tabs(["📝 정보 입력 (Input)", "📊 진단 결과 (Result)"])
+tab1, tab2, tab3 = st.tabs(["📝 정보 입력 (Input)", "📊 진단 결과 (Result)", "📦 일괄 진단 (Batch)"])
 
 # =========================================================
 # [탭 1] 정보 입력 페이지
@@ -51,13 +93,13 @@ with tab1:
     # -----------------------------------------------------
     with col1:
         st.subheader("1. 기본 정보")
-        gender = st.radio("성별", ["남성", "여성"], horizontal=True)
+        gender = st.radio("성별", choices['Gender'], horizontal=True)
         age = st.number_input("나이 (만)", 10, 100, 25)
-        family_history = st.radio("가족 비만력 (부모/형제)", ["예", "아니오"], horizontal=True)
+        family_history = st.radio("가족 비만력 (부모/형제)", choices['family_history_with_overweight'], horizontal=True)
         
         st.divider()
         st.subheader("4. 핵심 정보 (이동수단)")
-        mtrans_option = st.selectbox("주 이용 교통수단", ["자동차", "오토바이", "자전거", "대중교통", "도보"])
+        mtrans_option = st.selectbox("주 이용 교통수단", choices['MTRANS'])
 
     # -----------------------------------------------------
     # 2. 식습관
@@ -68,32 +110,18 @@ with tab1:
         # FAVC
         st.write("**고칼로리 음식 섭취**")
         st.caption("※ 튀김, 패스트푸드, 디저트 등을 자주 드시나요?")
-        favc = st.radio("고칼로리 섭취 여부", ["예", "아니오"], horizontal=True, label_visibility="collapsed")
+        favc = st.radio("고칼로리 섭취 여부", choices['FAVC'], horizontal=True, label_visibility="collapsed")
         
         # FCVC (채소)
-        fcvc_label = st.selectbox("채소 섭취 빈도", 
-                                ["거의 안 먹음", "가끔 먹음", "매끼 먹음"])
-        fcvc_map = {"거의 안 먹음": 1.0, "가끔 먹음": 2.0, "매끼 먹음": 3.0}
+        fcvc_label = st.selectbox("채소 섭취 빈도", choices['FCVC'])
         
         # NCP (식사 횟수)
-        ncp_label = st.selectbox("하루 식사 횟수", 
-                               ["1끼", "2끼", "3끼", "4끼 이상"])
-        ncp_map = {"1끼": 1.0, "2끼": 2.0, "3끼": 3.0, "4끼 이상": 4.0}
+        ncp_label = st.selectbox("하루 식사 횟수", choices['NCP'])
         
         # [수정] CAEC (간식) - 구체적 횟수 명시
-        caec_label = st.selectbox("식사 외 간식 섭취", 
-                                ["안 먹음", 
-                                 "가끔 (주 1~2회)", 
-                                 "자주 (주 3~4회)", 
-                                 "항상 (매일)"])
-        caec_map = {
-            "안 먹음": 0,
-            "가끔 (주 1~2회)": 1,
-            "자주 (주 3~4회)": 2,
-            "항상 (매일)": 3
-        }
+        caec_label = st.selectbox("식사 외 간식 섭취", choices['CAEC'])
 
-        smoke = st.radio("흡연 여부", ["예", "아니오"], horizontal=True)
+        smoke = st.radio("흡연 여부", choices['SMOKE'], horizontal=True)
 
     # -----------------------------------------------------
     # 3. 생활 습관
@@ -102,34 +130,18 @@ with tab1:
         st.subheader("3. 생활 습관")
         
         # CH2O (물)
-        ch2o_label = st.selectbox("하루 물 섭취량", 
-                                ["1L 미만 (거의 안 마심)", "1L ~ 2L (보통)", "2L 이상 (많이 마심)"])
-        ch2o_map = {"1L 미만 (거의 안 마심)": 1.0, "1L ~ 2L (보통)": 2.0, "2L 이상 (많이 마심)": 3.0}
+        ch2o_label = st.selectbox("하루 물 섭취량", choices['CH2O'])
         
         # [수정] CALC (음주) - 요청하신 기준 적용
-        calc_label = st.selectbox("음주 빈도", 
-                                ["마시지 않음", 
-                                 "가끔 마심 (주 1~2회)", 
-                                 "자주 마심 (주 3~4회)", 
-                                 "항상 마심 (주 5회 이상)"])
-        calc_map = {
-            "마시지 않음": 0,
-            "가끔 마심 (주 1~2회)": 1,
-            "자주 마심 (주 3~4회)": 2,
-            "항상 마심 (주 5회 이상)": 3
-        }
+        calc_label = st.selectbox("음주 빈도", choices['CALC'])
 
-        scc = st.radio("칼로리 계산(다이어트) 여부", ["예", "아니오"], horizontal=True)
+        scc = st.radio("칼로리 계산(다이어트) 여부", choices['SCC'], horizontal=True)
         
         # FAF (운동)
-        faf_label = st.selectbox("일주일 운동 빈도", 
-                               ["운동 안 함", "주 1~2일", "주 3~4일", "주 5일 이상"])
-        faf_map = {"운동 안 함": 0.0, "주 1~2일": 1.0, "주 3~4일": 2.0, "주 5일 이상": 3.0}
+        faf_label = st.selectbox("일주일 운동 빈도", choices['FAF'])
         
         # TUE (전자기기)
-        tue_label = st.selectbox("하루 전자기기 사용 (스마트폰/PC)", 
-                               ["0~2시간 (적음)", "3~5시간 (보통)", "5시간 이상 (많음)"])
-        tue_map = {"0~2시간 (적음)": 0.0, "3~5시간 (보통)": 1.0, "5시간 이상 (많음)": 2.0}
+        tue_label = st.selectbox("하루 전자기기 사용 (스마트폰/PC)", choices['TUE'])
 
     # -----------------------------------------------------
     # 진단 버튼
@@ -141,37 +153,29 @@ with tab1:
         btn_click = st.button("🚀 진단 시작하기", type="primary", use_container_width=True)
 
     if btn_click:
-        # 입력값 변환
-        input_data = {
-            'Gender': 1 if gender == "남성" else 0,
+        # 화면 선택지 그대로 전달 (변환은 모델과 함께 저장된 스키마 변환기가 수행)
+        answers = {
+            'Gender': gender,
             'Age': age,
-            'family_history_with_overweight': 1 if family_history == "예" else 0,
-            'FAVC': 1 if favc == "예" else 0,
-            'FCVC': fcvc_map[fcvc_label],
-            'NCP': ncp_map[ncp_label],
-            'CAEC': caec_map[caec_label],  # 간식 매핑 적용
-            'SMOKE': 1 if smoke == "예" else 0,
-            'CH2O': ch2o_map[ch2o_label],
-            'SCC': 1 if scc == "예" else 0,
-            'FAF': faf_map[faf_label],
-            'TUE': tue_map[tue_label],
-            'CALC': calc_map[calc_label],  # 음주 매핑 적용
-            
-            # 이동수단 One-Hot Encoding
-            'MTRANS_Automobile': 1 if mtrans_option == "자동차" else 0,
-            'MTRANS_Bike': 1 if mtrans_option == "자전거" else 0,
-            'MTRANS_Motorbike': 1 if mtrans_option == "오토바이" else 0,
-            'MTRANS_Public_Transportation': 1 if mtrans_option == "대중교통" else 0,
-            'MTRANS_Walking': 1 if mtrans_option == "도보" else 0
+            'family_history_with_overweight': family_history,
+            'FAVC': favc,
+            'FCVC': fcvc_label,
+            'NCP': ncp_label,
+            'CAEC': caec_label,
+            'SMOKE': smoke,
+            'CH2O': ch2o_label,
+            'SCC': scc,
+            'FAF': faf_label,
+            'TUE': tue_label,
+            'CALC': calc_label,
+            'MTRANS': mtrans_option,
         }
-        
-        # DataFrame 생성 및 세션 저장
-        input_df = pd.DataFrame([input_data])
-        st.session_state['input_df'] = input_df
-        
+
+        model = load_model()
         if model is not None:
-            pred = model.predict(input_df)[0]
-            st.session_state['prediction_result'] = pred
+            X = model.encoder.encode_one(answers)
+            st.session_state['input_features'] = dict(zip(model.encoder.feature_names, X[0].tolist()))
+            st.session_state['prediction_result'] = int(load_prediction_cache().predict(X, load_batcher().predict)[0])
             st.success("✅ 진단 완료! 상단 [진단 결과] 탭을 확인하세요.")
             st.rerun()
         else:
@@ -222,11 +226,24 @@ with tab2:
                 st.error(f"### 결과: {result_text}")
                 st.write("적극적인 체중 감량이 필요합니다. 전문가의 도움을 받거나 생활 습관을 크게 개선해야 합니다.")
 
+        user_data = st.session_state['input_features']
+
+        # 비만(Level 3, 4)이면 이 사람의 판정에 기여도가 높은 변수를 기여도와 함께 표시
+        explainer = load_explainer() if pred >= 3 else None
+        if explainer is not None:
+            st.divider()
+            st.subheader("🔍 비만 판정에 영향을 준 요인")
+            st.caption("각 항목이 비만·고도비만 확률을 얼마나 높였는지(%p) 보여줍니다.")
+
+            x = [[user_data[f] for f in explainer.encoder.feature_names]]
+            drivers = [(name, c) for name, c in explainer.explain_one(x, classes=[3, 4], top=18) if c > 0][:5]
+            for name, c in drivers:
+                st.write(f"- **{explainer.encoder.titles[name]}**: +{c * 100:.1f}%p")
+
         st.divider()
         st.subheader("💡 AI 맞춤 솔루션")
         
         advice_list = []
-        user_data = st.session_state['input_df'].iloc[0]
         
         # 상세 조언 로직
         if user_data['TUE'] >= 2.0:
@@ -252,4 +269,67 @@ with tab2:
 
         if st.button("🔄 다시 진단하기"):
             st.session_state['prediction_result'] = None
-            st.rerun()
\ No newline at end of file
+            st.rerun()
+
+        # 세션 간 공유하는 예측 캐시의 적중 지표 (진단을 한 번 했으면 캐시가 이미 만들어져 있음)
+        with st.expander("🗂️ 예측 캐시 현황"):
+            from prediction_cache import format_metrics
+
+            cache_metrics = load_prediction_cache().metrics()
+            c1, c2, c3, c4 = st.columns(4)
+            c1.metric("적중률", f"{cache_metrics['hit_rate']:.1%}")
+            c2.metric("조회", f"{cache_metrics['lookups']:,}건")
+            c3.metric("고정 항목 적중", f"{cache_metrics['pinned_hits']:,}건")
+            c4.metric("미스", f"{cache_metrics['misses']:,}건")
+            st.caption(format_metrics(cache_metrics))
+
+# =========================================================
+# [탭 3] 일괄 진단 페이지
+# =========================================================
+with tab3:
+    st.header("📦 일괄 진단")
+    st.info("설문 결과 CSV/Parquet 파일을 올리면 모든 행의 비만 등급과 등급별 확률을 한 번에 계산합니다.")
+    st.caption(
+        "입력 형식: 인코딩된 18개 컬럼(비만_등급_SMOTE.csv 형식) 또는 원본 응답"
+        "(Gender, family_history_with_overweight, FAVC, FCVC, NCP, CAEC, SMOKE, CH2O, SCC, FAF, TUE, CALC, MTRANS)"
+    )
+
+    uploaded = st.file_uploader("진단할 파일 선택", type=["csv", "parquet"])
+
+    if uploaded is not None:
+        from batch_score import GRADES, GRADE_COLUMN, LABEL_COLUMN, read_rows, score_frame, to_download
+
+        try:
+            df_in = read_rows(uploaded)
+        except Exception as e:
+            st.error(f"파일을 읽는 중 오류가 발생했습니다: {e}")
+            st.stop()
+
+        st.write(f"**{len(df_in):,}명** 데이터를 불러왔습니다.")
+
+        if st.button("🚀 일괄 진단 시작", type="primary"):
+            model = load_model()
+            if model is None:
+                st.error("모델 로드 실패")
+                st.stop()
+            try:
+                df_out = score_frame(model, df_in)
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
+            n_invalid = int(df_out[LABEL_COLUMN].isna().sum())
+            if n_invalid:
+                st.warning(f"⚠️ 값을 해석할 수 없는 {n_invalid:,}행은 진단하지 않았습니다.")
+
+            st.subheader("등급별 인원")
+            st.bar_chart(df_out[GRADE_COLUMN].value_counts().sort_index().rename(index=GRADES))
+            st.dataframe(df_out.head(100), use_container_width=True)
+
+            col_csv, col_pq = st.columns(2)
+            with col_csv:
+                st.download_button("📥 CSV 다운로드", to_download(df_out, "csv"),
+                                   file_name="진단결과.csv", mime="text/csv")
+            with col_pq:
+                st.download_button("📥 Parquet 다운로드", to_download(df_out, "parquet"),
+                                   file_name="진단결과.parquet", mime="application/octet-stream")
@@ -0,0 +1,164 @@
+"""
+비만 등급 일괄 진단.
+설문 내보내기/검진 명단 CSV(또는 Parquet)를 받아 등급과 등급별 확률을 붙여 저장한다.
+
+입력은 두 가지 형식 모두 가능 (변환 규칙은 feature_schema.json)
+- 인코딩된 18개 컬럼 (비만_등급_SMOTE.csv 와 같은 형식)
+- 원본 응답 (비만 등급_원본.csv 형식의 yes/no, Sometimes, MTRANS 등 또는 앱 화면의 한글 선택지)
+
+    python 3_team/batch_score.py 설문.csv -o 진단결과.csv --chunk-size 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_encoder import SCHEMA_PATH, FeatureEncoder
+
+GRADES = {
+    0: "저체중 (Insufficient Weight)",
+    1: "정상 체중 (Normal Weight)",
+    2: "과체중 (Overweight)",
+    3: "비만 (Obesity Type I, II)",
+    4: "고도비만 (Obesity Type III)",
+}
+
+GRADE_COLUMN = "grade"
+LABEL_COLUMN = "grade_label"
+
+
+def score_frame(model, df: pd.DataFrame, chunk_size: int = 20_000, encoder: FeatureEncoder = None) -> pd.DataFrame:
+    """
+    입력 컬럼은 그대로 두고 grade, grade_label, proba_<등급> 컬럼을 붙여 반환.
+    인코딩할 수 없는 행은 등급/확률이 비어 있다.
+    encoder 를 주지 않으면 모델과 함께 저장된 변환기(없으면 feature_schema.json)를 사용.
+    """
+    encoder = encoder or getattr(model, "encoder", None) or FeatureEncoder.load()
+    X = encoder.encode_batch(df)
+    valid = ~np.isnan(X).any(axis=1)
+    classes = np.asarray(model.classes_)
+
+    proba = np.full((len(df), len(classes)), np.nan)
+    idx = np.flatnonzero(valid)
+    for start in range(0, len(idx), chunk_size):
+        rows = idx[start:start + chunk_size]
+        proba[rows] = model.predict_proba(X[rows])
+
+    grade = pd.array(np.full(len(df), pd.NA), dtype="Int64")
+    if valid.any():
+        grade[valid] = classes[np.argmax(proba[valid], axis=1)]
+
+    out = df.copy()
+    out[GRADE_COLUMN] = grade
+    out[LABEL_COLUMN] = pd.Series(grade, index=out.index).map(GRADES)
+    for k, c in enumerate(classes):
+        out[f"proba_{c}"] = proba[:, k]
+    return out
+
+
+def read_rows(uploaded) -> pd.DataFrame:
+    """업로드된 CSV/Parquet 파일 읽기 (Streamlit UploadedFile 또는 경로)"""
+    name = getattr(uploaded, "name", str(uploaded))
+    ext = os.path.splitext(name)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(uploaded)
+    if ext == ".csv":
+        try:
+            return pd.read_csv(uploaded, encoding="utf-8-sig")
+        except UnicodeDecodeError:
+            if hasattr(uploaded, "seek"):
+                uploaded.seek(0)
+            return pd.read_csv(uploaded, encoding="cp949")
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {name} (csv, parquet 만 가능)")
+
+
+def _stable_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    chunk 마다 추론한 dtype 이 달라지지 않도록 맞춤: 숫자 컬럼은 float64, 문자 컬럼은 string.
+    (같은 컬럼이 어떤 chunk 에서는 int64, 다른 chunk 에서는 double 로 읽히거나 등급 이름이 모두 비는 경우)
+    """
+    dtypes = {}
+    for col, dtype in df.dtypes.items():
+        if col == GRADE_COLUMN or pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_numeric_dtype(dtype):
+            dtypes[col] = np.float64
+        elif col == LABEL_COLUMN or pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            dtypes[col] = "string"
+    return df.astype(dtypes)
+
+
+def score_file(model, in_path, out_path, chunk_size: int = 20_000) -> int:
+    """
+    파일 단위 일괄 진단. CSV 는 chunk_size 행씩 읽고 진단해서 바로 이어 쓴다.
+    Parquet 출력은 모든 chunk 를 첫 chunk 의 스키마로 맞춰 쓴다.
+    처리한 행 수를 반환.
+    """
+    ext = os.path.splitext(str(in_path))[1].lower()
+    if ext == ".csv":
+        chunks = pd.read_csv(in_path, encoding="utf-8-sig", chunksize=chunk_size)
+    else:
+        chunks = [read_rows(in_path)]
+
+    out_parquet = str(out_path).lower().endswith(".parquet")
+    writer = None
+    total = 0
+    try:
+        for i, chunk in enumerate(chunks):
+            scored = _stable_dtypes(score_frame(model, chunk, chunk_size=chunk_size))
+            if out_parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(scored, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            else:
+                # 엑셀에서 한글이 깨지지 않도록 utf-8-sig (BOM 은 첫 조각에만)
+                scored.to_csv(out_path, index=False, mode="w" if i == 0 else "a", header=(i == 0),
+                              encoding="utf-8-sig" if i == 0 else "utf-8")
+            total += len(scored)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+
+def to_download(df: pd.DataFrame, fmt: str = "csv") -> bytes:
+    """진단 결과를 다운로드용 바이트로 변환"""
+    if fmt == "parquet":
+        import io
+
+        buf = io.BytesIO()
+        df.to_parquet(buf, index=False)
+        return buf.getvalue()
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+
+def main():
+    from forest_export import load_forest
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import artifacts
+
+    parser = argparse.ArgumentParser(description="비만 등급 일괄 진단")
+    parser.add_argument("input", help="입력 CSV/Parquet (인코딩된 18개 컬럼 또는 원본 응답)")
+    parser.add_argument("-o", "--output", required=True, help="결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    parser.add_argument("--forest-dir", default=str(artifacts.locate("obesity_forest")))
+    parser.add_argument("--model", default=str(artifacts.locate("obesity_model")))
+    args = parser.parse_args()
+
+    model = load_forest(args.forest_dir, args.model, schema_path=SCHEMA_PATH)
+    t0 = time.perf_counter()
+    n = score_file(model, args.input, args.output, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - t0
+    print(f"{n:,}행 진단 완료 ({elapsed:.2f}초, {n / max(elapsed, 1e-9):,.0f}행/초) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+설문 응답 -> 모델 입력 배열 변환기.
+
+feature_schema.json 에 필드별 변환 규칙(원본 데이터 값 map, 앱 선택지 labels, MTRANS one-hot)을 적어 두고,
+FeatureEncoder 가 이를 조회표로 컴파일해 쓴다. 학습(make_pkl)과 서빙(app, batch_score)이
+같은 스키마를 쓰고 모델 옆(obesity_forest/encoder.json)에 함께 저장하므로 컬럼 순서가 항상 모델과 같다.
+
+- encode_one: 응답 dict 한 건 -> (1, 특성 수) 배열 (DataFrame 생성 없음)
+- encode_batch: 표(DataFrame 또는 컬럼 dict) -> (행 수, 특성 수) 배열 (컬럼 단위 변환)
+"""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+SCHEMA_PATH = Path(__file__).resolve().parent / "feature_schema.json"
+SCHEMA_VERSION = 1
+
+
+class FeatureEncoder:
+    def __init__(self, schema: dict):
+        if schema.get("version") != SCHEMA_VERSION:
+            raise ValueError(f"지원하지 않는 스키마 버전입니다: {schema.get('version')}")
+        self.schema = schema
+        self.target = schema.get("target")
+
+        # 컴파일: 필드마다 (이름, 첫 번째 열 번호, 문자열 -> 값/열 조회표, one-hot 열 이름들)
+        self.feature_names = []
+        self.feature_fields = []  # 특성마다 원래 필드 이름 (MTRANS_* -> MTRANS)
+        self.titles = {}          # 필드 이름 -> 화면 표시 이름
+        self._fields = []
+        for field in schema["fields"]:
+            name = field["name"]
+            start = len(self.feature_names)
+            self.titles[name] = field.get("title", name)
+            if "onehot" in field:
+                columns = list(field["onehot"].values())
+                slot = {raw: start + columns.index(col) for raw, col in field["onehot"].items()}
+                for label, raw in field.get("labels", {}).items():
+                    slot[label] = slot[raw]
+                self.feature_names.extend(columns)
+                self.feature_fields.extend([name] * len(columns))
+                self._fields.append((name, start, slot, columns))
+            else:
+                lookup = {k: float(v) for k, v in field.get("map", {}).items()}
+                lookup.update({k: float(v) for k, v in field.get("labels", {}).items()})
+                self.feature_names.append(name)
+                self.feature_fields.append(name)
+                self._fields.append((name, start, lookup, None))
+        self.n_features = len(self.feature_names)
+
+    @classmethod
+    def load(cls, path=SCHEMA_PATH) -> "FeatureEncoder":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def save(self, path) -> None:
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**self.schema, "feature_names": self.feature_names}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    # ----- 앱 화면용 -----
+    def labels(self, name: str) -> list:
+        """필드의 앱 선택지 (스키마에 적힌 순서)"""
+        for field in self.schema["fields"]:
+            if field["name"] == name:
+                return list(field.get("labels", {}))
+        raise KeyError(name)
+
+    # ----- 한 건 -----
+    def encode_one(self, answers: dict) -> np.ndarray:
+        """
+        응답 dict -> (1, 특성 수) 배열.
+        값은 숫자(그대로 사용) 또는 원본 값/앱 선택지 문자열. MTRANS 대신 one-hot 열을 직접 줘도 된다.
+        """
+        row = [0.0] * self.n_features
+        for name, start, lookup, columns in self._fields:
+            if columns is not None:
+                if name in answers:
+                    row[self._lookup(lookup, name, answers[name])] = 1.0
+                else:
+                    for j, col in enumerate(columns):
+                        row[start + j] = float(answers[col])
+                continue
+
+            value = answers[name]
+            if isinstance(value, (int, float, np.number)):
+                row[start] = float(value)
+            else:
+                row[start] = self._lookup(lookup, name, value)
+        return np.array([row], dtype=np.float64)
+
+    @staticmethod
+    def _lookup(lookup: dict, name: str, value):
+        key = str(value).strip()
+        if key not in lookup:
+            raise ValueError(f"{name} 에 알 수 없는 값입니다: {value!r}")
+        return lookup[key]
+
+    # ----- 여러 건 -----
+    def encode_batch(self, table) -> np.ndarray:
+        """
+        표 -> (행 수, 특성 수) 배열.
+        인코딩된 열(비만_등급_SMOTE.csv 형식)과 원본 응답 모두 가능. 해석할 수 없는 값은 NaN.
+        """
+        import pandas as pd
+
+        columns = set(table.columns) if hasattr(table, "columns") else set(table)
+        missing = []
+        for name, _, _, onehot in self._fields:
+            if name in columns or (onehot is not None and all(c in columns for c in onehot)):
+                continue
+            missing.append(name)
+        if missing:
+            raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+        n = len(pd.Series(table[next(iter(columns))]))
+        X = np.empty((n, self.n_features), dtype=np.float64)
+        for name, start, lookup, onehot in self._fields:
+            if onehot is not None and name not in columns:
+                for j, col in enumerate(onehot):
+                    X[:, start + j] = pd.to_numeric(pd.Series(table[col]), errors="coerce").to_numpy(np.float64)
+                continue
+
+            text = pd.Series(table[name]).astype("string").str.strip()
+            if onehot is not None:
+                slot = text.map(lookup)
+                X[:, start:start + len(onehot)] = 0.0
+                X[slot.isna().to_numpy(), start:start + len(onehot)] = np.nan
+                ok = slot.notna().to_numpy()
+                X[np.flatnonzero(ok), slot[ok].astype("int64").to_numpy()] = 1.0
+            else:
+                numeric = pd.to_numeric(pd.Series(table[name]), errors="coerce")
+                mapped = pd.to_numeric(text.map(lookup), errors="coerce")
+                X[:, start] = numeric.fillna(mapped).to_numpy(np.float64)
+        return X
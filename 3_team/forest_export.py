@@ -0,0 +1,215 @@
+"""
+RandomForestClassifier -> 연속된 NumPy 노드 배열 (서빙용).
+
+모든 트리의 노드를 한 줄로 이어 붙여 .npy 파일로 저장하고,
+예측할 때는 np.load(mmap_mode='r') 로 열어 sklearn/joblib 없이 트리를 따라 내려간다.
+여러 프로세스가 같은 파일을 열면 OS 페이지 캐시를 함께 쓰므로 메모리도 한 벌만 든다.
+
+    feature[n]    분기 특성 번호 (리프는 -1)
+    threshold[n]  분기 기준값 (x <= threshold 이면 왼쪽)
+    left/right[n] 자식 노드의 전체 배열 기준 번호 (리프는 -1)
+    value[n, k]   노드의 클래스 비율 (리프 = 예측 분포)
+    cover[n]      노드에 도달한 학습 표본 가중치 합
+    roots[t]      t번째 트리의 루트 노드 번호
+
+입력 변환 규칙(feature_encoder)은 같은 폴더의 encoder.json 에 함께 저장한다.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from feature_encoder import FeatureEncoder
+
+FORMAT_VERSION = 1
+ARRAYS = ["feature", "threshold", "left", "right", "value", "cover", "roots"]
+META_NAME = "meta.json"
+ENCODER_NAME = "encoder.json"
+
+
+def file_sha1(path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def flatten_forest(model) -> dict:
+    """학습된 RandomForestClassifier -> 이어 붙인 노드 배열 dict"""
+    parts = {name: [] for name in ARRAYS}
+    offset = 0
+    max_depth = 0
+    for est in model.estimators_:
+        tree = est.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left < 0
+
+        value = tree.value[:, 0, :].astype(np.float64)
+        value /= value.sum(axis=1, keepdims=True)  # 버전에 따라 개수/비율이 섞여 있어 비율로 통일
+
+        parts["feature"].append(np.where(is_leaf, -1, tree.feature).astype(np.int32))
+        parts["threshold"].append(np.where(is_leaf, 0.0, tree.threshold).astype(np.float64))
+        parts["left"].append(np.where(is_leaf, -1, tree.children_left + offset).astype(np.int32))
+        parts["right"].append(np.where(is_leaf, -1, tree.children_right + offset).astype(np.int32))
+        parts["value"].append(value.astype(np.float32))
+        parts["cover"].append(tree.weighted_n_node_samples.astype(np.float32))
+        parts["roots"].append(np.array([offset], dtype=np.int32))
+
+        offset += n
+        max_depth = max(max_depth, int(tree.max_depth))
+
+    arrays = {name: np.concatenate(chunks) for name, chunks in parts.items()}
+    arrays["max_depth"] = max_depth
+    return arrays
+
+
+def _save_encoder(encoder: FeatureEncoder, out_dir: Path, feature_names) -> None:
+    if feature_names is not None and list(feature_names) != encoder.feature_names:
+        raise ValueError("스키마의 컬럼 순서가 모델의 학습 컬럼 순서와 다릅니다.")
+    encoder.save(out_dir / ENCODER_NAME)
+
+
+def export_forest(model, out_dir, source_path=None, encoder: FeatureEncoder = None) -> Path:
+    """
+    모델을 out_dir 에 .npy 배열 + meta.json 으로 저장.
+    source_path(pkl) 를 주면 그 해시를 기록해 두고, 나중에 pkl 이 바뀌었는지 확인하는 데 쓴다.
+    encoder 를 주면 컬럼 순서가 모델과 같은지 확인하고 encoder.json 으로 함께 저장.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    arrays = flatten_forest(model)
+    for name in ARRAYS:
+        np.save(out_dir / f"{name}.npy", np.ascontiguousarray(arrays[name]))
+
+    feature_names = getattr(model, "feature_names_in_", None)
+    if encoder is not None:
+        _save_encoder(encoder, out_dir, feature_names)
+    meta = {
+        "version": FORMAT_VERSION,
+        "classes": np.asarray(model.classes_).tolist(),
+        "feature_names": None if feature_names is None else [str(c) for c in feature_names],
+        "n_features": int(model.n_features_in_),
+        "n_trees": len(model.estimators_),
+        "n_nodes": int(len(arrays["feature"])),
+        "max_depth": arrays["max_depth"],
+        "source_sha1": None if source_path is None else file_sha1(source_path),
+    }
+    # meta.json 을 마지막에 교체해서, 쓰다 만 배열을 읽는 일이 없도록
+    tmp = out_dir / (META_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, out_dir / META_NAME)
+    return out_dir
+
+
+class ForestPredictor:
+    """
+    내보낸 노드 배열로 예측하는 가벼운 예측기.
+    predict / predict_proba 는 RandomForestClassifier 와 같은 결과를 낸다.
+    """
+
+    def __init__(self, arrays: dict, meta: dict, encoder: FeatureEncoder = None):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.cover = arrays["cover"]
+        self.roots = arrays["roots"]
+
+        self.meta = meta
+        self.classes_ = np.asarray(meta["classes"])
+        self.feature_names = meta["feature_names"]
+        self.n_features = meta["n_features"]
+        self.max_depth = meta["max_depth"]
+        self.encoder = encoder
+
+    @classmethod
+    def load(cls, forest_dir, mmap: bool = True) -> "ForestPredictor":
+        forest_dir = Path(forest_dir)
+        with open(forest_dir / META_NAME, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 포맷 버전입니다: {meta.get('version')}")
+
+        mode = "r" if mmap else None
+        arrays = {name: np.load(forest_dir / f"{name}.npy", mmap_mode=mode) for name in ARRAYS}
+        encoder = FeatureEncoder.load(forest_dir / ENCODER_NAME) if (forest_dir / ENCODER_NAME).exists() else None
+        return cls(arrays, meta, encoder)
+
+    def _to_array(self, X) -> np.ndarray:
+        if hasattr(X, "columns"):
+            # DataFrame 은 학습 때 컬럼 순서로 맞춤
+            X = X[self.feature_names] if self.feature_names else X
+            X = X.to_numpy()
+        # sklearn 트리와 같은 비교가 되도록 float32 로 변환 후 비교
+        X = np.asarray(X, dtype=np.float32)
+        X = X.reshape(1, -1) if X.ndim == 1 else X
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"특성 수가 다릅니다: {X.shape[1]} (필요: {self.n_features})")
+        return X
+
+    def apply(self, X) -> np.ndarray:
+        """
+        (표본 수, 트리 수) 도착한 리프 노드 번호.
+        모든 (표본, 트리) 경로를 한꺼번에 한 층씩 내려가고, 리프에 닿은 경로는 다음 층에서 뺀다.
+        """
+        X = self._to_array(X)
+        n, n_trees = len(X), len(self.roots)
+        x_flat = X.ravel()
+
+        node = np.tile(self.roots, n)
+        offset = np.repeat(np.arange(n) * X.shape[1], n_trees)
+        active = np.flatnonzero(self.feature[node] >= 0)
+        while active.size:
+            nd = node[active]
+            go_left = x_flat[offset[active] + self.feature[nd]] <= self.threshold[nd]
+            nd = np.where(go_left, self.left[nd], self.right[nd])
+            node[active] = nd
+            active = active[self.feature[nd] >= 0]
+        return node.reshape(n, n_trees)
+
+    def predict_proba(self, X) -> np.ndarray:
+        leaves = self.apply(X)
+        return self.value[leaves].astype(np.float64).mean(axis=1)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def validate(predictor: ForestPredictor, model, X, atol: float = 1e-6) -> bool:
+    """내보낸 예측기와 원래 모델의 확률이 같은지 확인"""
+    expected = model.predict_proba(X)
+    return bool(np.allclose(predictor.predict_proba(X), expected, atol=atol))
+
+
+def load_forest(forest_dir, model_path, schema_path=None, mmap: bool = True):
+    """
+    예측기 로드.
+    - forest_dir 의 배열이 model_path(pkl) 와 같은 모델에서 나왔으면 ForestPredictor 를 바로 반환
+    - pkl 이 없으면 내보낸 배열을 그대로 사용
+    - 배열이 없거나 pkl 이 바뀌었으면 pkl 을 불러와 다시 내보낸 뒤 반환
+    - schema_path 를 주면 encoder.json 이 없을 때 스키마로 만들어 함께 저장
+    """
+    forest_dir = Path(forest_dir)
+    meta_path = forest_dir / META_NAME
+    if meta_path.exists():
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if not os.path.exists(model_path) or (
+            meta.get("version") == FORMAT_VERSION and meta.get("source_sha1") == file_sha1(model_path)
+        ):
+            if schema_path is not None and not (forest_dir / ENCODER_NAME).exists():
+                _save_encoder(FeatureEncoder.load(schema_path), forest_dir, meta.get("feature_names"))
+            return ForestPredictor.load(forest_dir, mmap=mmap)
+
+    # joblib/sklearn 은 다시 내보낼 때만 import
+    import joblib
+
+    encoder = None if schema_path is None else FeatureEncoder.load(schema_path)
+    export_forest(joblib.load(model_path), forest_dir, source_path=model_path, encoder=encoder)
+    return ForestPredictor.load(forest_dir, mmap=mmap)
@@ -2,30 +2,43 @@ import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
+import sys
 
-# 1. 파일 경로 설정 (사용자분이 알려주신 경로 기준)
-base_path = r'C:\Users\USER\Desktop\AI 데이터 분석 4\workspace\project'
-csv_path = os.path.join(base_path, '비만_등급_SMOTE.csv')
-model_save_path = os.path.join(base_path, 'obesity_model.pkl')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import artifacts
+from feature_encoder import FeatureEncoder
+from forest_export import export_forest
+
+# 1. 파일 경로 설정 (artifacts.json 레지스트리 기준, ARTIFACT_ROOT 로 루트 변경 가능)
+csv_path = artifacts.locate('obesity_smote')
+model_save_path = artifacts.locate('obesity_model')
+forest_save_dir = artifacts.locate('obesity_forest')
 
 print(f"📂 데이터 읽는 중: {csv_path}")
 
 # 2. 데이터 로드 및 학습
 try:
-    df = pd.read_csv(csv_path)
-    X = df.drop(columns=['NObeyesdad'])
-    y = df['NObeyesdad']
+    df = artifacts.load('obesity_smote')  # smote.py 의 기본 출력, 레지스트리의 sha1 과 내용 확인
+    # 컬럼 순서는 앱/일괄 진단과 같은 스키마(feature_schema.json) 기준
+    encoder = FeatureEncoder.load()
+    X = df[encoder.feature_names]
+    y = df[encoder.target]
     
     # 모델 학습 (Random Forest)
     print("🤖 AI 모델 학습 시작... (잠시만 기다려주세요)")
-    rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
+    rf_model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
     rf_model.fit(X, y)
     
     # 3. 모델 저장 (.pkl 파일 생성)
     joblib.dump(rf_model, model_save_path)
+
+    # 서빙용 노드 배열 내보내기 (앱은 이 배열을 mmap 으로 열어 sklearn 없이 예측)
+    export_forest(rf_model, forest_save_dir, source_path=model_save_path, encoder=encoder)
     print("-" * 50)
     print("✅ 성공! 모델 파일이 아래 위치에 저장되었습니다:")
     print(f"👉 {model_save_path}")
+    print(f"👉 {forest_save_dir} (서빙용 노드 배열)")
     print("-" * 50)
     print("이제 터미널에 'streamlit run app.py'를 입력하면 앱이 실행됩니다!")
 
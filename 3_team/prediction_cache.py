@@ -0,0 +1,231 @@
+"""
+비만 진단 예측 결과 캐시.
+
+앱 입력은 나이(정수)를 빼면 모두 정해진 선택지라 같은 응답이 자주 반복된다.
+인코딩된 특성 값 tuple 을 키로 예측값을 LRU(최대 maxsize 건, 선택적으로 ttl 초)로 보관하고,
+자주 나오는 응답 조합은 미리 예측해 둔 파일(precomputed.npz)에서 불러와 고정해 둔다.
+캐시에 없는 행만 모아 한 번에 예측하므로 반복 입력은 트리 탐색을 하지 않는다.
+
+    python 3_team/prediction_cache.py --top 5000    # 원본 데이터에서 자주 나오는 응답 5000개 미리 예측
+    python 3_team/prediction_cache.py --replay obesity_raw              # 응답을 한 건씩 캐시로 예측해 적중률 확인
+    python 3_team/prediction_cache.py --server http://127.0.0.1:8000    # 실행 중인 server.py 의 캐시 지표
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+PRECOMPUTED_NAME = "precomputed.npz"
+
+
+def model_key(model) -> str:
+    """미리 계산한 결과가 같은 모델에서 나왔는지 확인하는 키 (내보낸 포레스트 meta 기준)"""
+    meta = model.meta
+    return json.dumps([meta.get("source_sha1"), meta.get("n_trees"), meta.get("n_nodes")])
+
+
+class PredictionCache:
+    def __init__(self, maxsize: int = 50_000, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lru = OrderedDict()  # 키 -> (값, 저장 시각)
+        self._pinned = {}          # 미리 계산한 값 (만료/삭제 없음)
+        self._lock = threading.Lock()
+        self.hits = self.pinned_hits = self.misses = self.evictions = self.expired = 0
+
+    @staticmethod
+    def key(row) -> tuple:
+        return tuple(float(v) for v in row)
+
+    def get(self, key):
+        """캐시된 값 (없거나 만료되면 None)"""
+        with self._lock:
+            if key in self._pinned:
+                self.pinned_hits += 1
+                return self._pinned[key]
+            item = self._lru.get(key)
+            if item is not None and self.ttl is not None and time.monotonic() - item[1] > self.ttl:
+                del self._lru[key]
+                self.expired += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._lru[key] = (value, time.monotonic())
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+                self.evictions += 1
+
+    def predict(self, X, compute) -> np.ndarray:
+        """
+        행별 예측값. 캐시에 없는 행만 모아 compute(배열) 를 한 번 호출하고 결과를 저장한다.
+        compute 는 model.predict 처럼 (행 수, 특성 수) -> 길이가 행 수인 결과.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        keys = [self.key(row) for row in X]
+        values = [self.get(k) for k in keys]
+        missing = [i for i, v in enumerate(values) if v is None]
+        if missing:
+            computed = compute(X[missing])
+            for i, value in zip(missing, computed):
+                values[i] = value
+                self.put(keys[i], value)
+        return np.asarray(values)
+
+    def load_precomputed(self, path, model, field: str = "values") -> int:
+        """
+        미리 계산한 파일을 고정 항목으로 불러온다. 파일이 없거나 다른 모델의 결과면 0.
+        field: "values"(등급) 또는 "proba"(등급별 확률, 행마다 배열)
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+        with np.load(path) as data:
+            if str(data["model_key"]) != model_key(model) or field not in data:
+                return 0
+            values = data[field]
+            values = list(values) if values.ndim > 1 else values.tolist()
+            pinned = {self.key(row): value for row, value in zip(data["keys"], values)}
+        with self._lock:
+            self._pinned = pinned
+        return len(pinned)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.pinned_hits + self.misses
+            return {
+                "lookups": lookups,
+                "hit_rate": (self.hits + self.pinned_hits) / lookups if lookups else 0.0,
+                "hits": self.hits,
+                "pinned_hits": self.pinned_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "size": len(self._lru),
+                "pinned": len(self._pinned),
+            }
+
+
+def format_metrics(m: dict) -> str:
+    """metrics() 결과 -> 한 줄 요약 (앱/CLI 공용)"""
+    return (f"조회 {m['lookups']:,}건, 적중률 {m['hit_rate']:.1%} "
+            f"(LRU {m['hits']:,} / 고정 {m['pinned_hits']:,} / 미스 {m['misses']:,}), "
+            f"보관 {m['size']:,}건 + 고정 {m['pinned']:,}건, 밀려남 {m['evictions']:,}, 만료 {m['expired']:,}")
+
+
+# ---------------------------------------------------------
+# 자주 나오는 응답 미리 계산
+# ---------------------------------------------------------
+def _snap_to_choices(X: np.ndarray, encoder) -> np.ndarray:
+    """원본 데이터 값을 앱에서 고를 수 있는 값으로 맞춤 (나이는 정수, 나머지는 가장 가까운 선택지, 교통수단은 하나만)"""
+    X = X.copy()
+    for name, start, lookup, onehot in encoder._fields:
+        if onehot is not None:
+            block = X[:, start:start + len(onehot)]
+            X[:, start:start + len(onehot)] = np.eye(len(onehot))[np.argmax(block, axis=1)]
+        elif name == "Age":
+            X[:, start] = np.round(X[:, start])
+        elif encoder.labels(name):
+            choices = np.unique(list(lookup.values()))
+            nearest = np.abs(X[:, start, None] - choices[None, :]).argmin(axis=1)
+            X[:, start] = choices[nearest]
+    return X
+
+
+def common_profiles(df, encoder, top: int) -> tuple:
+    """데이터에서 가장 자주 나오는 응답 조합 top 개 -> (키 배열, 각 조합이 전체에서 차지하는 비율)"""
+    X = encoder.encode_batch(df)
+    X = _snap_to_choices(X[~np.isnan(X).any(axis=1)], encoder)
+    profiles, counts = np.unique(X, axis=0, return_counts=True)
+    order = np.argsort(-counts, kind="stable")[:top]
+    return profiles[order], counts[order] / len(X)
+
+
+def precompute(model, df, out_path, top: int = 5000) -> dict:
+    """자주 나오는 응답 top 개의 등급(values)과 등급별 확률(proba)을 out_path(.npz)에 저장"""
+    keys, share = common_profiles(df, model.encoder, top)
+    proba = model.predict_proba(keys)
+    values = np.asarray(model.classes_)[np.argmax(proba, axis=1)]
+    np.savez(out_path, keys=keys, values=values, proba=proba, model_key=np.array(model_key(model)))
+    return {"profiles": len(keys), "coverage": float(share.sum())}
+
+
+def replay(model, df, cache: "PredictionCache") -> dict:
+    """
+    df 의 응답을 앱 선택지로 맞춘 뒤 한 건씩 cache 로 예측 (앱에 한 명씩 들어오는 상황).
+    cache 의 지표(metrics)를 돌려준다.
+    """
+    X = model.encoder.encode_batch(df)
+    X = _snap_to_choices(X[~np.isnan(X).any(axis=1)], model.encoder)
+    for row in X:
+        cache.predict(row[None, :], model.predict)
+    return cache.metrics()
+
+
+def fetch_server_metrics(url: str, endpoint: str = "obesity", timeout: float = 5.0) -> dict:
+    """실행 중인 server.py 의 /metrics 에서 endpoint 의 예측 캐시 지표 (아직 캐시를 안 만들었으면 None)"""
+    from urllib.request import urlopen
+
+    with urlopen(url.rstrip("/") + "/metrics", timeout=timeout) as resp:
+        payload = json.load(resp)
+    if endpoint not in payload:
+        raise KeyError(f"서버에 {endpoint} 엔드포인트가 없습니다: {', '.join(payload)}")
+    return payload[endpoint].get("cache")
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import artifacts
+    from forest_export import load_forest
+
+    parser = argparse.ArgumentParser(description="자주 나오는 응답 조합 미리 예측 / 예측 캐시 지표")
+    parser.add_argument("--data", default="obesity_raw", help="레지스트리 이름 또는 CSV 경로 (원본 응답)")
+    parser.add_argument("--top", type=int, default=5000, help="미리 계산할 조합 수")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--replay", action="store_true",
+                      help="미리 계산하지 않고 --data 응답을 한 건씩 캐시로 예측해 적중 지표 출력")
+    mode.add_argument("--server", metavar="URL", help="실행 중인 server.py 의 obesity 예측 캐시 지표 출력")
+    parser.add_argument("--maxsize", type=int, default=50_000, help="--replay 의 LRU 크기")
+    args = parser.parse_args()
+
+    if args.server:
+        metrics = fetch_server_metrics(args.server)
+        print(format_metrics(metrics) if metrics else "아직 obesity 예측 요청이 없어 캐시가 만들어지지 않았습니다.")
+        return
+
+    model = load_forest(artifacts.locate("obesity_forest"), artifacts.locate("obesity_model"),
+                        schema_path=artifacts.path("obesity_schema"))
+    if os.path.exists(args.data):
+        import pandas as pd
+
+        df = pd.read_csv(args.data)
+    else:
+        df = artifacts.load(args.data)
+    out_path = artifacts.locate("obesity_forest") / PRECOMPUTED_NAME
+
+    if args.replay:
+        cache = PredictionCache(maxsize=args.maxsize)
+        pinned = cache.load_precomputed(out_path, model)
+        print(f"고정 항목 {pinned:,}개 ({out_path.name})")
+        print(format_metrics(replay(model, df, cache)))
+        return
+
+    result = precompute(model, df, out_path, top=args.top)
+    print(f"{result['profiles']:,}개 조합 저장 (데이터 {result['coverage']:.1%} 포함) -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
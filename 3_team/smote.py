@@ -1,50 +1,193 @@
-import pandas as pd
+"""
+SMOTE 오버샘플링 (메모리 제한 스트리밍 버전).
+
+1) 입력 CSV 를 chunk 단위로 읽어 Height/Weight 를 빼고
+   - 원본 행은 바로 출력 파일(Parquet/CSV)에 이어 쓰고
+   - 특성 값은 클래스별 임시 파일에 나눠 저장한다.
+2) 클래스마다 그 클래스 행만 불러와 최근접 이웃(NearestNeighbors, n_jobs 병렬)을 만들고
+   합성 표본을 chunk 단위로 만들어 이어 쓴다.
+
+한 번에 메모리에 올라가는 것은 입력 한 chunk 또는 한 클래스의 특성 배열뿐이다.
+난수는 imblearn SMOTE(random_state=seed) 와 같은 순서로 뽑기 때문에
+같은 입력·seed 면 기존 SMOTE(random_state=42).fit_resample 과 같은 값을 만든다.
+특성 컬럼은 모든 chunk 에서 float64 로 읽고 쓰므로 (첫 chunk 가 정수여도) 소수 값이 잘리지 않는다.
+
+    python 3_team/smote.py "비만 등급_전처리_최종.csv" --chunk-size 200000   # 출력: 레지스트리 obesity_smote (make_pkl/train_search 가 읽는 파일, sha1 은 로컬 pin)
+    python 3_team/smote.py "비만 등급_전처리_최종.csv" -o 비만_등급_SMOTE.parquet
+"""
+import argparse
+import os
+import sys
+import tempfile
+
 import numpy as np
-from imblearn.over_sampling import SMOTE
-
-# 1. 데이터 로드
-df = pd.read_csv('C:/Users/USER/Desktop/AI 데이터 분석 4/workspace/project/비만 등급_전처리_최종.csv', encoding='utf-8-sig')
-print("원본 데이터 로드 완료")
-print(f"데이터 크기: {df.shape}")
-print()
-
-# 2. X, y 분리
-y = df['NObeyesdad']
-X = df.drop('NObeyesdad', axis=1)
-
-# 3. 특성 제거: Height, Weight 컬럼 삭제
-X = X.drop(['Height', 'Weight'], axis=1)
-print("특성 변수 제거 완료 (Height, Weight 삭제)")
-print()
-
-# 5. SMOTE 적용 전 클래스 개수 확인
-print("=" * 50)
-print("SMOTE 적용 전 NObeyesdad 클래스별 개수")
-print("=" * 50)
-print(y.value_counts().sort_index())
-print()
-
-# 4. SMOTE 적용
-smote = SMOTE(random_state=42)
-X_smote, y_smote = smote.fit_resample(X, y)
-
-# 5. SMOTE 적용 후 클래스 개수 확인
-print("=" * 50)
-print("SMOTE 적용 후 NObeyesdad 클래스별 개수")
-print("=" * 50)
-print(pd.Series(y_smote).value_counts().sort_index())
-print()
-
-# 6. 결과 저장
-# 늘어난 데이터를 하나의 DataFrame으로 합치기
-X_smote_df = pd.DataFrame(X_smote, columns=X.columns)
-y_smote_df = pd.Series(y_smote, name='NObeyesdad')
-result_df = pd.concat([X_smote_df, y_smote_df], axis=1)
-
-# CSV로 저장
-result_df.to_csv('비만_등급_SMOTE.csv', index=False, encoding='utf-8-sig')
-print("=" * 50)
-print("SMOTE 처리된 데이터 저장 완료")
-print("=" * 50)
-print(f"저장 파일: 비만_등급_SMOTE.csv")
-print(f"저장된 데이터 크기: {result_df.shape}")
+import pandas as pd
+from sklearn.neighbors import NearestNeighbors
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import artifacts
+
+TARGET = 'NObeyesdad'
+DROP_COLUMNS = ['Height', 'Weight']
+
+
+class _RowWriter:
+    """chunk 단위로 이어 쓰는 출력 (확장자가 .parquet 이면 Parquet, 아니면 CSV)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.parquet = self.path.lower().endswith(".parquet")
+        self._writer = None
+        self._first = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            df.to_csv(self.path, index=False, mode="w" if self._first else "a", header=self._first,
+                      encoding="utf-8-sig" if self._first else "utf-8")
+        self._first = False
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _split_chunks(input_path, chunk_size, drop_columns, writer, spill_dir):
+    """
+    1단계: 입력을 chunk 로 읽어 원본 행은 출력에, 특성 값은 클래스별 임시 파일에 기록.
+    특성 컬럼은 float64 로 읽는다 (chunk 마다 추론한 dtype 이 달라도 값이 잘리지 않도록).
+    반환: (특성 컬럼, 클래스별 행 수)
+    """
+    header = pd.read_csv(input_path, encoding='utf-8-sig', nrows=0).columns
+    columns = [c for c in header if c != TARGET and c not in drop_columns]
+    if TARGET not in header:
+        raise ValueError(f"입력 파일에 {TARGET} 컬럼이 없습니다: {input_path}")
+
+    counts = {}
+    chunks = pd.read_csv(input_path, encoding='utf-8-sig', chunksize=chunk_size,
+                         usecols=columns + [TARGET], dtype={c: np.float64 for c in columns})
+    for chunk in chunks:
+        chunk = chunk[columns + [TARGET]]
+        writer.write(chunk)
+
+        y = chunk[TARGET].to_numpy()
+        X = chunk[columns].to_numpy(dtype=np.float64)
+        for label in np.unique(y):
+            rows = X[y == label]
+            with open(os.path.join(spill_dir, f"class_{label}.bin"), "ab") as f:
+                rows.tofile(f)
+            counts[label] = counts.get(label, 0) + len(rows)
+
+    if not counts:
+        raise ValueError(f"입력 파일이 비어 있습니다: {input_path}")
+    return columns, dict(sorted(counts.items()))
+
+
+def _synthesize_class(X_class, n_samples, k_neighbors, seed, n_jobs, chunk_size):
+    """
+    한 클래스의 합성 표본을 chunk 단위로 생성 (generator).
+    imblearn SMOTE 와 같은 방식: 클래스마다 RandomState(seed) 로
+    (기준 행, 이웃 번호) 와 보간 비율을 뽑고 x + u * (이웃 - x).
+    """
+    nn = NearestNeighbors(n_neighbors=k_neighbors + 1, n_jobs=n_jobs).fit(X_class)
+
+    random_state = np.random.RandomState(seed)
+    samples_indices = random_state.randint(low=0, high=len(X_class) * k_neighbors, size=n_samples)
+    steps = random_state.uniform(size=n_samples)[:, np.newaxis]
+    rows = np.floor_divide(samples_indices, k_neighbors)
+    cols = np.mod(samples_indices, k_neighbors)
+
+    for start in range(0, n_samples, chunk_size):
+        part = slice(start, start + chunk_size)
+        base = rows[part]
+        # 이번 chunk 에 필요한 기준 행만 이웃 검색 (자기 자신인 첫 번째 이웃 제외)
+        query, inverse = np.unique(base, return_inverse=True)
+        nns = nn.kneighbors(X_class[query], return_distance=False)[:, 1:]
+        neighbor = nns[inverse, cols[part]]
+        yield X_class[base] + steps[part] * (X_class[neighbor] - X_class[base])
+
+
+def smote_stream(input_path, output_path, chunk_size: int = 100_000, k_neighbors: int = 5,
+                 seed: int = 42, n_jobs: int = -1, drop_columns=DROP_COLUMNS) -> dict:
+    """
+    입력 CSV -> 클래스 균형을 맞춘 출력 파일 (원본 행 뒤에 클래스 순서대로 합성 행).
+    반환: {'before': 클래스별 행 수, 'after': 클래스별 행 수, 'n_columns': 출력 컬럼 수}
+    """
+    writer = _RowWriter(output_path)
+    try:
+        with tempfile.TemporaryDirectory(prefix="smote_") as spill_dir:
+            columns, counts = _split_chunks(
+                input_path, chunk_size, drop_columns, writer, spill_dir
+            )
+            target = max(counts.values())
+
+            for label, count in counts.items():
+                n_samples = target - count
+                if n_samples == 0:
+                    continue
+                if count <= k_neighbors:
+                    raise ValueError(f"클래스 {label} 의 행 수({count})가 k_neighbors({k_neighbors})보다 적습니다.")
+
+                path = os.path.join(spill_dir, f"class_{label}.bin")
+                X_class = np.fromfile(path, dtype=np.float64).reshape(count, len(columns))
+                for X_new in _synthesize_class(X_class, n_samples, k_neighbors, seed, n_jobs, chunk_size):
+                    part = pd.DataFrame(X_new, columns=columns)
+                    part[TARGET] = np.full(len(part), label)
+                    writer.write(part)
+                del X_class
+                os.remove(path)
+    finally:
+        writer.close()
+
+    return {'before': counts, 'after': {label: target for label in counts}, 'n_columns': len(columns) + 1}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SMOTE 오버샘플링 (chunk 스트리밍)")
+    parser.add_argument("input", help="전처리된 입력 CSV (Height/Weight 포함, 인코딩된 특성 + NObeyesdad)")
+    parser.add_argument("-o", "--output", default=str(artifacts.locate("obesity_smote")),
+                        help="출력 파일 (.parquet 또는 .csv, 기본: 학습이 읽는 레지스트리 obesity_smote)")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="한 번에 읽고/만드는 행 수")
+    parser.add_argument("--k-neighbors", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="이웃 검색 병렬 프로세스 수 (-1: 모든 코어)")
+    args = parser.parse_args()
+
+    print(f"데이터 로드: {args.input} (chunk {args.chunk_size:,}행)")
+    print(f"특성 변수 제거: {', '.join(DROP_COLUMNS)}")
+    print()
+
+    result = smote_stream(args.input, args.output, chunk_size=args.chunk_size, k_neighbors=args.k_neighbors,
+                          seed=args.seed, n_jobs=args.n_jobs)
+
+    print("=" * 50)
+    print("SMOTE 적용 전 NObeyesdad 클래스별 개수")
+    print("=" * 50)
+    print(pd.Series(result['before'], name='count'))
+    print()
+    print("=" * 50)
+    print("SMOTE 적용 후 NObeyesdad 클래스별 개수")
+    print("=" * 50)
+    print(pd.Series(result['after'], name='count'))
+    print()
+    print("=" * 50)
+    print("SMOTE 처리된 데이터 저장 완료")
+    print("=" * 50)
+    print(f"저장 파일: {args.output}")
+    print(f"저장된 데이터 크기: ({sum(result['after'].values())}, {result['n_columns']})")
+    if os.path.abspath(args.output) == os.path.abspath(artifacts.locate("obesity_smote")):
+        # 학습(make_pkl, train_search)이 확인하는 sha1 을 로컬 pin(artifacts.local.json)으로 갱신
+        print(f"로컬 sha1 기록: obesity_smote -> {artifacts.pin('obesity_smote')[:12]}")
+        print("  (저장소 레지스트리에 반영하려면: python artifacts.py --pin obesity_smote)")
+
+
+if __name__ == "__main__":
+    main()
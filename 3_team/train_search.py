@@ -0,0 +1,200 @@
+"""
+비만 등급 랜덤 포레스트 학습 드라이버.
+
+1) 탐색: (max_depth, max_features) 조합 × CV fold 를 모든 코어에 나눠 학습.
+   각 작업은 warm_start 로 트리를 25 -> 50 -> 100 ... 개로 늘려 가며 크기별 정확도를 한 번에 잰다.
+   결과는 설정별 정확도(평균/표준편차) · 학습 시간 · 노드 수 · 서빙 배열 크기 표로 출력하고,
+   --min-accuracy 를 만족하는 가장 작은 모델을 고른다.
+2) 재학습: --refit 이면 고른 설정으로 전체 데이터 학습 후 pkl + 서빙 배열(obesity_forest/) 저장.
+3) 트리 추가: --grow-from 기존 pkl 에 새 데이터가 들어왔을 때 warm_start 로 트리만 더 붙인다.
+
+    python 3_team/train_search.py --min-accuracy 0.85 --refit
+    python 3_team/train_search.py --grow-from 3_team/obesity_model.pkl --new-data 신규.csv --add-trees 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import artifacts
+from feature_encoder import FeatureEncoder
+
+N_ESTIMATORS = [25, 50, 100, 200]
+MAX_DEPTH = [None, 20, 15, 10]
+MAX_FEATURES = ['sqrt', 0.33, 0.5]
+
+
+def load_training_data(path, encoder: FeatureEncoder = None):
+    """학습 데이터(CSV/Parquet) -> (X, y). 컬럼 순서는 feature_schema.json 기준"""
+    encoder = encoder or FeatureEncoder.load()
+    df = pd.read_parquet(path) if str(path).lower().endswith(".parquet") else pd.read_csv(path)
+    return df[encoder.feature_names], df[encoder.target]
+
+
+def serving_bytes(model) -> int:
+    """서빙 배열(forest_export) 크기: 노드마다 feature/left/right/roots(int32), threshold(f64), value+cover(f32)"""
+    n_nodes = sum(est.tree_.node_count for est in model.estimators_)
+    n_classes = len(model.classes_)
+    return n_nodes * (4 * 3 + 8 + 4 * (n_classes + 1)) + 4 * len(model.estimators_)
+
+
+def _grow_and_score(params, n_estimators, X_train, y_train, X_test, y_test, seed):
+    """
+    (작업자) 한 설정·한 fold: warm_start 로 트리 수를 늘려 가며 크기별 정확도/누적 학습 시간 기록.
+    """
+    model = RandomForestClassifier(warm_start=True, random_state=seed, n_jobs=1, **params)
+    rows = []
+    fit_time = 0.0
+    for n in sorted(n_estimators):
+        model.set_params(n_estimators=n)
+        t0 = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time += time.perf_counter() - t0
+        rows.append({
+            **params,
+            "n_estimators": n,
+            "accuracy": float(np.mean(model.predict(X_test) == y_test)),
+            "fit_time_s": fit_time,
+            "n_nodes": sum(est.tree_.node_count for est in model.estimators_),
+            "size_mb": serving_bytes(model) / 1024 / 1024,
+        })
+    return rows
+
+
+def search(X, y, n_estimators=N_ESTIMATORS, max_depth=MAX_DEPTH, max_features=MAX_FEATURES,
+           cv: int = 5, n_jobs: int = -1, seed: int = 42) -> pd.DataFrame:
+    """
+    교차검증 탐색 결과 (설정별 평균). (max_depth, max_features) × fold 작업을 병렬 실행하고,
+    트리 수는 각 작업 안에서 warm_start 로 늘려 가며 잰다.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed).split(X, y))
+
+    tasks = [
+        delayed(_grow_and_score)(
+            {"max_depth": depth, "max_features": feats}, n_estimators,
+            X[train], y[train], X[test], y[test], seed,
+        )
+        for depth in max_depth for feats in max_features for train, test in folds
+    ]
+    rows = [row for result in Parallel(n_jobs=n_jobs)(tasks) for row in result]
+
+    df = pd.DataFrame(rows)
+    keys = ["n_estimators", "max_depth", "max_features"]
+    summary = (
+        df.assign(max_depth=df["max_depth"].map(lambda d: "None" if pd.isna(d) else int(d)),
+                  max_features=df["max_features"].map(str))
+          .groupby(keys, sort=False)
+          .agg(accuracy=("accuracy", "mean"), accuracy_std=("accuracy", "std"),
+               fit_time_s=("fit_time_s", "mean"), n_nodes=("n_nodes", "mean"), size_mb=("size_mb", "mean"))
+          .reset_index()
+    )
+    return summary.sort_values(["size_mb", "accuracy"], ascending=[True, False]).reset_index(drop=True)
+
+
+def pick_smallest(summary: pd.DataFrame, min_accuracy: float) -> pd.Series:
+    """정확도 기준을 넘는 설정 중 서빙 배열이 가장 작은 것 (없으면 정확도가 가장 높은 것)"""
+    ok = summary[summary["accuracy"] >= min_accuracy]
+    if ok.empty:
+        return summary.loc[summary["accuracy"].idxmax()]
+    return ok.sort_values(["size_mb", "fit_time_s"]).iloc[0]
+
+
+def to_params(row: pd.Series) -> dict:
+    depth = row["max_depth"]
+    feats = row["max_features"]
+    return {
+        "n_estimators": int(row["n_estimators"]),
+        "max_depth": None if depth in (None, "None") else int(depth),
+        "max_features": feats if feats in ("sqrt", "log2") else float(feats),
+    }
+
+
+def grow_forest(model: RandomForestClassifier, X, y, add_trees: int) -> RandomForestClassifier:
+    """
+    기존 포레스트에 트리 add_trees 개를 더 학습해 붙인다 (기존 트리는 그대로).
+    새로 들어온 데이터를 포함한 X, y 로 호출하면 추가되는 트리만 새 데이터를 반영한다.
+    """
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + add_trees)
+    model.fit(X, y)
+    return model
+
+
+def save_model(model, model_path, forest_dir, encoder: FeatureEncoder) -> None:
+    """pkl + 서빙 배열 저장 (make_pkl.py 와 같은 산출물)"""
+    import joblib
+
+    from forest_export import export_forest
+
+    joblib.dump(model, model_path)
+    export_forest(model, forest_dir, source_path=model_path, encoder=encoder)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비만 등급 랜덤 포레스트 탐색/재학습")
+    parser.add_argument("--data", default="obesity_smote",
+                        help="학습 데이터: 레지스트리 이름 또는 CSV/Parquet 경로 (기본: smote.py 의 기본 출력)")
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="병렬 작업 수 (-1: 모든 코어)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-accuracy", type=float, default=0.85, help="모델 선택 기준 정확도")
+    parser.add_argument("--report", help="탐색 결과 표 저장 (.csv)")
+    parser.add_argument("--refit", action="store_true", help="고른 설정으로 전체 데이터 학습 후 저장")
+    parser.add_argument("--model", default=str(artifacts.locate("obesity_model")))
+    parser.add_argument("--forest-dir", default=str(artifacts.locate("obesity_forest")))
+    parser.add_argument("--grow-from", help="트리를 추가할 기존 모델(pkl)")
+    parser.add_argument("--new-data", help="--grow-from 과 함께: 새로 들어온 데이터 (CSV/Parquet)")
+    parser.add_argument("--add-trees", type=int, default=50)
+    args = parser.parse_args()
+
+    encoder = FeatureEncoder.load()
+    data_path = args.data if os.path.exists(args.data) else artifacts.path(args.data)  # 레지스트리 sha1 확인
+    X, y = load_training_data(data_path, encoder)
+
+    if args.grow_from:
+        import joblib
+
+        if args.new_data:
+            X_new, y_new = load_training_data(args.new_data, encoder)
+            X, y = pd.concat([X, X_new], ignore_index=True), pd.concat([y, y_new], ignore_index=True)
+        model = joblib.load(args.grow_from)
+        before = len(model.estimators_)
+        t0 = time.perf_counter()
+        model = grow_forest(model, X, y, args.add_trees)
+        print(f"트리 {before} -> {len(model.estimators_)}개 ({time.perf_counter() - t0:.1f}초, 데이터 {len(X):,}행)")
+        save_model(model, args.model, args.forest_dir, encoder)
+        print(f"저장: {args.model}, {args.forest_dir}")
+        return
+
+    t0 = time.perf_counter()
+    summary = search(X, y, cv=args.cv, n_jobs=args.n_jobs, seed=args.seed)
+    print(f"탐색 완료: 설정 {len(summary)}개 × {args.cv} fold ({time.perf_counter() - t0:.1f}초)")
+    with pd.option_context("display.width", 200, "display.max_rows", 200):
+        print(summary.round(4).to_string(index=False))
+    if args.report:
+        summary.to_csv(args.report, index=False, encoding="utf-8-sig")
+
+    best = pick_smallest(summary, args.min_accuracy)
+    params = to_params(best)
+    print("-" * 50)
+    print(f"선택 (정확도 >= {args.min_accuracy}): {params} "
+          f"accuracy={best['accuracy']:.4f}, size={best['size_mb']:.2f}MB")
+
+    if args.refit:
+        model = RandomForestClassifier(random_state=args.seed, n_jobs=args.n_jobs, **params).fit(X, y)
+        model.set_params(n_jobs=None)
+        save_model(model, args.model, args.forest_dir, encoder)
+        print(f"저장: {args.model}, {args.forest_dir}")
+
+
+if __name__ == "__main__":
+    main()
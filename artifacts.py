@@ -0,0 +1,245 @@
+"""
+데이터셋/모델 파일 레지스트리.
+
+artifacts.json 에 이름과 버전별로 파일 위치(루트 기준 상대 경로)와 sha1 을 적어 두고,
+스크립트·노트북·앱은 절대 경로 대신 이름으로 찾는다.
+
+- 루트: 환경 변수 ARTIFACT_ROOT (없으면 이 파일이 있는 저장소 폴더)
+- 레지스트리 파일: 환경 변수 ARTIFACT_REGISTRY (없으면 <저장소>/artifacts.json)
+- 이름은 "obesity_smote" 또는 "obesity_smote@1" (버전을 빼면 default 버전)
+- sha1 이 적힌 항목은 읽기 전에 내용 해시를 확인한다 (파일 크기/수정 시각이 같으면 다시 계산하지 않음)
+- sha1 이 null 인 항목(폴더, 계속 바뀌는 파일, 로컬에서 만드는 산출물)은 "note" 에 고정하지 않는 이유와 대신 하는 확인을 적는다
+- load() 로 읽은 객체는 프로세스 전체 캐시에 두고 같은 파일이면 다시 읽지 않는다
+- 전처리/학습 스크립트가 산출물을 만든 뒤 부르는 pin() 은 추적되지 않는 로컬 파일(artifacts.local.json,
+  환경 변수 ARTIFACT_LOCAL_REGISTRY)에 sha1 을 기록하고, 이 값이 레지스트리의 sha1 보다 우선한다.
+  저장소의 artifacts.json 은 CLI 의 --pin 으로만 바꾼다
+
+    python artifacts.py                   # 등록된 항목과 상태(ok/missing/mismatch) 출력
+    python artifacts.py --pin obesity_smote  # 현재 파일의 sha1 을 저장소 레지스트리(artifacts.json)에 기록
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+REGISTRY_VERSION = 1
+
+_lock = threading.Lock()
+_registry = None
+_local = None  # 로컬 pin {"이름@버전": sha1}
+_hashes = {}   # 경로 -> (크기, 수정 시각, sha1)
+_objects = {}  # (이름, 버전, 로더, 파일 서명) -> 읽은 객체
+
+
+def root() -> Path:
+    return Path(os.environ.get("ARTIFACT_ROOT") or REPO_ROOT)
+
+
+def registry_path() -> Path:
+    return Path(os.environ.get("ARTIFACT_REGISTRY") or REPO_ROOT / "artifacts.json")
+
+
+def local_registry_path() -> Path:
+    return Path(os.environ.get("ARTIFACT_LOCAL_REGISTRY") or registry_path().with_name("artifacts.local.json"))
+
+
+def _local_pins() -> dict:
+    global _local
+    with _lock:
+        if _local is None:
+            try:
+                with open(local_registry_path(), "r", encoding="utf-8") as f:
+                    _local = json.load(f).get("pins", {})
+            except FileNotFoundError:
+                _local = {}
+        return _local
+
+
+def registry(reload: bool = False) -> dict:
+    """artifacts.json 내용 (프로세스에서 한 번만 읽음)"""
+    global _registry, _local
+    with _lock:
+        if reload:
+            _local = None
+        if _registry is None or reload:
+            with open(registry_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != REGISTRY_VERSION:
+                raise ValueError(f"지원하지 않는 레지스트리 버전입니다: {data.get('version')}")
+            _registry = data
+        return _registry
+
+
+def _entry(name: str) -> tuple:
+    """'이름[@버전]' -> (이름, 버전, 항목 dict)"""
+    name, _, version = name.partition("@")
+    artifacts = registry()["artifacts"]
+    if name not in artifacts:
+        raise KeyError(f"등록되지 않은 항목입니다: {name}")
+    spec = artifacts[name]
+    version = version or spec["default"]
+    if version not in spec["versions"]:
+        raise KeyError(f"{name} 에 버전 {version} 이 없습니다 (있는 버전: {', '.join(spec['versions'])})")
+    entry = {"kind": spec.get("kind"), **spec["versions"][version]}
+    local = _local_pins().get(f"{name}@{version}")
+    if local:
+        entry.update(sha1=local, local_pin=True)
+    return name, version, entry
+
+
+def locate(name: str) -> Path:
+    """이름 -> 경로 (존재/해시 확인 없음, 출력 파일 위치를 정할 때 사용)"""
+    return root() / _entry(name)[2]["path"]
+
+
+def file_sha1(path) -> str:
+    """파일 sha1. 크기와 수정 시각이 그대로면 이전에 계산한 값을 쓴다"""
+    path = Path(path)
+    stat = path.stat()
+    key = str(path.resolve())
+    cached = _hashes.get(key)
+    if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    _hashes[key] = (stat.st_size, stat.st_mtime_ns, h.hexdigest())
+    return h.hexdigest()
+
+
+def path(name: str, verify: bool = True) -> Path:
+    """
+    이름 -> 확인된 경로.
+    파일이 없으면 FileNotFoundError, 레지스트리의 sha1 과 내용이 다르면 ValueError.
+    """
+    name, version, entry = _entry(name)
+    target = root() / entry["path"]
+    if not target.exists():
+        raise FileNotFoundError(f"{name}@{version} 파일이 없습니다: {target}")
+    expected = entry.get("sha1")
+    if verify and expected and target.is_file():
+        actual = file_sha1(target)
+        if actual != expected:
+            raise ValueError(f"{name}@{version} 내용이 레지스트리와 다릅니다: {target} (sha1 {actual[:12]} != {expected[:12]})")
+    return target
+
+
+# ----- 로더 (항목의 "loader" 이름 -> 함수, 무거운 라이브러리는 호출할 때 import) -----
+def _read_csv(p):
+    import pandas as pd
+
+    return pd.read_csv(p, encoding="utf-8-sig")
+
+
+def _read_json(p):
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_joblib(p):
+    import joblib
+
+    return joblib.load(p)
+
+
+LOADERS = {"csv": _read_csv, "json": _read_json, "joblib": _read_joblib}
+
+
+def load(name: str, loader=None):
+    """
+    이름 -> 읽은 객체 (프로세스 전체 캐시).
+    loader 를 주지 않으면 항목의 "loader" 를 쓴다. 파일이 바뀌면(크기/수정 시각) 다시 읽는다.
+    """
+    name, version, entry = _entry(name)
+    target = path(f"{name}@{version}")
+    if loader is None:
+        if entry.get("loader") not in LOADERS:
+            raise ValueError(f"{name}@{version} 에 로더가 지정되지 않았습니다.")
+        loader = LOADERS[entry["loader"]]
+
+    stat = target.stat()
+    key = (name, version, loader, stat.st_size, stat.st_mtime_ns)
+    if key not in _objects:
+        obj = loader(target)
+        with _lock:
+            # 같은 항목의 예전 파일로 읽은 객체는 버림
+            for old in [k for k in _objects if k[:3] == key[:3]]:
+                del _objects[old]
+            _objects.setdefault(key, obj)
+    return _objects[key]
+
+
+def _write_json(target: Path, data: dict) -> None:
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, target)
+
+
+def pin(name: str, shared: bool = False) -> str:
+    """
+    현재 파일의 sha1 을 기록 (학습/전처리 작업이 산출물을 만든 뒤 호출).
+    기본은 로컬 파일(artifacts.local.json), shared=True 이면 저장소의 artifacts.json.
+    """
+    name, version, _ = _entry(name)
+    digest = file_sha1(path(f"{name}@{version}", verify=False))
+    data = registry()
+    pins = _local_pins()
+    ref = f"{name}@{version}"
+    with _lock:
+        if shared:
+            data["artifacts"][name]["versions"][version]["sha1"] = digest
+            _write_json(registry_path(), data)
+            if pins.pop(ref, None) is None:
+                return digest
+        else:
+            pins[ref] = digest
+        _write_json(local_registry_path(), {"version": REGISTRY_VERSION, "pins": pins})
+    return digest
+
+
+def status() -> list:
+    """[(이름@버전, 종류, 경로, 상태)] 상태: ok / ok (local) / unpinned / missing / mismatch"""
+    rows = []
+    for name, spec in registry()["artifacts"].items():
+        for version in spec["versions"]:
+            ref = f"{name}@{version}"
+            try:
+                target = path(ref)
+                entry = _entry(ref)[2]
+                state = ("ok (local)" if entry.get("local_pin") else "ok") if entry.get("sha1") else "unpinned"
+            except FileNotFoundError:
+                target, state = locate(ref), "missing"
+            except ValueError:
+                target, state = locate(ref), "mismatch"
+            rows.append((ref, spec.get("kind", ""), str(target), state))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터셋/모델 레지스트리")
+    parser.add_argument("--pin", nargs="+", metavar="NAME", help="현재 파일의 sha1 을 기록할 항목")
+    args = parser.parse_args()
+
+    if args.pin:
+        for name in args.pin:
+            print(f"{name}: {pin(name, shared=True)}")
+        return
+
+    print(f"루트: {root()}")
+    print(f"레지스트리: {registry_path()}")
+    for ref, kind, target, state in status():
+        print(f"{state:10s} {kind:8s} {ref:32s} {target}")
+        note = _entry(ref)[2].get("note")
+        if state == "unpinned" and note:
+            print(f"{'':20s}└ {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+한 건씩 들어오는 예측 요청을 모아 한 번의 predict 로 처리하는 마이크로 배처.
+
+Streamlit 세션(스크립트 실행 스레드)이나 서버 요청이 동시에 predict(X) 를 부르면
+작업 스레드가 최대 max_wait_ms 동안 / max_batch 행까지 요청을 모아 배열로 쌓고
+predict 를 한 번만 호출한 뒤 결과를 요청별로 나눠 돌려준다.
+행마다 독립인 모델(선형 회귀, 랜덤 포레스트)이면 결과는 따로 부른 것과 같다.
+
+    batcher = MicroBatcher(model.predict, max_batch=64, max_wait_ms=2)
+    y = batcher.predict(X_one_row)      # (1, 특성 수) -> 길이 1 결과
+    batcher.metrics()                   # 배치 수, 평균 크기, 채움 비율, 크기 분포
+"""
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    def __init__(self, predict, max_batch: int = 64, max_wait_ms: float = 2.0):
+        self.predict_fn = predict
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.n_features = None     # 처음 들어온 요청의 특성 수 (다른 폭의 요청은 submit 에서 거절)
+
+        # 지표
+        self.batch_sizes = Counter()
+        self.n_batches = 0
+        self.n_rows = 0
+        self.n_retried = 0   # 실패해서 요청별로 다시 예측한 배치 수
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="microbatch", daemon=True)
+                    self._thread.start()
+
+    def submit(self, X) -> Future:
+        """(k, 특성 수) 배열을 대기열에 넣고 결과(길이 k) Future 를 반환"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2:
+            raise ValueError(f"(행 수, 특성 수) 배열이어야 합니다: shape={X.shape}")
+        with self._lock:
+            if self.n_features is None:
+                self.n_features = X.shape[1]
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"특성 수가 {self.n_features}개여야 합니다: {X.shape[1]}개")
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((X, future))
+        return future
+
+    def predict(self, X) -> np.ndarray:
+        return self.submit(X).result()
+
+    def _collect(self) -> list:
+        items = [self._queue.get()]
+        n = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while n < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            items.append(item)
+            n += len(item[0])
+        return items
+
+    def _predict_batch(self, items) -> None:
+        X = items[0][0] if len(items) == 1 else np.vstack([x for x, _ in items])
+        with self._lock:
+            self.batch_sizes[len(X)] += 1
+            self.n_batches += 1
+            self.n_rows += len(X)
+        out = self.predict_fn(X)
+        start = 0
+        for x, future in items:
+            future.set_result(out[start:start + len(x)])
+            start += len(x)
+
+    def _run(self) -> None:
+        while True:
+            items = self._collect()
+            # 작업 스레드는 어떤 오류에도 계속 돈다
+            try:
+                self._predict_batch(items)
+                continue
+            except Exception as e:
+                if len(items) == 1:
+                    items[0][1].set_exception(e)
+                    continue
+            # 묶은 배치가 실패하면 요청별로 다시 예측해서, 실패한 요청의 Future 에만 오류를 전달
+            with self._lock:
+                self.n_retried += 1
+            for item in items:
+                if item[1].done():
+                    continue
+                try:
+                    self._predict_batch([item])
+                except Exception as e:
+                    item[1].set_exception(e)
+
+    def metrics(self) -> dict:
+        """배치 수, 행 수, 평균 배치 크기, 채움 비율(평균 크기 / max_batch), 크기별 배치 수, 다시 나눠 예측한 배치 수"""
+        with self._lock:
+            mean = self.n_rows / self.n_batches if self.n_batches else 0.0
+            return {
+                "batches": self.n_batches,
+                "rows": self.n_rows,
+                "mean_batch": mean,
+                "fill_ratio": mean / self.max_batch,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "batch_sizes": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+                "retried_batches": self.n_retried,
+            }
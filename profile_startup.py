@@ -0,0 +1,174 @@
+"""
+Streamlit 앱 시작 시간 프로파일.
+앱마다 별도 프로세스에서 `python -X importtime` 으로 첫 화면 렌더링(AppTest)을 실행해
+- streamlit 자체 import 시간
+- 앱 스크립트가 불러오는 모듈별 import 시간 (최상위 모듈 기준 누적)
+- 첫 렌더링 시간
+을 표로 출력한다.
+--baseline 에 예전 --json 결과나 git 커밋을 주면 같은 항목을 기준과 비교해 줄어든 시간을 함께 출력한다.
+(커밋을 주면 그 시점의 저장소를 임시 폴더에 풀어 같은 방식으로 측정. .gitignore 된 캐시·모델 파일은 없는 상태)
+
+    python profile_startup.py --profile-startup
+    python profile_startup.py 2_team/app.py --top 15 --json startup.json
+    python profile_startup.py --baseline startup.json
+    python profile_startup.py --baseline HEAD~3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APPS = ["1_team/st3.py", "2_team/app.py", "3_team/app.py"]
+
+MARKER = "--- profile_startup: render ---"
+
+# 자식 프로세스에서 실행할 코드: streamlit 을 먼저 import 한 뒤 표시를 남기고 앱을 한 번 렌더링
+_DRIVER = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_streamlit = time.perf_counter() - t0
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+t1 = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout={timeout}).run()
+t_render = time.perf_counter() - t1
+print(json.dumps({{
+    "streamlit_import_s": t_streamlit,
+    "first_render_s": t_render,
+    "exceptions": [str(e.value) for e in at.exception],
+}}))
+"""
+
+
+def parse_importtime(lines):
+    """
+    -X importtime 출력 -> {최상위 모듈: 누적 시간(ms)}.
+    들여쓰기가 없는(다른 모듈 안에서 불린 게 아닌) 줄만 모은다.
+    """
+    modules = {}
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # 헤더 줄
+        if len(name) - len(name.lstrip()) != 1:
+            continue  # 하위 import
+        name = name.strip()
+        modules[name] = modules.get(name, 0.0) + int(cumulative) / 1000.0
+    return modules
+
+
+def profile_app(app: str, timeout: float = 120.0, root: str = ROOT) -> dict:
+    """앱 하나를 새 프로세스에서 렌더링하며 시간 측정 (root: 앱 경로의 기준 폴더)"""
+    code = _DRIVER.format(marker=MARKER, app=app, timeout=timeout)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root, capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    if proc.returncode != 0 or not proc.stdout.strip():
+        raise RuntimeError(f"{app} 프로파일 실패:\n{proc.stderr[-2000:]}")
+
+    err_lines = proc.stderr.splitlines()
+    split = err_lines.index(MARKER) if MARKER in err_lines else 0
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["app"] = app
+    result["app_imports_ms"] = parse_importtime(err_lines[split:])
+    return result
+
+
+def profile_ref(ref: str, apps, timeout: float = 120.0) -> list:
+    """git 커밋(ref) 시점의 저장소를 임시 폴더에 풀어 같은 앱들을 측정"""
+    with tempfile.TemporaryDirectory(prefix="profile_startup-") as tmp:
+        archive = os.path.join(tmp, "tree.tar")
+        subprocess.run(["git", "archive", "--format=tar", "-o", archive, ref], cwd=ROOT, check=True)
+        tree = os.path.join(tmp, "tree")
+        with tarfile.open(archive) as tar:
+            tar.extractall(tree, filter="data")
+        return [profile_app(app, timeout, root=tree) for app in apps]
+
+
+def load_baseline(baseline: str, apps, timeout: float = 120.0) -> dict:
+    """--json 결과 파일 또는 git 커밋 -> {앱: 결과}"""
+    if os.path.isfile(baseline):
+        with open(baseline, "r", encoding="utf-8") as f:
+            results = json.load(f)
+    else:
+        results = profile_ref(baseline, apps, timeout)
+    return {r["app"]: r for r in results}
+
+
+def _change(before: float, after: float) -> str:
+    saved = before - after
+    pct = f", {saved / before:.0%}" if before > 0 else ""
+    return f"{before:9.1f} -> {after:9.1f} ms (줄어듦 {saved:+.1f} ms{pct})"
+
+
+def print_saving(results, baseline: dict, label: str, top: int) -> None:
+    """기준 측정과 비교: 첫 렌더링, 앱 모듈 import, 시작할 때 더 이상 불러오지 않는 모듈"""
+    print("=" * 60)
+    print(f"기준({label}) 대비")
+    for r in results:
+        base = baseline.get(r["app"])
+        if base is None:
+            print(f"[{r['app']}] 기준 측정 없음")
+            continue
+        print(f"[{r['app']}]")
+        print(f"  첫 렌더링        : {_change(base['first_render_s'] * 1000, r['first_render_s'] * 1000)}")
+        print(f"  앱 모듈 import   : {_change(sum(base['app_imports_ms'].values()), sum(r['app_imports_ms'].values()))}")
+        dropped = sorted(
+            ((name, ms) for name, ms in base["app_imports_ms"].items() if name not in r["app_imports_ms"]),
+            key=lambda kv: kv[1], reverse=True,
+        )
+        if dropped:
+            print("  시작할 때 불러오지 않게 된 모듈:")
+            for name, ms in dropped[:top]:
+                print(f"    {name:<38}{ms:>12.1f}")
+
+
+def print_report(results, top: int) -> None:
+    for r in results:
+        imports = sorted(r["app_imports_ms"].items(), key=lambda kv: kv[1], reverse=True)
+        total_imports = sum(ms for _, ms in imports)
+
+        print("=" * 60)
+        print(f"[{r['app']}]")
+        print(f"  streamlit import : {r['streamlit_import_s'] * 1000:9.1f} ms")
+        print(f"  첫 렌더링        : {r['first_render_s'] * 1000:9.1f} ms")
+        print(f"    (앱 모듈 import: {total_imports:9.1f} ms)")
+        if r["exceptions"]:
+            print(f"  예외: {r['exceptions']}")
+        print(f"  {'모듈':<40}{'누적(ms)':>12}")
+        for name, ms in imports[:top]:
+            print(f"  {name:<40}{ms:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 앱 시작 시간 프로파일")
+    parser.add_argument("apps", nargs="*", default=APPS, help="프로파일할 앱 (기본: 세 앱 모두)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="세 앱 모두 프로파일 (앱을 지정하지 않았을 때의 기본 동작)")
+    parser.add_argument("--top", type=int, default=10, help="앱별로 보여줄 모듈 수")
+    parser.add_argument("--timeout", type=float, default=120.0, help="첫 렌더링 제한 시간(초)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 기준: 예전 --json 결과 파일 또는 git 커밋")
+    args = parser.parse_args()
+
+    results = [profile_app(app, args.timeout) for app in args.apps]
+    print_report(results, args.top)
+    if args.baseline:
+        print_saving(results, load_baseline(args.baseline, args.apps, args.timeout), args.baseline, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+세 팀 모델 예측 HTTP 서버 (Starlette + uvicorn, 비동기).
+
+- POST /cpi        {"환율": 1.5, "본원통화": 0.5, "휘발유": -1.0, "경유": -1.0} -> {"cpi_change": ...}
+- POST /accidents  {"avg_temp": ..., "total_rain": ..., ...}                      -> {"predicted_accident": ...}
+- POST /obesity    {"Gender": "남성", "Age": 25, ...} (앱 선택지 또는 원본 값)     -> {"grade": 3, "label": ..., "proba": {...}}
+- GET  /metrics    엔드포인트별 지연 시간 히스토그램, 배치 크기 분포, (obesity) 예측 캐시 적중률
+- GET  /health     로드된 모델 목록
+
+본문이 리스트이면 여러 건으로 보고 결과도 리스트로 돌려준다.
+모델은 ModelPool 에 한 번만 로드해 모든 요청이 공유하고, 엔드포인트마다 MicroBatcher(microbatch.py)가
+동시에 들어온 요청을 최대 max_wait_ms 동안 모아 한 번의 predict 로 처리한다.
+obesity 는 앱과 같은 PredictionCache(3_team/prediction_cache.py)와 미리 계산한 확률표를 거쳐
+캐시에 없는 응답만 포레스트로 계산한다.
+
+    pip install -r requirements.txt
+    python server.py --port 8000 --max-batch 64 --max-wait-ms 2
+"""
+import abc
+import argparse
+import asyncio
+import bisect
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for team in ("1_team", "2_team", "3_team"):
+    sys.path.insert(0, os.path.join(ROOT, team))
+
+import artifacts
+from microbatch import MicroBatcher
+
+
+# ---------------------------------------------------------
+# 모델 풀
+# ---------------------------------------------------------
+def _load_cpi():
+    from cpi_model import load_or_fit
+
+    return load_or_fit(artifacts.path("macro_indicators"), artifacts.locate("cpi_model"))
+
+
+def _load_accidents():
+    from linear_scorer import load_predictor
+
+    return load_predictor(artifacts.path("accident_model_info"), artifacts.path("accident_model"))
+
+
+def _load_obesity():
+    from forest_export import load_forest
+
+    return load_forest(artifacts.locate("obesity_forest"), artifacts.locate("obesity_model"),
+                       schema_path=artifacts.path("obesity_schema"))
+
+
+class ModelPool:
+    """모델 이름 -> 로더. 처음 요청될 때 한 번만 로드하고 프로세스 안에서 공유"""
+
+    def __init__(self, loaders: dict):
+        self._loaders = loaders
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                if name not in self._models:
+                    self._models[name] = self._loaders[name]()
+                model = self._models[name]
+        return model
+
+    def warm(self) -> None:
+        for name in self._loaders:
+            self.get(name)
+
+    def loaded(self) -> list:
+        return list(self._models)
+
+
+# ---------------------------------------------------------
+# 지연 시간 히스토그램
+# ---------------------------------------------------------
+class LatencyHistogram:
+    """고정 구간(ms) 히스토그램. 분위수는 구간 상한으로 근사"""
+
+    BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.BUCKETS_MS + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{b}" for b in self.BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+# ---------------------------------------------------------
+# 엔드포인트별 입력 변환 / 예측 / 응답
+# ---------------------------------------------------------
+def _numeric_row(row: dict, names: list) -> list:
+    missing = [name for name in names if name not in row]
+    if missing:
+        raise ValueError(f"필수 값이 없습니다: {', '.join(missing)}")
+    return [float(row[name]) for name in names]
+
+
+class Endpoint(abc.ABC):
+    """요청 한 건(dict) -> 입력 행(encode), 행렬 예측(predict), 예측 한 행 -> 응답(decode)"""
+
+    def __init__(self, name: str, pool: ModelPool):
+        self.name = name
+        self.pool = pool
+        self.latency = LatencyHistogram()
+        self.batcher = None
+
+    @property
+    def model(self):
+        return self.pool.get(self.name)
+
+    @abc.abstractmethod
+    def encode(self, row: dict) -> list:
+        ...
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.model.predict(X)
+
+    @abc.abstractmethod
+    def decode(self, out) -> dict:
+        ...
+
+    def metrics(self) -> dict:
+        return {"latency": self.latency.snapshot(), "batching": self.batcher.metrics()}
+
+
+class CpiEndpoint(Endpoint):
+    def encode(self, row):
+        if "features" in row:
+            names = self.model.feature_names
+            if len(row["features"]) != len(names):
+                raise ValueError(f"features 는 {len(names)}개여야 합니다 ({', '.join(names)}): {len(row['features'])}개")
+            return [float(v) for v in row["features"]]
+        return _numeric_row(row, self.model.feature_names)
+
+    def decode(self, out):
+        return {"cpi_change": float(out)}
+
+
+class AccidentEndpoint(Endpoint):
+    def encode(self, row):
+        from batch_predict import FEATURE_NAMES
+
+        return _numeric_row(row, FEATURE_NAMES)
+
+    def predict(self, X):
+        return np.maximum(self.model.predict(X), 0)
+
+    def decode(self, out):
+        return {"predicted_accident": float(out)}
+
+
+class ObesityEndpoint(Endpoint):
+    def __init__(self, name: str, pool: ModelPool, cache_size: int = 50_000):
+        super().__init__(name, pool)
+        self.cache_size = cache_size
+        self._cache = None
+        self._cache_lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """등급별 확률 캐시 (처음 쓸 때 미리 계산한 확률표를 고정 항목으로 불러옴)"""
+        if self._cache is None:
+            with self._cache_lock:
+                if self._cache is None:
+                    from prediction_cache import PRECOMPUTED_NAME, PredictionCache
+
+                    cache = PredictionCache(maxsize=self.cache_size)
+                    cache.load_precomputed(artifacts.locate("obesity_forest") / PRECOMPUTED_NAME, self.model,
+                                           field="proba")
+                    self._cache = cache
+        return self._cache
+
+    def encode(self, row):
+        return self.model.encoder.encode_one(row)[0].tolist()
+
+    def predict(self, X):
+        return self.cache.predict(X, self.model.predict_proba)
+
+    def metrics(self) -> dict:
+        return {**super().metrics(), "cache": self._cache.metrics() if self._cache is not None else None}
+
+    def decode(self, out):
+        from batch_score import GRADES
+
+        classes = self.model.classes_
+        grade = int(classes[int(np.argmax(out))])
+        return {
+            "grade": grade,
+            "label": GRADES.get(grade),
+            "proba": {str(int(c)): float(p) for c, p in zip(classes, out)},
+        }
+
+
+# ---------------------------------------------------------
+# 앱
+# ---------------------------------------------------------
+def create_app(max_batch: int = 64, max_wait_ms: float = 2.0, warm: bool = True):
+    from contextlib import asynccontextmanager
+
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    pool = ModelPool({"cpi": _load_cpi, "accidents": _load_accidents, "obesity": _load_obesity})
+    endpoints = {
+        "cpi": CpiEndpoint("cpi", pool),
+        "accidents": AccidentEndpoint("accidents", pool),
+        "obesity": ObesityEndpoint("obesity", pool),
+    }
+    for ep in endpoints.values():
+        ep.batcher = MicroBatcher(ep.predict, max_batch=max_batch, max_wait_ms=max_wait_ms)
+
+    def handler(endpoint: Endpoint):
+        async def predict(request):
+            t0 = time.perf_counter()
+            try:
+                body = await request.json()
+                rows = body if isinstance(body, list) else [body]
+                if not rows:
+                    raise ValueError("요청 행이 없습니다.")
+                X = np.array([endpoint.encode(row) for row in rows], dtype=np.float64)
+                if not np.isfinite(X).all():
+                    raise ValueError("nan/inf 값은 사용할 수 없습니다.")
+                future = endpoint.batcher.submit(X)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                return JSONResponse({"error": str(e)}, status_code=400)
+
+            try:
+                out = await asyncio.wrap_future(future)
+                results = [endpoint.decode(o) for o in out]
+            except Exception as e:
+                endpoint.latency.observe((time.perf_counter() - t0) * 1000)
+                return JSONResponse({"error": f"예측 실패: {type(e).__name__}: {e}"}, status_code=500)
+            endpoint.latency.observe((time.perf_counter() - t0) * 1000)
+            return JSONResponse(results if isinstance(body, list) else results[0])
+        return predict
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "models": pool.loaded()})
+
+    async def metrics(request):
+        return JSONResponse({name: ep.metrics() for name, ep in endpoints.items()})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if warm:
+            await asyncio.get_running_loop().run_in_executor(None, pool.warm)
+        yield
+
+    routes = [Route(f"/{name}", handler(ep), methods=["POST"]) for name, ep in endpoints.items()]
+    routes += [Route("/health", health), Route("/metrics", metrics)]
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.pool = pool
+    app.state.endpoints = endpoints
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="모델 예측 HTTP 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=64, help="한 번의 predict 로 묶을 최대 행 수")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="배치를 채우기 위해 기다리는 최대 시간")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.max_batch, args.max_wait_ms), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
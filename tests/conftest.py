@@ -0,0 +1,9 @@
+import os
+import sys
+
+# 팀 폴더의 모듈은 앱처럼 폴더 안에서 바로 import 하므로 (예: from weather_agg import ...) 각 폴더를 경로에 추가
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("", "1_team", "2_team", "3_team"):
+    path = os.path.join(ROOT, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,75 @@
+"""행 추가/제거로 갱신하는 백테스트(backtest)가 원점마다 lstsq 로 새로 푼 결과와 같은지"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import RecursiveLeastSquares, backtest, summarize
+
+
+def _data(n=72, k=3, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, k))
+    y = X @ rng.normal(size=k) + 0.5 + rng.normal(scale=0.3, size=n)
+    return X, y
+
+
+def _naive(X, y, horizons, window, size, min_train) -> pd.DataFrame:
+    """원점마다 학습 구간을 np.linalg.lstsq 로 처음부터 풀어 예측"""
+    first = size if window == "sliding" else min_train
+    rows = []
+    for origin in range(first, len(y)):
+        lo = 0 if window == "expanding" else origin - size
+        A = np.column_stack([np.ones(origin - lo), X[lo:origin]])
+        beta, *_ = np.linalg.lstsq(A, y[lo:origin], rcond=None)
+        for h in horizons:
+            t = origin + h - 1
+            if t < len(y):
+                rows.append((origin, h, t, y[t], beta[0] + X[t] @ beta[1:]))
+    return pd.DataFrame(rows, columns=["origin", "horizon", "target", "actual", "predicted"])
+
+
+def _key(df):
+    return df.sort_values(["origin", "horizon"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("window,size", [("expanding", 24), ("sliding", 24), ("sliding", 12)])
+@pytest.mark.parametrize("n_chunks", [1, 3, 8])
+def test_matches_lstsq_per_origin(window, size, n_chunks):
+    X, y = _data()
+    horizons = (1, 2, 3)
+    fast = backtest(X, y, horizons, window=window, size=size, min_train=24, n_chunks=n_chunks, n_jobs=1)
+    expected = _naive(X, y, horizons, window, size, min_train=24)
+
+    fast = _key(fast)
+    pd.testing.assert_frame_equal(fast[expected.columns], _key(expected), check_exact=False, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(fast["error"], fast["predicted"] - fast["actual"])
+
+
+def test_unsorted_horizons_keep_target_pairs():
+    X, y = _data(n=40)
+    fast = backtest(X, y, horizons=(3, 1, 2), window="expanding", min_train=24, n_chunks=2, n_jobs=1)
+    expected = _naive(X, y, (1, 2, 3), "expanding", 24, min_train=24)
+
+    assert (fast["target"] == fast["origin"] + fast["horizon"] - 1).all()
+    pd.testing.assert_frame_equal(_key(fast)[expected.columns], _key(expected), check_exact=False, rtol=1e-9, atol=1e-9)
+    # 마지막 원점은 1개월 뒤만 예측 가능
+    assert summarize(fast).set_index("horizon")["n"].to_dict() == {1: 16, 2: 15, 3: 14}
+
+
+def test_rls_add_remove_matches_refit():
+    X, y = _data(n=30)
+    rls = RecursiveLeastSquares(X[:20], y[:20])
+    for i in range(20, 30):
+        rls.add(X[i], y[i])
+        rls.remove(X[i - 20], y[i - 20])
+    A = np.column_stack([np.ones(20), X[10:30]])
+    beta, *_ = np.linalg.lstsq(A, y[10:30], rcond=None)
+    np.testing.assert_allclose(rls.beta, beta, rtol=1e-9, atol=1e-10)
+
+
+def test_short_training_window_is_rejected():
+    X, y = _data(n=30)
+    with pytest.raises(ValueError):
+        backtest(X, y, window="sliding", size=X.shape[1] + 1, n_jobs=1)
+    with pytest.raises(ValueError):
+        backtest(X, y, window="rolling", n_jobs=1)
@@ -0,0 +1,70 @@
+"""내보낸 노드 배열(ForestPredictor)이 원래 sklearn RandomForestClassifier 와 같은 예측을 하는지"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from forest_export import ForestPredictor, export_forest, load_forest, validate
+
+joblib = pytest.importorskip("joblib")
+ensemble = pytest.importorskip("sklearn.ensemble")
+
+
+def _data(n=600, n_features=8, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, n_features))
+    X[:, 0] = rng.integers(0, 3, size=n)       # 선택지처럼 값이 몇 개뿐인 특성
+    X[:, 1] = np.round(X[:, 1] * 4) / 4        # 분기 기준값과 같은 값이 자주 나오는 특성
+    y = (X[:, 0] + (X[:, 2] > 0) + (X[:, 3] > 0.5) + (X[:, 1] > 0.25)).astype(int)
+    columns = [f"f{i}" for i in range(n_features)]
+    return pd.DataFrame(X, columns=columns), y
+
+
+@pytest.fixture(scope="module")
+def model():
+    X, y = _data()
+    return ensemble.RandomForestClassifier(n_estimators=25, min_samples_leaf=2, random_state=0).fit(X, y)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_predictor_matches_sklearn(model, tmp_path, mmap):
+    export_forest(model, tmp_path / "forest")
+    predictor = ForestPredictor.load(tmp_path / "forest", mmap=mmap)
+
+    X, _ = _data(n=1000, seed=1)
+    expected = model.predict_proba(X)
+    np.testing.assert_allclose(predictor.predict_proba(X), expected, atol=1e-6)
+    assert validate(predictor, model, X)
+
+    # 리프 번호: 트리마다 루트 번호를 빼면 sklearn 의 apply 와 같다
+    np.testing.assert_array_equal(predictor.apply(X) - predictor.roots, model.apply(X))
+
+    # 확률 차이가 float32 반올림 수준인 동점 행을 빼면 등급도 같다
+    top2 = np.sort(expected, axis=1)[:, -2:]
+    clear = top2[:, 1] - top2[:, 0] > 1e-5
+    np.testing.assert_array_equal(predictor.predict(X)[clear], model.predict(X)[clear])
+
+    # 학습 데이터 값(분기 기준값 근처)과 컬럼 순서를 바꾼 DataFrame
+    X_train, _ = _data()
+    np.testing.assert_allclose(predictor.predict_proba(X_train[X_train.columns[::-1]]),
+                               model.predict_proba(X_train), atol=1e-6)
+
+
+def test_wrong_feature_count_is_rejected(model, tmp_path):
+    predictor = ForestPredictor.load(export_forest(model, tmp_path / "forest"))
+    with pytest.raises(ValueError):
+        predictor.predict(np.zeros((2, model.n_features_in_ - 1)))
+
+
+def test_load_forest_reexports_when_pkl_changes(tmp_path):
+    X, y = _data()
+    model_path, forest_dir = tmp_path / "model.pkl", tmp_path / "forest"
+
+    first = ensemble.RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    joblib.dump(first, model_path)
+    np.testing.assert_allclose(load_forest(forest_dir, model_path).predict_proba(X), first.predict_proba(X), atol=1e-6)
+
+    second = ensemble.RandomForestClassifier(n_estimators=7, random_state=1).fit(X, y)
+    joblib.dump(second, model_path)
+    predictor = load_forest(forest_dir, model_path)
+    assert predictor.meta["n_trees"] == 7
+    np.testing.assert_allclose(predictor.predict_proba(X), second.predict_proba(X), atol=1e-6)
@@ -0,0 +1,74 @@
+"""저장된 계수로 만든 LinearScorer 가 joblib 로 저장한 sklearn 모델과 같은 값을 내는지"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import linear_scorer
+from linear_scorer import LinearScorer, load_predictor
+
+joblib = pytest.importorskip("joblib")
+linear_model = pytest.importorskip("sklearn.linear_model")
+
+FEATURES = ["avg_temp", "total_rain", "total_snow", "rain_hours", "snow_hours", "avg_humidity"]
+
+
+@pytest.fixture
+def saved_model(tmp_path):
+    """model_training.ipynb 처럼 DataFrame 으로 학습해 joblib + model_info.json 저장"""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.uniform(0, 30, size=(200, len(FEATURES))), columns=FEATURES)
+    y = X.to_numpy() @ rng.normal(size=len(FEATURES)) + 150 + rng.normal(size=len(X))
+    model = linear_model.LinearRegression().fit(X, y)
+
+    model_path = tmp_path / "accident_model.joblib"
+    info_path = tmp_path / "model_info.json"
+    joblib.dump(model, model_path)
+    info = {
+        "feature_names": FEATURES,
+        "coefficients": model.coef_.tolist(),
+        "intercept": float(model.intercept_),
+    }
+    info_path.write_text(json.dumps(info), encoding="utf-8")
+    return info_path, model_path
+
+
+def test_scorer_matches_joblib_model(saved_model, tmp_path):
+    info_path, model_path = saved_model
+    scorer = load_predictor(info_path, model_path, check_path=tmp_path / "check.json")
+    assert isinstance(scorer, LinearScorer)
+
+    model = joblib.load(model_path)
+    X = pd.DataFrame(np.random.default_rng(1).uniform(-20, 300, size=(500, len(FEATURES))), columns=FEATURES)
+    expected = model.predict(X)
+    np.testing.assert_allclose(scorer.predict(X), expected, rtol=1e-12, atol=1e-9)
+    # 컬럼 순서가 달라도 이름으로 맞춤
+    np.testing.assert_allclose(scorer.predict(X[FEATURES[::-1]]), expected, rtol=1e-12, atol=1e-9)
+    # 배열 입력과 한 건(dict) 입력
+    np.testing.assert_allclose(scorer.predict(X.to_numpy()), expected, rtol=1e-12, atol=1e-9)
+    for row, value in zip(X.head(20).to_dict(orient="records"), expected):
+        assert scorer.predict_one(row) == pytest.approx(value, rel=1e-12, abs=1e-9)
+
+
+def test_check_is_reused_until_files_change(saved_model, tmp_path, monkeypatch):
+    info_path, model_path = saved_model
+    check_path = tmp_path / "check.json"
+    load_predictor(info_path, model_path, check_path=check_path)
+
+    # 검증 기록이 있으면 joblib 모델을 다시 불러오지 않는다
+    def fail(path):
+        raise AssertionError("검증 기록이 있는데 모델을 다시 불러왔습니다.")
+
+    monkeypatch.setattr(linear_scorer, "_load_estimator", fail)
+    assert isinstance(load_predictor(info_path, model_path, check_path=check_path), LinearScorer)
+
+
+def test_mismatched_coefficients_fall_back_to_sklearn(saved_model, tmp_path):
+    info_path, model_path = saved_model
+    info = json.loads(info_path.read_text(encoding="utf-8"))
+    info["coefficients"][0] += 0.01
+    info_path.write_text(json.dumps(info), encoding="utf-8")
+
+    predictor = load_predictor(info_path, model_path, check_path=tmp_path / "check.json")
+    assert isinstance(predictor, linear_model.LinearRegression)
@@ -0,0 +1,73 @@
+"""스트리밍 SMOTE(smote_stream)가 imblearn SMOTE(random_state=seed).fit_resample 과 같은 결과를 내는지"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from smote import TARGET, smote_stream
+
+over_sampling = pytest.importorskip("imblearn.over_sampling")
+
+LABELS = ["Insufficient_Weight", "Normal_Weight", "Obesity_Type_I", "Overweight_Level_I"]
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    """전처리 CSV 처럼: Height/Weight + 인코딩된 특성(정수/소수 섞임) + 불균형한 NObeyesdad"""
+    rng = np.random.default_rng(0)
+    y = np.repeat(LABELS, [40, 130, 75, 22])
+    rng.shuffle(y)
+    n = len(y)
+    df = pd.DataFrame({
+        "Gender": rng.integers(0, 2, size=n),
+        "Age": rng.uniform(14, 60, size=n).round(3),
+        "Height": rng.uniform(1.5, 1.9, size=n),
+        "Weight": rng.uniform(40, 140, size=n),
+        "FCVC": rng.integers(1, 4, size=n),
+        "CH2O": rng.uniform(1, 3, size=n),
+        "MTRANS": rng.integers(0, 5, size=n),
+        TARGET: y,
+    })
+    # 첫 chunk 에서는 정수처럼 보이는 소수 컬럼 (dtype 추론이 chunk 마다 달라지는 경우)
+    df.loc[:59, "CH2O"] = df.loc[:59, "CH2O"].round()
+    path = tmp_path / "input.csv"
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+    return path, df
+
+
+def _expected(df, seed=42):
+    X = df.drop(columns=["Height", "Weight", TARGET]).astype(np.float64)
+    X_res, y_res = over_sampling.SMOTE(random_state=seed).fit_resample(X, df[TARGET])
+    X_res[TARGET] = y_res
+    return X_res
+
+
+@pytest.mark.parametrize("chunk_size", [1_000, 60, 17])
+def test_matches_imblearn(input_csv, tmp_path, chunk_size):
+    input_path, df = input_csv
+    out = tmp_path / "out.csv"
+    result = smote_stream(input_path, out, chunk_size=chunk_size, n_jobs=1)
+
+    expected = _expected(df)
+    actual = pd.read_csv(out, encoding="utf-8-sig")
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12, check_dtype=False)
+
+    assert result["before"] == df[TARGET].value_counts().sort_index().to_dict()
+    assert result["after"] == {label: 130 for label in LABELS}
+    assert result["n_columns"] == expected.shape[1]
+
+
+def test_parquet_output_matches_csv(input_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+    input_path, df = input_csv
+    smote_stream(input_path, tmp_path / "out.parquet", chunk_size=50, n_jobs=1)
+
+    actual = pd.read_parquet(tmp_path / "out.parquet")
+    pd.testing.assert_frame_equal(actual, _expected(df), check_exact=False, rtol=1e-12, check_dtype=False)
+
+
+def test_small_class_is_rejected(input_csv, tmp_path):
+    input_path, df = input_csv
+    small = pd.concat([df, df[df[TARGET] == LABELS[0]].head(3).assign(**{TARGET: "Obesity_Type_III"})])
+    small.to_csv(input_path, index=False, encoding="utf-8-sig")
+    with pytest.raises(ValueError):
+        smote_stream(input_path, tmp_path / "out.csv", n_jobs=1)
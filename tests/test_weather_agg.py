@@ -0,0 +1,108 @@
+"""누적 저장소(weather_agg)와 parquet 캐시(weather_cache)의 증분 갱신이 처음부터 다시 만든 결과와 같은지"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import weather_cache
+from weather_agg import WeatherAggStore, refresh_store
+from weather_cache import load_weather, parse_weather_csv
+
+COLUMNS = ["지점", "일시", "기온(°C)", "강수량(mm)", "습도(%)", "적설(cm)"]
+
+
+def _hourly_lines(start, hours, stations=(108, 159), seed=0) -> list:
+    """ASOS 원본 형식의 시간별 행 (cp949 CSV 한 줄씩). 연도가 바뀌는 구간도 포함하도록 start 를 고른다"""
+    rng = np.random.default_rng(seed)
+    lines = []
+    for station in stations:
+        for ts in pd.date_range(start, periods=hours, freq="h"):
+            rain = "" if rng.random() < 0.7 else f"{rng.uniform(0, 5):.1f}"
+            snow = "" if rng.random() < 0.9 else f"{rng.uniform(0, 3):.1f}"
+            temp = "" if rng.random() < 0.02 else f"{rng.normal(0, 8):.1f}"
+            lines.append(f"{station},{ts.year}-{ts.month:02d}-{ts.day:02d} {ts.hour}:00,{temp},{rain},"
+                         f"{rng.integers(20, 100)},{snow}\n")
+    return lines
+
+
+def _write(path, lines) -> None:
+    with open(path, "w", encoding="cp949", newline="") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        f.writelines(lines)
+
+
+def _append(path, lines) -> None:
+    with open(path, "a", encoding="cp949", newline="") as f:
+        f.writelines(lines)
+
+
+def _full_store(path) -> WeatherAggStore:
+    store = WeatherAggStore()
+    store.update(parse_weather_csv(path))
+    return store
+
+
+def _assert_same_store(a: WeatherAggStore, b: WeatherAggStore) -> None:
+    pd.testing.assert_frame_equal(a.state, b.state, check_exact=False, rtol=1e-12)
+    assert a.watermarks == b.watermarks
+
+
+def test_update_in_steps_matches_single_update(tmp_path):
+    path = tmp_path / "w.csv"
+    _write(path, _hourly_lines("2023-12-20", 24 * 30))
+    df_w = parse_weather_csv(path)
+
+    cut = pd.Timestamp("2024-01-03 05:00")
+    store = WeatherAggStore()
+    assert store.update(df_w[df_w["datetime"] <= cut]) > 0
+    assert store.update(df_w[df_w["datetime"] > cut]) > 0
+    # 이미 반영한 행을 다시 넣어도 watermark 로 걸러진다
+    assert store.update(df_w) == 0
+
+    _assert_same_store(store, _full_store(path))
+
+
+@pytest.mark.skipif(not weather_cache.HAS_PYARROW, reason="pyarrow 없음 (캐시 없이 매번 원본 파싱)")
+def test_appended_file_matches_full_rebuild(tmp_path):
+    path = tmp_path / "w.csv"
+    cache_dir, store_dir = tmp_path / "cache", tmp_path / "store"
+    lines = _hourly_lines("2023-12-20", 24 * 40)
+    # 관측소 한 곳씩 이어 쓰는 원본처럼: 앞부분만 먼저 쓰고 나머지를 두 번에 나눠 덧붙임
+    _write(path, lines[:500])
+
+    def load_rows(since, stats=None):
+        return load_weather(path, cache_dir=cache_dir, since=since, stats=stats)
+
+    refresh_store("w", load_rows, store_dir, source_path=path)
+    for part in (lines[500:1300], lines[1300:]):
+        _append(path, part)
+        stats = {}
+        store = refresh_store("w", lambda since: load_rows(since, stats), store_dir, source_path=path)
+        assert stats["mode"] == "append"
+        assert stats["parsed_bytes"] < path.stat().st_size
+
+    _assert_same_store(store, _full_store(path))
+    expected = parse_weather_csv(path).sort_values(["station", "datetime"], kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(load_weather(path, cache_dir=cache_dir), expected, check_dtype=False)
+
+
+@pytest.mark.skipif(not weather_cache.HAS_PYARROW, reason="pyarrow 없음 (캐시 없이 매번 원본 파싱)")
+def test_edited_file_is_rebuilt(tmp_path):
+    path = tmp_path / "w.csv"
+    cache_dir, store_dir = tmp_path / "cache", tmp_path / "store"
+    lines = _hourly_lines("2024-03-01", 24 * 10)
+    _write(path, lines)
+
+    def load_rows(since, stats=None):
+        return load_weather(path, cache_dir=cache_dir, since=since, stats=stats)
+
+    refresh_store("w", load_rows, store_dir, source_path=path)
+
+    # 중간 행을 고치고 뒤에 덧붙임 -> 이어 쓰기가 아니므로 캐시·저장소 모두 처음부터
+    edited = list(lines)
+    edited[10] = "108,2024-03-01 10:00,35.5,9.9,50,\n"
+    _write(path, edited + _hourly_lines("2024-03-11", 24, seed=1))
+    stats = {}
+    store = refresh_store("w", lambda since: load_rows(since, stats), store_dir, source_path=path)
+
+    assert stats["mode"] == "build"
+    _assert_same_store(store, _full_store(path))